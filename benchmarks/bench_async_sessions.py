@@ -0,0 +1,67 @@
+"""Concurrent chat sessions through handle_async vs the same commands run serially.
+
+Each session adds a few transactions to a JSON store seeded with history;
+the async run group-commits writes that arrive together.
+
+Run: python benchmarks/bench_async_sessions.py [sessions] [per_session]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from chat.orchestrator import ChatOrchestrator  # noqa: E402
+from core import JsonFilePersistence, Transaction  # noqa: E402
+
+
+def _seed(path: Path, n: int = 500):
+    store = JsonFilePersistence(path)
+    with store.batch():
+        store.save_transactions(Transaction.create(1, "Misc", f"old {i}", txn_date=date(2024, 1, 1)) for i in range(n))
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_session = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    commands = [[f"add 1.00 groceries s{s} item {i}" for i in range(per_session)] for s in range(sessions)]
+    with tempfile.TemporaryDirectory() as tmp:
+        serial_path, async_path = Path(tmp) / "serial.json", Path(tmp) / "async.json"
+        _seed(serial_path)
+        _seed(async_path)
+
+        orch = ChatOrchestrator(data_path=str(serial_path), onboarding=False)
+        start = time.perf_counter()
+        for session in commands:
+            for c in session:
+                orch.handle(c)
+        serial = time.perf_counter() - start
+
+        orch = ChatOrchestrator(data_path=str(async_path), onboarding=False)
+
+        async def session(lines):
+            for c in lines:
+                await orch.handle_async(c)
+
+        async def run():
+            await asyncio.gather(*(session(lines) for lines in commands))
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        concurrent = time.perf_counter() - start
+
+    print(f"{sessions} sessions x {per_session} adds")
+    print(f"serial handle():         {serial * 1000:8.1f} ms, {sessions * per_session} commits")
+    print(f"concurrent handle_async: {concurrent * 1000:8.1f} ms, {orch.async_store.commits} commits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""CategoryResolver throughput at 10, 1k and 10k rules.
+
+Compares the previous linear ``kw in text`` scan over every rule with the
+Aho-Corasick automaton now used by ``CategoryResolver.resolve``.
+
+Run: python benchmarks/bench_category_resolve.py [descriptions]
+"""
+
+from __future__ import annotations
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from services.categories import CategoryResolver  # noqa: E402
+
+CATEGORIES = ["Groceries", "Dining", "Transport", "Housing", "Health", "Shopping", "Fun"]
+
+
+def make_rules(n: int, rng: random.Random):
+    rules, seen = [], set()
+    while len(rules) < n:
+        kw = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        if kw not in seen:
+            seen.add(kw)
+            rules.append((kw, rng.choice(CATEGORIES)))
+    return rules
+
+
+def make_descriptions(rules, n: int, rng: random.Random):
+    out = []
+    for _ in range(n):
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+                 for _ in range(rng.randint(2, 5))]
+        if rng.random() < 0.5:  # half of the descriptions hit some rule
+            words.insert(rng.randint(0, len(words)), rng.choice(rules)[0])
+        out.append(" ".join(words).upper() + f" #{rng.randint(1, 9999)}")
+    return out
+
+
+def legacy_resolve(rules, default, text):
+    low = text.lower()
+    for kw, cat in rules:
+        if kw in low:
+            return cat
+    return default
+
+
+def rate(fn, texts) -> float:
+    start = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(3)
+    print(f"{n} descriptions per run")
+    print(f"{'rules':>7} {'linear scan':>14} {'resolve()':>14} {'build':>9}")
+    for n_rules in (10, 1_000, 10_000):
+        rules = make_rules(n_rules, rng)
+        texts = make_descriptions(rules, n, rng)
+        start = time.perf_counter()
+        resolver = CategoryResolver(rules)
+        build = time.perf_counter() - start
+        for t in texts[:500]:
+            assert resolver.resolve(t) == legacy_resolve(rules, "Other", t)
+        linear = rate(lambda t: legacy_resolve(rules, "Other", t), texts)
+        automaton = rate(resolver.resolve, texts)
+        print(f"{n_rules:>7} {linear:>10,.0f} /s {automaton:>10,.0f} /s {build * 1000:>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""IntentParser.parse throughput: first-word dispatch vs trying every pattern.
+
+Inputs are a mix of commands, unknown chatter and add commands with long
+descriptions (where the old add_expense pattern retried its date group
+after every character).
+
+Run: python benchmarks/bench_intent_parse.py [inputs]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from chat.intent import INTENTS, IntentParser, ParsedIntent  # noqa: E402
+
+COMMANDS = [
+    "add 12.34 groceries milk and bread",
+    "add 10.00 coffee latte on 2025-08-07",
+    "set groceries 300",
+    "budget groceries",
+    "limits",
+    "export csv data/out.csv",
+    "receipt:\nMilk 2.50\nBread 1.20",
+    "summary 7d",
+    "trend groceries 90d",
+    "help",
+]
+CHATTER = [
+    "what did I spend on coffee last week",
+    "hello there",
+    "how much is left for groceries?",
+    "thanks!",
+]
+
+
+def scan_all(text: str):
+    t = text.strip()
+    for name, pattern in INTENTS.items():
+        m = pattern.match(t)
+        if m:
+            return ParsedIntent(name=name, args={k: v for k, v in m.groupdict().items() if v is not None})
+    return None
+
+
+def make_inputs(n: int, rng: random.Random):
+    groups = {"commands": [], "unknown": [], "long add": []}
+    for _ in range(n):
+        groups["commands"].append(rng.choice(COMMANDS))
+        groups["unknown"].append(rng.choice(CHATTER))
+        words = " ".join(rng.choice(["milk", "bread", "eggs", "cheese"]) for _ in range(rng.randint(20, 60)))
+        groups["long add"].append(f"add 4.20 groceries {words}" + rng.choice(["", " on 2025-08-07"]))
+    return groups
+
+
+def rate(fn, texts) -> float:
+    start = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(19)
+    parser = IntentParser()
+    print(f"{n} inputs per group")
+    print(f"{'group':>10} {'scan all':>14} {'dispatch':>14}")
+    for group, texts in make_inputs(n, rng).items():
+        for t in texts[:200]:
+            assert parser.parse(t) == scan_all(t)
+        before = rate(scan_all, texts)
+        after = rate(parser.parse, texts)
+        print(f"{group:>10} {before:>10,.0f} /s {after:>10,.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""LLM adapter latency with a simulated model (MockLLMAdapter token latency).
+
+Reports time to first token for complete() vs stream(), a cache hit, and
+the number of generations when identical requests arrive concurrently.
+
+Run: python benchmarks/bench_llm_adapter.py [token_ms] [tokens]
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from llm.adapter import MockLLMAdapter  # noqa: E402
+
+
+def main():
+    token_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    n_tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    prompt = " ".join(f"w{i}" for i in range(n_tokens - 2))
+    messages = [{"role": "user", "content": prompt}]
+    llm = MockLLMAdapter(token_latency=token_ms / 1000)
+    print(f"{n_tokens} tokens at {token_ms:g} ms/token")
+
+    start = time.perf_counter()
+    llm.complete(messages)
+    print(f"complete(), first token with the full text: {(time.perf_counter() - start) * 1000:8.1f} ms")
+    llm.clear_cache()
+
+    start = time.perf_counter()
+    stream = llm.stream(messages)
+    next(stream)
+    print(f"stream(), first token:                      {(time.perf_counter() - start) * 1000:8.1f} ms")
+    list(stream)
+
+    start = time.perf_counter()
+    llm.complete(messages)
+    print(f"cached complete():                          {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+    llm = MockLLMAdapter(token_latency=token_ms / 1000, max_concurrency=4)
+    threads = [threading.Thread(target=llm.complete, args=(messages,)) for _ in range(16)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    info = llm.cache_info()
+    print(f"16 identical concurrent requests: {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{info['generations']} generation(s), {info['deduped']} deduplicated, {info['hits']} cache hits")
+
+
+if __name__ == "__main__":
+    main()
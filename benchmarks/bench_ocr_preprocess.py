@@ -0,0 +1,92 @@
+"""OCR time per image with and without the OpenCV preprocessing stage.
+
+Renders synthetic receipts (a slightly rotated white slip of text pasted into
+a 12MP colour "phone photo"), then times ``preprocess`` alone and, when a
+Tesseract binary is available, ``extract_text`` with ``preprocess`` off/on.
+
+Run: python benchmarks/bench_ocr_preprocess.py [count]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont  # noqa: E402
+
+from receipt import ocr  # noqa: E402
+from receipt.preprocess import preprocess_bytes  # noqa: E402
+
+PHOTO_SIZE = (4000, 3000)  # 12MP
+ITEMS = ["MILK 2L", "BREAD", "EGGS 12", "COFFEE", "BANANAS", "CHEESE", "APPLES", "PASTA", "RICE 1KG"]
+
+
+def render_receipt(seed: int) -> bytes:
+    rng = random.Random(seed)
+    font = ImageFont.load_default(size=30)
+    lines = ["SUPERMART #%03d" % rng.randint(1, 999), "2024-05-%02d" % rng.randint(1, 28), ""]
+    total = 0.0
+    for _ in range(rng.randint(8, 20)):
+        price = rng.randint(50, 2000) / 100
+        total += price
+        lines.append(f"{rng.choice(ITEMS):<18}{price:>8.2f}")
+    lines += ["", f"{'TOTAL':<18}{total:>8.2f}"]
+    paper = Image.new("RGB", (640, 60 + 48 * len(lines)), (250, 248, 240))
+    draw = ImageDraw.Draw(paper)
+    for i, line in enumerate(lines):
+        draw.text((30, 30 + 48 * i), line, fill=(20, 20, 20), font=font)
+    paper = paper.resize((paper.width * 3, paper.height * 3))
+    background = (rng.randint(40, 110),) * 3
+    paper = paper.rotate(rng.uniform(-7, 7), expand=True, fillcolor=background)
+    photo = Image.new("RGB", PHOTO_SIZE, background)
+    # portrait slip in a landscape frame: shrink to fit with a margin
+    scale = min(1.0, 0.9 * PHOTO_SIZE[1] / paper.height)
+    paper = paper.resize((int(paper.width * scale), int(paper.height * scale)))
+    photo.paste(paper, ((PHOTO_SIZE[0] - paper.width) // 2, (PHOTO_SIZE[1] - paper.height) // 2))
+    photo = photo.filter(ImageFilter.GaussianBlur(1))
+    out = tempfile.SpooledTemporaryFile()
+    photo.save(out, format="JPEG", quality=90)
+    out.seek(0)
+    return out.read()
+
+
+def per_image(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    images = [render_receipt(i) for i in range(n)]
+    print(f"{n} synthetic receipts, {PHOTO_SIZE[0]}x{PHOTO_SIZE[1]} JPEG")
+    print(f"preprocess only        {per_image(preprocess_bytes, images) * 1000:8.1f} ms/image")
+
+    try:
+        ocr._ensure_ready()
+    except ocr.OCRError as e:
+        print(f"Tesseract unavailable, skipping OCR timings ({e})")
+        return
+    ocr.configure_cache(enabled=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, data in enumerate(images):
+            path = Path(tmp) / f"receipt{i}.jpg"
+            path.write_bytes(data)
+            paths.append(path)
+        raw = per_image(lambda p: ocr.extract_text(p), paths)
+        pre = per_image(lambda p: ocr.extract_text(p, preprocess=True), paths)
+    print(f"extract_text raw       {raw * 1000:8.1f} ms/image")
+    print(f"extract_text + prep    {pre * 1000:8.1f} ms/image  ({raw / pre:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
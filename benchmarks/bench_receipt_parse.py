@@ -0,0 +1,82 @@
+"""Receipt text parsing throughput in lines/second.
+
+Compares the previous per-receipt loop (ad hoc ``re.findall`` for totals)
+with ``SimpleReceiptParser.parse_many`` serially and across a process pool.
+
+Run: python benchmarks/bench_receipt_parse.py [receipts] [workers]
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import re
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from core import ReceiptLine, ReceiptParseResult  # noqa: E402
+from services.receipts import SimpleReceiptParser  # noqa: E402
+
+ITEMS = ["Milk", "Bread", "Eggs", "Coffee beans", "Bananas", "Cheddar", "Apples", "Pasta", "Rice 1kg"]
+LEGACY_LINE_RE = re.compile(r"^(?P<desc>.+?)\s+(?P<amount>\d+[\.,]\d{2})$")
+
+
+def legacy_parse(text: str) -> ReceiptParseResult:
+    lines, warnings, total_detected = [], [], None
+    for raw in [l.strip() for l in text.splitlines() if l.strip()]:
+        m = LEGACY_LINE_RE.match(raw)
+        if not m:
+            if raw.lower().startswith("total"):
+                amt = re.findall(r"\d+[\.,]\d{2}", raw)
+                if amt:
+                    total_detected = Decimal(amt[-1].replace(",", "."))
+                continue
+            warnings.append(f"Unparsed line: {raw}")
+            continue
+        lines.append(ReceiptLine(raw=raw, description=m.group("desc").strip(),
+                                 amount=Decimal(m.group("amount").replace(",", "."))))
+    return ReceiptParseResult(original_text=text, lines=lines, total_detected=total_detected, warnings=warnings)
+
+
+def make_receipts(n: int):
+    rng = random.Random(7)
+    out = []
+    for _ in range(n):
+        rows = ["SUPERMART #%03d" % rng.randint(1, 999)]
+        for _ in range(rng.randint(5, 25)):
+            item, price = rng.choice(ITEMS), f"{rng.randint(50, 2000) / 100:.2f}"
+            rows.append(f"{rng.randint(2, 4)} x {item} {price}" if rng.random() < 0.2 else f"{item} {price}")
+        rows += ["Total %.2f" % rng.uniform(5, 300), "Thank you!"]
+        out.append("\n".join(rows))
+    return out
+
+
+def measure(label: str, fn, texts, n_lines: int):
+    start = time.perf_counter()
+    count = sum(1 for _ in fn(texts))
+    elapsed = time.perf_counter() - start
+    assert count == len(texts)
+    print(f"{label:<24} {n_lines / elapsed:12,.0f} lines/s  ({elapsed:.2f}s)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    texts = make_receipts(n)
+    n_lines = sum(t.count("\n") + 1 for t in texts)
+    print(f"{n} receipts, {n_lines} lines")
+    parser = SimpleReceiptParser()
+    measure("legacy loop", lambda ts: map(legacy_parse, ts), texts, n_lines)
+    measure("parse_many", parser.parse_many, texts, n_lines)
+    if workers > 1:
+        measure(f"parse_many workers={workers}", lambda ts: parser.parse_many(ts, workers=workers), texts, n_lines)
+
+
+if __name__ == "__main__":
+    main()
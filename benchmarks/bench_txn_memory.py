@@ -0,0 +1,58 @@
+"""Per-record memory footprint: Transaction dataclass vs compact TxnRecord.
+
+Run: python benchmarks/bench_txn_memory.py [count]
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from core import Transaction, TxnRecord  # noqa: E402
+
+CATEGORIES = ["Groceries", "Dining", "Transport", "Housing", "Health", "Other"]
+
+
+def build_transactions(n: int):
+    start = date(2020, 1, 1)
+    return [
+        Transaction.create(
+            amount=f"{(i % 5000) / 100:.2f}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            description=f"item {i % 500}",
+            txn_date=start + timedelta(days=i % 1800),
+        )
+        for i in range(n)
+    ]
+
+
+def measure(label: str, factory, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = factory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    per = size / n
+    print(f"{label:<14} {size / 1e6:8.2f} MB total  {per:7.1f} B/record")
+    del objs
+    return per
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{n} records")
+    # both sides allocate their own id/description strings inside the measurement
+    before = measure("Transaction", lambda: build_transactions(n), n)
+    after = measure("TxnRecord", lambda: [TxnRecord.from_transaction(t) for t in build_transactions(n)], n)
+    print(f"reduction      {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,75 @@
-import os
+"""Ingest a folder of receipt images into the transaction store.
+
+Only new or changed images are OCR'd; a manifest next to the images records
+what has been processed. With ``--watch`` the folder is polled (stat calls
+only) and new receipts are ingested as they appear.
+
+Usage:
+    python scripts/ingest_receipts.py <receipt_folder> [--data data/state.json]
+        [--manifest PATH] [--workers N] [--backend process|batch] [--preprocess]
+        [--recursive] [--watch [--interval SECONDS]]
+"""
+
+from __future__ import annotations
+
+import argparse
 import sys
-from src.receipt.parser import ReceiptParser
+from functools import partial
+from pathlib import Path
 
-def ingest_receipts(receipt_folder):
-    if not os.path.exists(receipt_folder):
-        print(f"Receipt folder '{receipt_folder}' does not exist.")
-        return
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
 
-    for filename in os.listdir(receipt_folder):
-        if filename.endswith(('.png', '.jpg', '.jpeg')):
-            file_path = os.path.join(receipt_folder, filename)
-            print(f"Processing receipt: {file_path}")
-            parser = ReceiptParser()
-            spending_data = parser.parse_receipt(file_path)
-            print(f"Extracted data: {spending_data}")
+from core import open_store  # noqa: E402
+from services.ingest import ReceiptIngestor  # noqa: E402
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python ingest_receipts.py <receipt_folder>")
-        sys.exit(1)
+MANIFEST_NAME = ".ingest_manifest.json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="OCR receipt images into transactions.")
+    p.add_argument("folder", type=Path)
+    p.add_argument("--data", default="data/state.json", help="store path or URI (see open_store)")
+    p.add_argument("--manifest", type=Path, help=f"defaults to <folder>/{MANIFEST_NAME}")
+    p.add_argument("--workers", type=int, default=None, help="OCR processes/batches in flight (default: CPUs)")
+    p.add_argument("--backend", choices=("process", "batch"), default="process")
+    p.add_argument("--preprocess", action="store_true", help="clean photos with OpenCV before OCR")
+    p.add_argument("--recursive", action="store_true")
+    p.add_argument("--watch", action="store_true", help="keep polling the folder")
+    p.add_argument("--interval", type=float, default=5.0, help="seconds between polls in --watch mode")
+    return p
 
-    receipt_folder = sys.argv[1]
-    ingest_receipts(receipt_folder)
\ No newline at end of file
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.folder.is_dir():
+        print(f"Receipt folder '{args.folder}' does not exist.")
+        return 1
+    from receipt.ocr import iter_extract
+
+    ocr = partial(iter_extract, workers=args.workers, backend=args.backend, preprocess=args.preprocess)
+    ingestor = ReceiptIngestor(
+        open_store(args.data),
+        args.manifest or args.folder / MANIFEST_NAME,
+        ocr=ocr,
+        recursive=args.recursive,
+    )
+
+    def show(report):
+        print(report.summary())
+        for path, error in report.failed.items():
+            print(f"  failed: {path}: {error}")
+
+    show(ingestor.ingest(args.folder))
+    if args.watch:
+        print(f"Watching {args.folder} every {args.interval:g}s (Ctrl+C to stop)")
+        try:
+            ingestor.watch(args.folder, interval=args.interval, on_report=show)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Run the multi-user HTTP API.
+
+Each user gets their own store, made from ``--data`` (an ``open_store`` path
+or URI containing ``{user}``); at most ``--max-open`` stores stay open.
+
+Usage:
+    python scripts/serve_api.py [--host 127.0.0.1] [--port 8000] [--workers 8]
+        [--data data/users/{user}.json] [--max-open 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from api.app import create_app, serve  # noqa: E402
+from api.pool import StorePool  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Serve the finance tracker HTTP API.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--workers", type=int, default=8, help="request-handling threads")
+    p.add_argument("--data", default="data/users/{user}.json", help="per-user store path/URI with {user}")
+    p.add_argument("--max-open", type=int, default=64, help="stores kept open (LRU)")
+    return p
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        pool = StorePool(args.data, max_open=args.max_open)
+    except ValueError as e:
+        print(e)
+        return 1
+    serve(create_app(pool), host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
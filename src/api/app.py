@@ -0,0 +1,185 @@
+"""HTTP API over the chat orchestrator, one store per user.
+
+Endpoints (JSON unless noted), all scoped to ``/users/<user>``:
+
+    POST /chat            {"text": "add 12.50 groceries milk"} -> {"response": ...}
+    GET  /transactions    ?category=&start=YYYY-MM-DD&end=&limit=&reverse=1
+    POST /transactions    {"amount", "category", "description"?, "date"?} -> 201
+    GET  /budget          ?month=YYYY-MM (default: current month)
+    GET  /export.csv      all transactions as CSV
+
+``serve`` runs the app on a fixed-size thread pool; ``create_app`` alone is
+enough for Flask's test client.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import BaseWSGIServer
+
+from core import Transaction
+from .pool import InvalidUser, StorePool
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _txn_json(t: Transaction) -> Dict[str, Any]:
+    return {
+        "id": t.id,
+        "date": t.txn_date.isoformat(),
+        "category": t.category,
+        "amount": f"{t.amount:.2f}",
+        "description": t.description,
+    }
+
+
+def _date(value: Optional[str], name: str) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise BadRequest(f"{name} must be YYYY-MM-DD") from None
+
+
+def _body() -> Dict[str, Any]:
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise BadRequest("expected a JSON object body")
+    return data
+
+
+def create_app(pool: Optional[StorePool] = None) -> Flask:
+    app = Flask(__name__)
+    pool = pool or StorePool()
+    app.extensions["store_pool"] = pool
+
+    @app.errorhandler(BadRequest)
+    @app.errorhandler(InvalidUser)
+    def bad_request(e):
+        return jsonify(error=str(e)), 400
+
+    @app.get("/health")
+    def health():
+        return jsonify(status="ok", **pool.stats())
+
+    @app.post("/users/<user>/chat")
+    def chat(user: str):
+        text = _body().get("text")
+        if not isinstance(text, str):
+            raise BadRequest("'text' must be a string")
+        with pool.session(user) as orch:
+            return jsonify(response=orch.handle(text))
+
+    @app.get("/users/<user>/transactions")
+    def list_transactions(user: str):
+        args = request.args
+        try:
+            limit = int(args["limit"]) if args.get("limit") else None
+        except ValueError:
+            raise BadRequest("limit must be an integer") from None
+        if limit is not None and limit < 0:
+            raise BadRequest("limit must not be negative")
+        category = args.get("category") or None
+        start, end = _date(args.get("start"), "start"), _date(args.get("end"), "end")
+        with pool.session(user) as orch:
+            txns = orch.txn_service.list(category=category, start=start, end=end, limit=limit,
+                                         reverse=args.get("reverse") in ("1", "true"))
+            total, count = orch.txn_service.stats(category=category, start=start, end=end)
+        return jsonify(transactions=[_txn_json(t) for t in txns], total=f"{total:.2f}", count=count)
+
+    @app.post("/users/<user>/transactions")
+    def add_transaction(user: str):
+        data = _body()
+        try:
+            amount = Decimal(str(data["amount"]))
+        except (KeyError, InvalidOperation):
+            raise BadRequest("'amount' must be a number") from None
+        if not amount.is_finite():
+            raise BadRequest("'amount' must be a finite number")
+        if amount <= 0:
+            raise BadRequest("amount must be positive")
+        try:
+            amount = amount.quantize(CENT, rounding=ROUND_HALF_UP)
+        except InvalidOperation:  # too many digits to store in cents
+            raise BadRequest("amount is too large") from None
+        category = data.get("category")
+        if not isinstance(category, str) or not category.strip():
+            raise BadRequest("'category' is required")
+        category = category.strip().title()
+        description = str(data.get("description") or category)
+        txn_date = _date(data.get("date"), "date")
+        with pool.session(user) as orch:
+            txn = orch.txn_service.add(amount=amount, category=category, description=description, txn_date=txn_date)
+            orch.budget_service.apply(txn)
+        return jsonify(_txn_json(txn)), 201
+
+    @app.get("/users/<user>/budget")
+    def budget(user: str):
+        month = request.args.get("month") or date.today().strftime("%Y-%m")
+        try:
+            month = datetime.strptime(month, "%Y-%m").strftime("%Y-%m")  # "2025-8" -> "2025-08"
+        except ValueError:
+            raise BadRequest("month must be YYYY-MM") from None
+        with pool.session(user) as orch:
+            rows = orch.budget_service.summary(month)
+        return jsonify(month=month, categories=rows)
+
+    @app.get("/users/<user>/export.csv")
+    def export_csv(user: str):
+        buf = io.StringIO()
+        with pool.session(user) as orch:
+            orch.txn_service.write_csv(buf)
+        return Response(buf.getvalue(), mimetype="text/csv",
+                        headers={"Content-Disposition": f"attachment; filename={user}-transactions.csv"})
+
+    return app
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Werkzeug server handing each connection to a fixed thread pool
+    (rather than a new thread per request)."""
+
+    def __init__(self, host: str, port: int, app, workers: int = 8, **kwargs):
+        super().__init__(host, port, app, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+def serve(app: Flask, host: str = "127.0.0.1", port: int = 8000, workers: int = 8):
+    server = PooledWSGIServer(host, port, app, workers=workers)
+    logger.info("Serving on http://%s:%d with %d workers", host, port, workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        app.extensions["store_pool"].close()
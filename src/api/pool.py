@@ -0,0 +1,137 @@
+"""Per-user chat sessions over a bounded pool of open stores."""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Event, Lock, RLock
+from typing import Callable, Dict, Iterator, List, Optional
+
+from chat.orchestrator import ChatOrchestrator
+
+logger = logging.getLogger(__name__)
+
+USER_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")  # also safe as a file name
+
+
+class InvalidUser(ValueError):
+    pass
+
+
+class _Session:
+    def __init__(self, user: str):
+        self.user = user
+        self.lock = RLock()  # serializes this user's requests
+        self.orch: Optional[ChatOrchestrator] = None  # opened on first use, under ``lock``
+        self.users = 0  # requests holding the session; guarded by the pool lock
+        self.closed = Event()  # set once an evicted session's store is closed
+
+
+class StorePool:
+    """Open ``ChatOrchestrator``s (one store each) for up to ``max_open`` users.
+
+    ``data_template`` is an ``open_store`` path or URI with a ``{user}``
+    placeholder, e.g. ``data/users/{user}.json`` or
+    ``sqlite:data/users/{user}.db``. Requests for one user run one at a
+    time; different users only share the short pool lock. When more than
+    ``max_open`` users are open, the least recently used idle ones are
+    closed (flushing journals and closing connections); a session in use
+    is never evicted, so the pool can briefly exceed its bound.
+    """
+
+    def __init__(
+        self,
+        data_template: str = "data/users/{user}.json",
+        max_open: int = 64,
+        factory: Optional[Callable[[str], ChatOrchestrator]] = None,
+    ):
+        if "{user}" not in data_template:
+            raise ValueError("data_template needs a {user} placeholder")
+        self.data_template = data_template
+        self.max_open = max_open
+        self._factory = factory or self._open
+        self._lock = Lock()
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._closing: Dict[str, _Session] = {}  # evicted, store not yet closed
+        self.opened = 0
+        self.evicted = 0
+
+    def _open(self, user: str) -> ChatOrchestrator:
+        return ChatOrchestrator(data_path=self.data_template.format(user=user), onboarding=False)
+
+    @contextmanager
+    def session(self, user: str) -> Iterator[ChatOrchestrator]:
+        """Hold ``user``'s orchestrator (and lock) for the duration of the block."""
+        if not USER_ID_RE.fullmatch(user):
+            raise InvalidUser(f"invalid user id {user!r}")
+        with self._lock:
+            s = self._sessions.get(user)
+            if s is None:
+                s = self._sessions[user] = _Session(user)
+            else:
+                self._sessions.move_to_end(user)
+            s.users += 1
+            closing = self._closing.get(user)
+        try:
+            with s.lock:
+                if s.orch is None:
+                    if closing is not None:
+                        closing.closed.wait()  # never have two stores open on one file
+                    s.orch = self._factory(user)
+                    with self._lock:
+                        self.opened += 1
+                yield s.orch
+        finally:
+            with self._lock:
+                s.users -= 1
+                victims = self._victims()
+            self._close(victims)
+
+    def _victims(self) -> List[_Session]:
+        # caller holds the pool lock
+        victims = []
+        if len(self._sessions) > self.max_open:
+            for user, s in list(self._sessions.items()):
+                if len(self._sessions) <= self.max_open:
+                    break
+                if s.users == 0:
+                    del self._sessions[user]
+                    self._closing[user] = s
+                    victims.append(s)
+        self.evicted += len(victims)
+        return victims
+
+    def _close(self, sessions: List[_Session]):
+        # evicted sessions are out of the pool and idle: nobody else can reach them
+        for s in sessions:
+            with s.lock:
+                if s.orch is not None:
+                    try:
+                        s.orch.store.close()
+                    except Exception:
+                        logger.exception("Closing store for %s failed", s.user)
+                    s.orch = None
+            with self._lock:
+                if self._closing.get(s.user) is s:
+                    del self._closing[s.user]
+            s.closed.set()
+
+    def open_users(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"open": len(self._sessions), "max_open": self.max_open,
+                    "opened": self.opened, "evicted": self.evicted}
+
+    def close(self):
+        """Close every idle session (call on shutdown)."""
+        with self._lock:
+            victims = [s for s in self._sessions.values() if s.users == 0]
+            for s in victims:
+                del self._sessions[s.user]
+                self._closing[s.user] = s
+        self._close(victims)
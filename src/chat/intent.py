@@ -12,20 +12,66 @@ INTENTS = {
     "export": re.compile(r"^(export)(?:\s+(?P<target>\w+))?(?:\s+(?P<path>.+))?$", re.I),
     "receipt": re.compile(r"^(receipt:)(?P<body>[\s\S]+)$", re.I),
     "summary": re.compile(r"^(summary)(?:\s+(?P<window>\d+d))?$", re.I),
+    # trend [category] [Nd]
+    "trend": re.compile(r"^(trend)(?:\s+(?P<category>(?!\d+d$)\w+))?(?:\s+(?P<window>\d+d))?$", re.I),
     "help": re.compile(r"^(help|commands)$", re.I)
 }
 
+# Every pattern starts with a fixed keyword, so the input's first word picks
+# the single pattern that can match it.
+_KEYWORDS = {
+    "add": "add_expense", "expense": "add_expense",
+    "set": "set_budget",
+    "budget": "show_budget",
+    "limits": "limits", "list": "limits",
+    "export": "export",
+    "receipt": "receipt",
+    "summary": "summary",
+    "trend": "trend",
+    "help": "help", "commands": "help",
+}
+_DISPATCH = {kw: (name, INTENTS[name]) for kw, name in _KEYWORDS.items()}
+_HEAD_RE = re.compile(r"[^\W\d_]+")  # leading run of letters
+# add_expense without the trailing date group: when the text does not end in
+# a date that group can never match, and trying it after every description
+# character is most of the cost of a long description
+_ADD_NO_DATE = re.compile(r"^(add|expense)\s+(?P<amount>-?\d+(?:\.\d{1,2})?)\s+(?P<category>\w+)(?:\s+(?P<desc>.*))?$", re.I)
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
 @dataclass
 class ParsedIntent:
     name: str
     args: Dict[str, Any]
 
+def _parsed(name: str, m: Optional[re.Match]) -> Optional[ParsedIntent]:
+    if not m:
+        return None
+    return ParsedIntent(name=name, args={k: v for k, v in m.groupdict().items() if v is not None})
+
+
 class IntentParser:
     def parse(self, text: str) -> Optional[ParsedIntent]:
         t = text.strip()
+        head = _HEAD_RE.match(t)
+        if head is None:
+            return None  # every command starts with a word
+        word = head.group()
+        if not word.isascii():
+            # re.I also folds some non-ASCII letters onto keyword letters
+            # ("ſet" matches "set"), so leave those to the full scan
+            return self._scan(t)
+        hit = _DISPATCH.get(word.lower())
+        if hit is None:
+            return None
+        name, pattern = hit
+        if pattern is INTENTS["add_expense"] and not _DATE_RE.fullmatch(t[-10:]):
+            pattern = _ADD_NO_DATE
+        return _parsed(name, pattern.match(t))
+
+    @staticmethod
+    def _scan(t: str) -> Optional[ParsedIntent]:
         for name, pattern in INTENTS.items():
             m = pattern.match(t)
             if m:
-                groups = {k: v for k, v in m.groupdict().items() if v is not None}
-                return ParsedIntent(name=name, args=groups)
-        return None
\ No newline at end of file
+                return _parsed(name, m)
+        return None
@@ -1,34 +1,43 @@
 from __future__ import annotations
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
-from typing import List
-from pathlib import Path
+from typing import List, Tuple
+import asyncio
 import logging
 
-from core import JsonFilePersistence
+from core import AsyncStore, ReceiptParseResult, Transaction, open_store
 from services.transactions import TransactionService
 from services.budgets import BudgetService
 from services.receipts import SimpleReceiptParser
 from services.categories import CategoryResolver
+from services.analytics import AnalyticsService
 from .intent import IntentParser
 from llm.adapter import MockLLMAdapter
+from llm.context import ContextBuilder
 
 # Configure basic logger
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("chat")
 
-HELP_TEXT = """Commands:\n add 12.34 groceries milk and bread [on YYYY-MM-DD]\n set <category> <limit>  # set budget limit for category\n budget [category]\n limits  # list configured limits\n receipt: <paste receipt text>\n summary 7d|30d\n export csv [path]\n help"""
+HELP_TEXT = """Commands:\n add 12.34 groceries milk and bread [on YYYY-MM-DD]\n set <category> <limit>  # set budget limit for category\n budget [category]\n limits  # list configured limits\n receipt: <paste receipt text>\n summary 7d|30d\n trend [category] 90d  # weekly totals + 7d average\n export csv [path]\n help"""
 
 class ChatOrchestrator:
-    def __init__(self, data_path: str = "data/state.json"):
-        self.store = JsonFilePersistence(Path(data_path))  # type: ignore
+    def __init__(self, data_path: str = "data/state.json", onboarding: bool = True):
+        # data_path may be a JSON file, a .db/.sqlite file or a sqlite:/journal: URI;
+        # onboarding=False skips the setup wizard (scripts, tests)
+        self.store = open_store(data_path)
+        self.async_store = AsyncStore(self.store)  # used by handle_async
         self.txn_service = TransactionService(self.store)
         self.budget_service = BudgetService(self.store)
+        self.analytics = AnalyticsService(self.store)
         self.intent_parser = IntentParser()
-        self.receipt_parser = SimpleReceiptParser(CategoryResolver())
+        self.category_resolver = CategoryResolver()
+        self.category_resolver.learn_from(self.store)  # unmatched receipt lines vote by past categories
+        self.receipt_parser = SimpleReceiptParser(self.category_resolver)
         self.llm = MockLLMAdapter()
+        self.context = ContextBuilder(self.store, self.budget_service)  # prompt context for self.llm
         # Onboarding state
-        self._onboarding_active = True
+        self._onboarding_active = onboarding
         self._onboarding_step = 0
         self._pending_categories: list[tuple[str, str]] = []  # (name, limit_str)
 
@@ -119,6 +128,77 @@ class ChatOrchestrator:
             return f"spent {line['spent']} (no limit)"
         return str(remaining)
 
+    # ---------------- Write intents -----------------
+    # Split into build (validation, no I/O) and reply steps so handle and
+    # handle_async can share them and differ only in how the write is made.
+    def _expense(self, args: dict) -> Transaction | str:
+        try:
+            amount = Decimal(args["amount"])
+        except (KeyError, InvalidOperation):
+            return "Invalid amount. Example: add 12.34 groceries milk"
+        if amount <= 0:
+            return "Amount must be positive."
+        cat = args["category"].title()
+        desc = (args.get("desc") or cat).strip()
+        raw_date = args.get("date")
+        txn_date = None
+        if raw_date:
+            try:
+                txn_date = datetime.strptime(raw_date, "%Y-%m-%d").date()
+            except ValueError:
+                return "Invalid date format. Use YYYY-MM-DD."
+        return Transaction.create(amount=amount, category=cat, description=desc, txn_date=txn_date)
+
+    def _expense_added(self, txn: Transaction) -> str:
+        self.budget_service.apply(txn)
+        month = self.budget_service.month_key(txn.txn_date)
+        summary = self.budget_service.summary(month)
+        line = next((s for s in summary if s["category"].lower() == txn.category.lower()), None)
+        remain = self._friendly_remaining(line)
+        return f"Added {txn.amount:.2f} to {txn.category}. Remaining: {remain}."
+
+    def _receipt(self, args: dict) -> Tuple[ReceiptParseResult, List[Transaction]] | str:
+        body = args.get("body", "").strip()
+        if not body:
+            return "Empty receipt body. Use 'receipt:' then lines like 'Milk 2.50'"
+        result = self.receipt_parser.parse(body)
+        return result, self.receipt_parser.to_transactions(result)
+
+    @staticmethod
+    def _receipt_added(result: ReceiptParseResult, txns: List[Transaction]) -> str:
+        warn_msg = f" Warnings: {len(result.warnings)}" if result.warnings else ""
+        return f"Parsed {len(txns)} lines.{warn_msg}"
+
+    async def handle_async(self, text: str) -> str:
+        """``handle`` for asyncio front ends; never blocks the event loop.
+
+        Expenses and receipts are validated on the loop and saved through
+        ``self.async_store``, whose group commit lets many concurrent
+        sessions share one store write; everything else (and the budget
+        bookkeeping after a write) runs ``handle`` logic on an executor
+        thread. With onboarding on, messages go through ``handle`` in order.
+        """
+        loop = asyncio.get_running_loop()
+        intent = None if self._onboarding_active else self.intent_parser.parse(text)
+        if intent is None or intent.name not in ("add_expense", "receipt"):
+            return await loop.run_in_executor(None, self.handle, text)
+        try:
+            if intent.name == "add_expense":
+                txn = self._expense(intent.args)
+                if isinstance(txn, str):
+                    return txn
+                await self.async_store.save_transaction(txn)
+                return await loop.run_in_executor(None, self._expense_added, txn)
+            parsed = await loop.run_in_executor(None, self._receipt, intent.args)
+            if isinstance(parsed, str):
+                return parsed
+            result, txns = parsed
+            self.budget_service.transactions_saved(await self.async_store.save_transactions(txns))
+            return self._receipt_added(result, txns)
+        except Exception as e:
+            logger.exception("Unhandled error processing intent %s", intent.name)
+            return f"Error: {e}"
+
     def handle(self, text: str) -> str:
         # If onboarding active and no budgets exist yet, divert flow
         if self._onboarding_active:
@@ -137,7 +217,7 @@ class ChatOrchestrator:
                     return self._onboarding_handle(text)
                 # If user issued a command, allow normal intent parsing to proceed (no early onboarding)
                 # Detect if text looks like a command by simple prefix keywords
-                if any(stripped.lower().startswith(pfx) for pfx in ["add ", "set ", "budget", "limits", "receipt:", "summary", "export", "help"]):
+                if any(stripped.lower().startswith(pfx) for pfx in ["add ", "set ", "budget", "limits", "receipt:", "summary", "trend", "export", "help"]):
                     self._onboarding_active = False  # user prefers to dive right in
                 else:
                     # If it doesn't look like a command and not empty, attempt onboarding interpretation
@@ -153,28 +233,11 @@ class ChatOrchestrator:
             if name == "help":
                 return HELP_TEXT
             if name == "add_expense":
-                try:
-                    amount = Decimal(args["amount"])
-                except (KeyError, InvalidOperation):
-                    return "Invalid amount. Example: add 12.34 groceries milk"
-                if amount <= 0:
-                    return "Amount must be positive."
-                cat = args["category"].title()
-                desc = (args.get("desc") or cat).strip()
-                raw_date = args.get("date")
-                txn_date = None
-                if raw_date:
-                    try:
-                        txn_date = datetime.strptime(raw_date, "%Y-%m-%d").date()
-                    except ValueError:
-                        return "Invalid date format. Use YYYY-MM-DD."
-                txn = self.txn_service.add(amount=amount, category=cat, description=desc, txn_date=txn_date)
-                self.budget_service.apply(txn)
-                month = self.budget_service.month_key(txn.txn_date)
-                summary = self.budget_service.summary(month)
-                line = next((s for s in summary if s["category"].lower() == cat.lower()), None)
-                remain = self._friendly_remaining(line)
-                return f"Added {amount:.2f} to {cat}. Remaining: {remain}."
+                txn = self._expense(args)
+                if isinstance(txn, str):
+                    return txn
+                self.store.save_transaction(txn)
+                return self._expense_added(txn)
             if name == "set_budget":
                 cat = args["category"].title()
                 try:
@@ -224,15 +287,12 @@ class ChatOrchestrator:
                 count = self.txn_service.export_csv(path)
                 return f"Exported {count} transactions to {path}."
             if name == "receipt":
-                body = args.get("body", "").strip()
-                if not body:
-                    return "Empty receipt body. Use 'receipt:' then lines like 'Milk 2.50'"
-                result = self.receipt_parser.parse(body)
-                txns = self.receipt_parser.to_transactions(result)
-                for txn in txns:
-                    self.txn_service.add(amount=txn.amount, category=txn.category, description=txn.description)
-                warn_msg = f" Warnings: {len(result.warnings)}" if result.warnings else ""
-                return f"Parsed {len(txns)} lines.{warn_msg}"
+                parsed = self._receipt(args)
+                if isinstance(parsed, str):
+                    return parsed
+                result, txns = parsed
+                self.budget_service.transactions_saved(self.store.save_transactions(txns))
+                return self._receipt_added(result, txns)
             if name == "summary":
                 window = args.get("window", "7d")
                 try:
@@ -240,9 +300,31 @@ class ChatOrchestrator:
                 except ValueError:
                     return "Invalid window. Use e.g. summary 7d"
                 cutoff = datetime.utcnow() - timedelta(days=days)
-                txns = [t for t in self.txn_service.list() if datetime.combine(t.txn_date, datetime.min.time()) >= cutoff]
-                total = sum(t.amount for t in txns)
-                return f"Last {days}d: {total:.2f} across {len(txns)} transactions."
+                # first txn_date whose midnight is >= cutoff
+                start = cutoff.date() if cutoff.time() == datetime.min.time() else cutoff.date() + timedelta(days=1)
+                total, count = self.analytics.window_total(start=start)
+                return f"Last {days}d: {total:.2f} across {count} transactions."
+            if name == "trend":
+                window = args.get("window", "30d")
+                days = int(window[:-1])
+                if days <= 0:
+                    return "Invalid window. Use e.g. trend groceries 90d"
+                cat = args.get("category")
+                cat = cat.title() if cat else None
+                start, end = self.analytics.window(days)
+                total, count = self.analytics.window_total(start, end, category=cat)
+                label = cat or "All spending"
+                if not count:
+                    return f"{label}: no transactions in the last {days}d."
+                weekly = self.analytics.series(start, end, freq="W", category=cat)
+                span = min(7, days)
+                rolling = self.analytics.rolling_average(start, end, window=span, category=cat)
+                weeks = ", ".join(f"{wk:%m-%d} {amt:.2f}" for wk, amt in weekly[-8:])
+                latest = f" {span}d avg/day: {rolling[-1][1]:.2f}." if rolling else ""
+                return (
+                    f"{label} last {days}d: {total:.2f} across {count} transactions "
+                    f"({total / days:.2f}/day).{latest}\nWeekly: {weeks}"
+                )
             return "Unhandled intent."
         except Exception as e:
             logger.exception("Unhandled error processing intent %s", name)
@@ -0,0 +1,97 @@
+"""Replay chat commands non-interactively.
+
+Used by ``python -m src.main --script FILE`` (or with commands piped on
+stdin) to load converted bank statements and similar command dumps.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional
+
+from .orchestrator import ChatOrchestrator
+
+STOP_COMMANDS = {"exit", "quit"}
+FAILED_PREFIXES = ("Error:", "Could not understand")
+
+
+@dataclass
+class ScriptReport:
+    commands: int = 0
+    failed: int = 0  # errors and unrecognised commands
+    commits: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)  # seconds per handled command
+
+    def _percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+    def summary(self) -> str:
+        rate = self.commands / self.elapsed if self.elapsed else 0.0
+        text = (
+            f"{self.commands} commands in {self.elapsed:.2f}s ({rate:,.0f}/s), "
+            f"{self.commits} commit{'s' if self.commits != 1 else ''}"
+        )
+        if self.latencies:
+            text += (
+                f"; latency p50 {self._percentile(0.5) * 1000:.2f}ms"
+                f" p95 {self._percentile(0.95) * 1000:.2f}ms"
+                f" max {max(self.latencies) * 1000:.2f}ms"
+            )
+        if self.failed:
+            text += f"; {self.failed} failed"
+        return text
+
+
+def run_script(
+    orch: ChatOrchestrator,
+    lines: Iterable[str],
+    commit_every: int = 0,
+    on_response: Optional[Callable[[str, str], None]] = None,
+) -> ScriptReport:
+    """Feed ``lines`` through ``orch.handle`` inside store batches.
+
+    Writes are committed once at the end, or after every ``commit_every``
+    commands when it is positive. Blank lines and ``#`` comments are skipped;
+    ``exit``/``quit`` stops early. If the run is interrupted, the batch in
+    progress is rolled back and earlier commits stay.
+    """
+    report = ScriptReport()
+    store = orch.store
+    it = iter(lines)
+    start = time.perf_counter()
+    done = False
+    try:
+        while not done:
+            handled = 0
+            with store.batch():
+                for line in it:
+                    command = line.strip()
+                    if not command or command.startswith("#"):
+                        continue
+                    if command.lower() in STOP_COMMANDS:
+                        done = True
+                        break
+                    t0 = time.perf_counter()
+                    response = orch.handle(command)
+                    report.latencies.append(time.perf_counter() - t0)
+                    report.commands += 1
+                    if response.startswith(FAILED_PREFIXES):
+                        report.failed += 1
+                    if on_response:
+                        on_response(command, response)
+                    handled += 1
+                    if commit_every and handled >= commit_every:
+                        break
+                else:
+                    done = True
+            if handled:
+                report.commits += 1
+    except BaseException:
+        orch.budget_service.invalidate()  # cached budgets may hold rolled-back writes
+        raise
+    finally:
+        report.elapsed = time.perf_counter() - start
+    return report
@@ -1,20 +1,35 @@
 from .models import (
     Transaction,
+    TxnRecord,
     Budget,
     BudgetCategory,
     ReceiptParseResult,
     ReceiptLine,
-    _money
+    _money,
+    _to_cents,
+    _from_cents,
 )
-from .persistence import JsonFilePersistence, Persistence
+from .persistence import JsonFilePersistence, Persistence, PersistenceError, open_store
+from .sqlite_persistence import SqlitePersistence
+from .partitioned_persistence import PartitionedJsonPersistence
+from .async_persistence import AsyncPersistence, AsyncStore
 
 __all__ = [
     "Transaction",
+    "TxnRecord",
     "Budget",
     "BudgetCategory",
     "ReceiptParseResult",
     "ReceiptLine",
     "JsonFilePersistence",
     "Persistence",
-    "_money"
+    "PersistenceError",
+    "SqlitePersistence",
+    "PartitionedJsonPersistence",
+    "AsyncPersistence",
+    "AsyncStore",
+    "open_store",
+    "_money",
+    "_to_cents",
+    "_from_cents",
 ]
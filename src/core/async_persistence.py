@@ -0,0 +1,150 @@
+"""Asyncio interface to the (synchronous) stores.
+
+``AsyncPersistence`` is the protocol async front ends program against;
+``AsyncStore`` implements it over any ``Persistence`` by running calls on
+executor threads, so file and database I/O never blocks the event loop.
+
+Writes are group-committed: writes issued while a commit is in flight
+queue up and all go out in the next single ``store.batch()`` (one JSON
+flush, journal append or SQLite COMMIT), so N concurrent writers cost far
+fewer than N commits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+from .models import Budget, Transaction
+from .persistence import Persistence
+
+
+class AsyncPersistence(Protocol):
+    async def save_transaction(self, txn: Transaction) -> None: ...
+    async def save_transactions(self, txns: List[Transaction]) -> List[Transaction]: ...
+
+    async def list_transactions(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[Transaction]: ...
+
+    async def transaction_stats(
+        self, *, category: Optional[str] = None, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[Decimal, int]: ...
+
+    async def category_totals(self, month: str) -> Dict[str, Decimal]: ...
+    async def get_budget(self, month: str) -> Optional[Budget]: ...
+    async def save_budget(self, budget: Budget) -> None: ...
+    async def close(self) -> None: ...
+
+
+# a queued write: called with the store inside the group's batch
+_Write = Callable[[Persistence], Any]
+
+
+class AsyncStore:
+    """``AsyncPersistence`` over a synchronous ``Persistence``.
+
+    Reads run on ``executor`` (the loop's default executor if None). Writes
+    run on one dedicated writer thread, one group at a time, at most
+    ``max_group`` writes per group. If a group fails on a store with
+    ``atomic_batches`` (rolled back completely), its writes are retried one
+    by one so only the failing ones raise; otherwise every write in the
+    group gets the error.
+    """
+
+    def __init__(self, store: Persistence, executor: Optional[Executor] = None, max_group: int = 1024):
+        self.store = store
+        self.max_group = max_group
+        self._executor = executor
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-writer")
+        self._queue: List[Tuple[_Write, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self.commits = 0  # groups committed (for tests / monitoring)
+
+    # ---------- Reads ----------
+    async def _read(self, fn: Callable, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def list_transactions(self, **filters) -> List[Transaction]:
+        return await self._read(self.store.list_transactions, **filters)
+
+    async def transaction_stats(self, **filters) -> Tuple[Decimal, int]:
+        return await self._read(self.store.transaction_stats, **filters)
+
+    async def category_totals(self, month: str) -> Dict[str, Decimal]:
+        return await self._read(self.store.category_totals, month)
+
+    async def get_budget(self, month: str) -> Optional[Budget]:
+        return await self._read(self.store.get_budget, month)
+
+    # ---------- Writes ----------
+    async def save_transaction(self, txn: Transaction) -> None:
+        await self._write(lambda store: store.save_transaction(txn))
+
+    async def save_transactions(self, txns: List[Transaction]) -> List[Transaction]:
+        txns = list(txns)
+        return await self._write(lambda store: store.save_transactions(txns))
+
+    async def save_budget(self, budget: Budget) -> None:
+        await self._write(lambda store: store.save_budget(budget))
+
+    async def _write(self, write: _Write):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.append((write, fut))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush())
+        return await fut
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(0)  # let writers already scheduled in this loop pass join the first group
+        while self._queue:
+            group, self._queue = self._queue[: self.max_group], self._queue[self.max_group:]
+            outcomes = await loop.run_in_executor(self._writer, self._commit, [w for w, _ in group])
+            for (_, fut), (ok, value) in zip(group, outcomes):
+                if fut.done():  # the writer was cancelled; its write still happened
+                    continue
+                if ok:
+                    fut.set_result(value)
+                else:
+                    fut.set_exception(value)
+
+    def _commit(self, writes: List[_Write]) -> List[Tuple[bool, Any]]:
+        # writer thread
+        try:
+            with self.store.batch():
+                results = [(True, w(self.store)) for w in writes]
+            self.commits += 1
+            return results
+        except Exception as e:
+            if len(writes) == 1 or not self.store.atomic_batches:
+                # without a real rollback some writes may have landed: retrying could apply them twice
+                return [(False, e)] * len(writes)
+        outcomes: List[Tuple[bool, Any]] = []
+        for w in writes:  # the group rolled back: isolate the failing writes
+            try:
+                with self.store.batch():
+                    outcomes.append((True, w(self.store)))
+                self.commits += 1
+            except Exception as e:
+                outcomes.append((False, e))
+        return outcomes
+
+    async def close(self) -> None:
+        """Wait for queued writes, then close the store and the writer thread."""
+        if self._flusher is not None:
+            await self._flusher
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self.store.close)
+        self._writer.shutdown(wait=True)
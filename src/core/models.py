@@ -1,7 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
+import sys
 import uuid
 from decimal import Decimal, ROUND_HALF_UP
 
@@ -14,6 +15,14 @@ def _money(value: Any) -> Money:
     return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
 
+def _to_cents(value: Any) -> int:
+    return int(_money(value) * 100)
+
+
+def _from_cents(cents: int) -> Money:
+    return _money(Decimal(cents).scaleb(-2))
+
+
 @dataclass
 class Transaction:
     id: str
@@ -36,6 +45,82 @@ class Transaction:
         )
 
 
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class TxnRecord:
+    """Compact internal form of a Transaction.
+
+    Integer cents, ordinal day, created_at as microseconds since
+    ``datetime.min``, interned category and ``meta`` only allocated when
+    used. Stores and services work on these; ``to_transaction()`` builds
+    the public façade on the way out.
+    """
+
+    __slots__ = ("id", "cents", "category", "description", "day", "created_us", "_meta")
+
+    def __init__(self, id: str, cents: int, category: str, description: str, day: int, created_us: int,
+                 meta: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.cents = cents
+        self.category = sys.intern(category)
+        self.description = description
+        self.day = day
+        self.created_us = created_us
+        self._meta = meta or None
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = {}
+        return self._meta
+
+    @property
+    def has_meta(self) -> bool:
+        return bool(self._meta)
+
+    @property
+    def sort_key(self) -> int:
+        # (day, created_us) packed into one int; created_us < 2**64 for any datetime
+        return (self.day << 64) | self.created_us
+
+    @property
+    def txn_date(self) -> date:
+        return date.fromordinal(self.day)
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.min + self.created_us * _MICROSECOND
+
+    @staticmethod
+    def day_key(d: date) -> int:
+        """Smallest sort_key on day ``d``."""
+        return d.toordinal() << 64
+
+    @classmethod
+    def from_transaction(cls, txn: "Transaction") -> "TxnRecord":
+        return cls(
+            id=txn.id,
+            cents=_to_cents(txn.amount),
+            category=txn.category,
+            description=txn.description,
+            day=txn.txn_date.toordinal(),
+            created_us=(txn.created_at - datetime.min) // _MICROSECOND,
+            meta=txn.meta,
+        )
+
+    def to_transaction(self) -> "Transaction":
+        return Transaction(
+            id=self.id,
+            amount=Decimal(self.cents).scaleb(-2),  # already exact to the cent
+            category=self.category,
+            description=self.description,
+            txn_date=self.txn_date,
+            created_at=self.created_at,
+            meta=dict(self._meta) if self._meta else {}
+        )
+
+
 @dataclass
 class BudgetCategory:
     name: str
@@ -0,0 +1,391 @@
+from __future__ import annotations
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List, Dict, Literal, Optional, Set, overload
+from datetime import date
+from decimal import Decimal
+
+from .models import Transaction, TxnRecord, Budget, _to_cents, _from_cents
+from .persistence import (
+    Persistence, JsonFilePersistence, _SortedTxns, _budget_from_dict, _budget_to_dict, _check_limit,
+    _record_from_dict, _txn_from_dict, _txn_to_dict,
+)
+
+
+def _write_json(path: Path, obj) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, separators=(",", ":"))
+    tmp.replace(path)
+
+
+def _month_of(d: date) -> str:
+    return d.strftime("%Y-%m")
+
+
+class _Partition:
+    """One month of transactions: raw dicts as stored, per-category totals
+    (in cents) and a lazily decoded index."""
+
+    __slots__ = ("month", "raw", "totals", "_sorted")
+
+    def __init__(self, month: str, raw: List[Dict], totals: Optional[Dict[str, int]] = None):
+        self.month = month
+        self.raw = raw
+        self.totals = totals if totals is not None else self._sum(raw)
+        self._sorted: Optional[_SortedTxns] = None
+
+    @staticmethod
+    def _sum(raw: List[Dict]) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for d in raw:
+            totals[d["category"]] = totals.get(d["category"], 0) + _to_cents(d["amount"])
+        return totals
+
+    def to_json(self) -> Dict:
+        return {"transactions": self.raw, "totals": self.totals}
+
+    def decoded(self) -> _SortedTxns:
+        if self._sorted is None:
+            self._sorted = _SortedTxns(_record_from_dict(d) for d in self.raw)
+        return self._sorted
+
+    def append(self, data: Dict, txn: Transaction):
+        self.raw.append(data)
+        self.totals[data["category"]] = self.totals.get(data["category"], 0) + _to_cents(data["amount"])
+        if self._sorted is not None:
+            self._sorted.add(TxnRecord.from_transaction(txn))
+
+    def remove(self, ids: Set[str]) -> List[Dict]:
+        removed = [d for d in self.raw if d["id"] in ids]
+        if removed:
+            self.raw = [d for d in self.raw if d["id"] not in ids]
+            self.totals = self._sum(self.raw)
+            if self._sorted is not None:
+                self._sorted.discard(ids)
+        return removed
+
+    def restore(self, raw: List[Dict]):
+        self.raw = raw
+        self.totals = self._sum(raw)
+        self._sorted = None
+
+    def truncate(self, n: int):
+        dropped = self.raw[n:]
+        del self.raw[n:]
+        self.totals = self._sum(self.raw)
+        if self._sorted is not None and dropped:
+            self._sorted.discard({d["id"] for d in dropped})
+
+
+class PartitionedJsonPersistence(Persistence):
+    """JSON store split into one file per ``YYYY-MM`` of transactions.
+
+    Layout under ``root``::
+
+        index.json                 known partitions
+        budgets.json               all budgets (small)
+        transactions/YYYY-MM.json  one month of transactions
+
+    Partitions are read only when a query's date range needs them, and at
+    most ``max_loaded`` stay in memory (least recently used are evicted).
+    A write rewrites only its own month's file, which also carries that
+    month's per-category totals.
+
+    A unit of work rewrites several files, so it is not atomic: if writing
+    them fails part way, the files already written stay and the in-memory
+    state is reloaded from disk.
+    """
+
+    atomic_batches = False
+
+    def __init__(self, root: Path, *, max_loaded: int = 6, migrate_from: Optional[Path] = None):
+        super().__init__()
+        self.root = Path(root)
+        self.max_loaded = max(1, max_loaded)
+        self._months: List[str] = []  # sorted partition keys
+        self._budgets: Dict[str, Dict] = {}
+        self._loaded: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._batch_depth = 0
+        self._dirty: Set[str] = set()  # partition months + "index"/"budgets"
+        self._undo: Optional[Dict] = None  # pre-batch state, only while a batch is open
+        self._load(migrate_from)
+
+    # ---------- Internal ----------
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    @property
+    def budgets_path(self) -> Path:
+        return self.root / "budgets.json"
+
+    def partition_path(self, month: str) -> Path:
+        return self.root / "transactions" / f"{month}.json"
+
+    def _load(self, migrate_from: Optional[Path]):
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as f:
+                self._months = sorted(json.load(f).get("partitions", []))
+            if self.budgets_path.exists():
+                with self.budgets_path.open("r", encoding="utf-8") as f:
+                    self._budgets = json.load(f)
+            return
+        if migrate_from is not None and Path(migrate_from).exists():
+            self._migrate(Path(migrate_from))
+            return
+        self._dirty.update({"index", "budgets"})
+        self._commit()
+
+    def _migrate(self, legacy_path: Path):
+        """One-time split of a single-file JsonFilePersistence state."""
+        transactions, budgets = JsonFilePersistence(legacy_path).raw_state()  # replays any journal
+        by_month: Dict[str, List[Dict]] = {}
+        for d in transactions:
+            by_month.setdefault(d["txn_date"][:7], []).append(d)
+        for month, raw in by_month.items():
+            _write_json(self.partition_path(month), _Partition(month, raw).to_json())
+        self._months = sorted(by_month)
+        self._budgets = budgets
+        self._dirty.update({"index", "budgets"})
+        self._commit()
+        legacy_path.replace(legacy_path.with_suffix(".migrated"))
+
+    @overload
+    def _partition(self, month: str) -> Optional[_Partition]: ...
+    @overload
+    def _partition(self, month: str, create: Literal[True]) -> _Partition: ...
+
+    def _partition(self, month: str, create: bool = False) -> Optional[_Partition]:
+        part = self._loaded.get(month)
+        if part is not None:
+            self._loaded.move_to_end(month)
+            return part
+        path = self.partition_path(month)
+        if month in self._months and path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+            part = _Partition(month, stored["transactions"], stored.get("totals"))
+        elif create:
+            part = _Partition(month, [])
+            self._months.append(month)
+            self._months.sort()
+            self._dirty.add("index")
+        else:
+            return None
+        self._loaded[month] = part
+        self._evict()
+        return part
+
+    def _evict(self):
+        for month in list(self._loaded)[:-1]:  # never the one just touched
+            if len(self._loaded) <= self.max_loaded:
+                break
+            if month not in self._dirty:  # unsaved batch writes stay pinned
+                del self._loaded[month]
+
+    def _months_between(self, start: Optional[date], end: Optional[date]) -> List[str]:
+        lo = _month_of(start) if start else None
+        hi = _month_of(end) if end else None
+        return [m for m in self._months if (lo is None or m >= lo) and (hi is None or m <= hi)]
+
+    def _commit(self):
+        try:
+            for key in sorted(self._dirty):
+                if key == "index":
+                    _write_json(self.index_path, {"partitions": self._months})
+                elif key == "budgets":
+                    _write_json(self.budgets_path, self._budgets)
+                else:
+                    _write_json(self.partition_path(key), self._loaded[key].to_json())
+        except BaseException:
+            self._reload()  # files written before the failure stay: memory follows the disk
+            raise
+        self._dirty.clear()
+        self._evict()
+        self._publish()
+
+    def _reload(self):
+        self._loaded.clear()
+        self._dirty.clear()
+        self._months, self._budgets = [], {}
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as f:
+                self._months = sorted(json.load(f).get("partitions", []))
+        if self.budgets_path.exists():
+            with self.budgets_path.open("r", encoding="utf-8") as f:
+                self._budgets = json.load(f)
+        self._rollup_reset()
+        self._discard_unpublished()
+
+    def _written(self, key: str):
+        self._dirty.add(key)
+        if not self._batch_depth:
+            self._commit()
+
+    @property
+    def loaded_partitions(self) -> List[str]:
+        return list(self._loaded)
+
+    # ---------- Public API ----------
+    def save_transaction(self, txn: Transaction):
+        with self._lock:
+            month = _month_of(txn.txn_date)
+            part = self._partition(month, create=True)
+            self._track(month, part)
+            part.append(_txn_to_dict(txn), txn)
+            self._rollup_add(txn)
+            self._queue_saved(txn)
+            self._written(month)
+
+    def delete_transactions(self, ids: Iterable[str]) -> int:
+        """Deletes scan every partition: ids do not say which month holds them."""
+        wanted = set(ids)
+        found = 0
+        with self._lock, self.batch():
+            for month in list(self._months):
+                part = self._partition(month)
+                if part is None or not any(d["id"] in wanted for d in part.raw):
+                    continue
+                self._track(month, part)
+                if self._undo is not None and isinstance(self._undo[month], int):
+                    # truncating no longer undoes this partition: keep its pre-batch rows
+                    self._undo[month] = part.raw[:self._undo[month]]
+                for d in part.remove(wanted):
+                    if self._rollup is not None:
+                        self._rollup.add(date.fromisoformat(d["txn_date"]).toordinal(), d["category"],
+                                         -_to_cents(d["amount"]), -1)
+                    self._queue_removed(_txn_from_dict(d))
+                    found += 1
+                self._written(month)
+        return found
+
+    def list_transactions(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[Transaction]:
+        return [r.to_transaction() for r in self.list_records(
+            category=category, start=start, end=end, limit=limit, reverse=reverse
+        )]
+
+    def list_records(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[TxnRecord]:
+        _check_limit(limit)
+        with self._lock:
+            months = self._months_between(start, end)
+            if reverse:
+                months.reverse()
+            out: List[TxnRecord] = []
+            for month in months:
+                remaining = None if limit is None else limit - len(out)
+                if remaining is not None and remaining <= 0:
+                    break
+                part = self._partition(month)
+                if part is None:
+                    continue
+                out.extend(part.decoded().select(
+                    category=category, start=start, end=end, limit=remaining, reverse=reverse
+                ))
+            return out
+
+    def _rollup_rows(self):
+        # stream partitions from their raw dicts; no full decode, LRU bound still applies
+        for month in list(self._months):
+            part = self._partition(month)
+            if part is None:
+                continue
+            for d in part.raw:
+                yield date.fromisoformat(d["txn_date"]).toordinal(), d["category"], _to_cents(d["amount"]), 1
+
+    def category_totals(self, month: str) -> Dict[str, Decimal]:
+        with self._lock:
+            part = self._partition(month)
+            if part is None:
+                return {}
+            return {c: _from_cents(v) for c, v in part.totals.items()}
+
+    def rebuild_aggregates(self):
+        with self._lock:
+            for month in self._months:
+                part = self._partition(month)
+                if part is None:
+                    continue
+                part.totals = _Partition._sum(part.raw)
+                _write_json(self.partition_path(month), part.to_json())
+
+    def get_budget(self, month: str) -> Optional[Budget]:
+        with self._lock:
+            bdict = self._budgets.get(month)
+            if not bdict:
+                return None
+            return _budget_from_dict(bdict)
+
+    def save_budget(self, budget: Budget):
+        with self._lock:
+            self._track("budgets")
+            self._budgets[budget.month] = _budget_to_dict(budget)
+            self._written("budgets")
+
+    # ---------- Unit of work ----------
+    def _track(self, key: str, part: Optional[_Partition] = None):
+        """Remember pre-batch state of ``key`` so a failed batch can undo it."""
+        if self._undo is None or key in self._undo:
+            return
+        if key == "budgets":
+            self._undo[key] = dict(self._budgets)
+        else:
+            self._undo[key] = len(part.raw) if part is not None else 0
+
+    @contextmanager
+    def batch(self):
+        """Unit of work: each touched file is written once when the block exits.
+
+        If the block raises, in-memory state is rolled back and nothing is written.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            if self._batch_depth > 1:
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+                return
+            self._undo = {}
+            months = list(self._months)
+            try:
+                yield self
+            except BaseException:
+                for key, state in self._undo.items():
+                    if key == "budgets":
+                        self._budgets = state
+                    elif key in self._loaded:
+                        if isinstance(state, list):
+                            self._loaded[key].restore(state)
+                        else:
+                            self._loaded[key].truncate(state)
+                for month in set(self._months) - set(months):
+                    self._loaded.pop(month, None)
+                self._months = months
+                self._dirty.clear()
+                self._rollup_reset()
+                self._discard_unpublished()
+                raise
+            finally:
+                self._undo = None
+                self._batch_depth -= 1
+            self._commit()
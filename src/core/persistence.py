@@ -1,27 +1,386 @@
 from __future__ import annotations
 import json
+import logging
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from threading import RLock
-from typing import List, Dict, Optional, Callable
-from datetime import date, datetime
+from typing import Any, List, Dict, Optional, Callable, Set, Tuple, Iterable
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from .models import Transaction, Budget, BudgetCategory, _money
+from .rollups import DailyRollup, RollupRow
+from .models import Transaction, TxnRecord, Budget, BudgetCategory, _money, _to_cents, _from_cents
+
+logger = logging.getLogger(__name__)
+
+TxnListener = Callable[[List[Transaction]], None]
+
+def _check_limit(limit: Optional[int]):
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit must not be negative, got {limit}")
 
 class PersistenceError(Exception):
     pass
 
 class Persistence:
+    def __init__(self):
+        self._lock = RLock()  # guards the store's state; reentrant for nested calls
+
     def save_transaction(self, txn: Transaction): raise NotImplementedError
-    def list_transactions(self, *, category: Optional[str] = None) -> List[Transaction]: raise NotImplementedError
+    def list_transactions(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[Transaction]:
+        """Transactions ordered by (txn_date, created_at).
+
+        ``start``/``end`` are inclusive dates; ``reverse`` returns newest first
+        and ``limit`` caps the result after ordering (0 gives an empty list; a
+        negative limit raises ``ValueError``).
+        """
+        raise NotImplementedError
+
     def get_budget(self, month: str) -> Optional[Budget]: raise NotImplementedError
     def save_budget(self, budget: Budget): raise NotImplementedError
 
+    def ensure_budget(self, month: str, factory: Callable[[], Budget]) -> Budget:
+        """The stored budget for ``month``, or ``factory()``'s, saved first."""
+        b = self.get_budget(month)
+        if b:
+            return b
+        b = factory()
+        self.save_budget(b)
+        return b
+
+    def delete_transactions(self, ids: Iterable[str]) -> int:
+        """Remove the transactions with these ids as one unit of work; returns
+        how many were found. Stores that cannot delete raise ``NotImplementedError``."""
+        raise NotImplementedError
+
+    def save_transactions(self, txns: Iterable[Transaction]) -> List[Transaction]:
+        """Save several transactions as one unit of work."""
+        with self.batch():
+            saved = []
+            for txn in txns:
+                self.save_transaction(txn)
+                saved.append(txn)
+        return saved
+
+    # True when a failed batch() leaves nothing written, so its writes can be retried
+    atomic_batches = False
+
+    @contextmanager
+    def batch(self):
+        """Group writes into one unit of work. Base stores write through."""
+        yield self
+
+    def close(self):
+        """Release files/connections; committed writes are already durable."""
+
+    def list_records(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[TxnRecord]:
+        """Same selection as ``list_transactions`` in compact ``TxnRecord`` form.
+
+        Records may be shared with the store's cache; treat them as read-only.
+        """
+        return [TxnRecord.from_transaction(t) for t in self.list_transactions(
+            category=category, start=start, end=end, limit=limit, reverse=reverse
+        )]
+
+    def transaction_stats(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Tuple[Decimal, int]:
+        """Return (total amount, count) of matching transactions.
+
+        Answered from the daily rollup: two prefix-sum lookups whatever the
+        range or history size.
+        """
+        cents, count = self.rollup().total(start, end, category)
+        return _from_cents(cents), count
+
+    # ---------- Daily rollups ----------
+    _rollup: Optional[DailyRollup] = None
+
+    def _rollup_rows(self) -> Iterable[RollupRow]:
+        """(day, category, cents, count) rows for every stored transaction."""
+        return ((r.day, r.category, r.cents, 1) for r in self.list_records())
+
+    def rollup(self) -> DailyRollup:
+        """Per-day totals, built on first use and kept current by the store's writes."""
+        with self._lock:
+            if self._rollup is None:
+                self._rollup = DailyRollup.from_rows(self._rollup_rows())
+            return self._rollup
+
+    def _rollup_add(self, txn: Transaction):
+        if self._rollup is not None:
+            self._rollup.add(txn.txn_date.toordinal(), txn.category, _to_cents(txn.amount))
+
+    def _rollup_reset(self):
+        """Drop the rollup (e.g. after a rolled-back batch); rebuilt on next use."""
+        self._rollup = None
+
+    def verify_rollups(self) -> List[str]:
+        """Compare the maintained rollup against a full recompute; [] when consistent."""
+        with self._lock:
+            return self.rollup().diff(DailyRollup.from_rows(self._rollup_rows()))
+
+    def category_totals(self, month: str) -> Dict[str, Decimal]:
+        """Spent per category for ``month`` (YYYY-MM).
+
+        Stores keeping a materialized (month, category) aggregate answer this
+        in O(categories); the fallback scans the month's transactions.
+        """
+        first = date.fromisoformat(f"{month}-01")
+        last = date(first.year + first.month // 12, first.month % 12 + 1, 1) - timedelta(days=1)
+        totals: Dict[str, int] = {}
+        for r in self.list_records(start=first, end=last):
+            totals[r.category] = totals.get(r.category, 0) + r.cents
+        return {c: _from_cents(v) for c, v in totals.items()}
+
+    def rebuild_aggregates(self):
+        """Recompute materialized aggregates from raw transactions (no-op without them)."""
+
+    # ---------- Change listeners ----------
+    _listeners: Tuple[TxnListener, ...] = ()
+    _removal_listeners: Tuple[TxnListener, ...] = ()
+    _unpublished: Optional[List[Transaction]] = None
+    _unpublished_removals: Optional[List[Transaction]] = None
+
+    def add_listener(self, fn: TxnListener):
+        """Call ``fn(transactions)`` with newly saved transactions once they commit.
+
+        A batch is delivered as one call when it commits; rolled-back writes
+        are never delivered. Listeners run on the writing thread and must not
+        raise (errors are logged and swallowed).
+        """
+        with self._lock:
+            self._listeners = self._listeners + (fn,)
+
+    def add_removal_listener(self, fn: TxnListener):
+        """Call ``fn(transactions)`` with deleted transactions once the delete
+        commits; same delivery rules as ``add_listener``."""
+        with self._lock:
+            self._removal_listeners = self._removal_listeners + (fn,)
+
+    def remove_listener(self, fn: TxnListener):
+        with self._lock:
+            self._listeners = tuple(f for f in self._listeners if f is not fn)
+            self._removal_listeners = tuple(f for f in self._removal_listeners if f is not fn)
+
+    def _queue_saved(self, txn: Transaction):
+        """Stores call this for each transaction written in the current unit of work."""
+        if self._listeners:
+            if self._unpublished is None:
+                self._unpublished = []
+            self._unpublished.append(txn)
+
+    def _queue_removed(self, txn: Transaction):
+        """Stores call this for each transaction deleted in the current unit of work."""
+        if self._removal_listeners:
+            if self._unpublished_removals is None:
+                self._unpublished_removals = []
+            self._unpublished_removals.append(txn)
+
+    def _publish(self):
+        """Stores call this after a commit."""
+        removed, self._unpublished_removals = self._unpublished_removals, None
+        events, self._unpublished = self._unpublished, None
+        for listeners, txns in ((self._removal_listeners, removed), (self._listeners, events)):
+            if not txns:
+                continue
+            for fn in listeners:
+                try:
+                    fn(txns)
+                except Exception:
+                    logger.exception("Store listener %r failed", fn)
+
+    def _discard_unpublished(self):
+        self._unpublished = None
+        self._unpublished_removals = None
+
+
+class _SortedTxns:
+    """Transaction records kept ordered by (txn_date, created_at).
+
+    ``keys`` is a parallel array of packed sort keys so inserts and date
+    ranges can bisect without re-sorting.
+    """
+
+    __slots__ = ("keys", "items")
+
+    def __init__(self, records: Iterable[TxnRecord] = ()):
+        self.items: List[TxnRecord] = sorted(records, key=lambda r: r.sort_key)
+        self.keys: List[int] = [r.sort_key for r in self.items]
+
+    def add(self, rec: TxnRecord):
+        key = rec.sort_key
+        if not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.items.append(rec)
+            return
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.items.insert(i, rec)
+
+    def span(self, start: Optional[date], end: Optional[date]) -> Tuple[int, int]:
+        """Index range [lo, hi) of items dated within start..end (inclusive)."""
+        lo = bisect_left(self.keys, TxnRecord.day_key(start)) if start else 0
+        hi = bisect_left(self.keys, TxnRecord.day_key(end + timedelta(days=1))) if end else len(self.keys)
+        return lo, max(lo, hi)
+
+    def select(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[TxnRecord]:
+        if limit is not None and limit <= 0:
+            return []
+        lo, hi = self.span(start, end)
+        if not category:
+            if limit is not None:
+                lo, hi = (max(lo, hi - limit), hi) if reverse else (lo, min(hi, lo + limit))
+            out = self.items[lo:hi]
+            if reverse:
+                out.reverse()
+            return out
+        low = category.lower()
+        indices = range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)
+        out = []
+        for i in indices:
+            r = self.items[i]
+            if r.category.lower() == low:
+                out.append(r)
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def discard(self, ids):
+        keep = [i for i, r in enumerate(self.items) if r.id not in ids]
+        self.keys = [self.keys[i] for i in keep]
+        self.items = [self.items[i] for i in keep]
+
+
+# ---------- JSON codec (shared with the partitioned store) ----------
+def _txn_to_dict(txn: Transaction) -> Dict:
+    return {
+        "id": txn.id,
+        "amount": str(txn.amount),
+        "category": txn.category,
+        "description": txn.description,
+        "txn_date": txn.txn_date.isoformat(),
+        "created_at": txn.created_at.isoformat(),
+        "meta": txn.meta
+    }
+
+
+def _txn_from_dict(d: Dict) -> Transaction:
+    return Transaction(
+        id=d["id"],
+        amount=_money(d["amount"]),
+        category=d["category"],
+        description=d["description"],
+        txn_date=date.fromisoformat(d["txn_date"]),
+        created_at=datetime.fromisoformat(d["created_at"]),
+        meta=d.get("meta") or {}
+    )
+
+
+def _record_from_dict(d: Dict) -> TxnRecord:
+    return TxnRecord(
+        id=d["id"],
+        cents=_to_cents(d["amount"]),
+        category=d["category"],
+        description=d["description"],
+        day=date.fromisoformat(d["txn_date"]).toordinal(),
+        created_us=(datetime.fromisoformat(d["created_at"]) - datetime.min) // timedelta(microseconds=1),
+        meta=d.get("meta")
+    )
+
+
+def _budget_to_dict(b: Budget) -> Dict:
+    return {
+        "id": b.id,
+        "month": b.month,
+        "created_at": b.created_at.isoformat(),
+        "categories": {
+            name: {
+                "name": cat.name,
+                "limit": str(cat.limit),
+                "spent": str(cat.spent)
+            } for name, cat in b.categories.items()
+        }
+    }
+
+
+def _budget_from_dict(d: Dict) -> Budget:
+    cats = {
+        name: BudgetCategory(
+            name=v["name"],
+            limit=_money(v["limit"]),
+            spent=_money(v.get("spent", "0.00"))
+        ) for name, v in d["categories"].items()
+    }
+    return Budget(
+        id=d["id"],
+        month=d["month"],
+        created_at=datetime.fromisoformat(d["created_at"]),
+        categories=cats
+    )
+
+
 class JsonFilePersistence(Persistence):
-    def __init__(self, path: Path):
+    """Single JSON document store.
+
+    With ``journal=True`` writes are appended as compact JSON lines to a
+    ``.journal`` file next to the snapshot instead of rewriting the whole
+    document; the journal is folded back into the snapshot once it grows
+    past ``compact_threshold`` bytes (or on an explicit ``compact()``).
+
+    Per-(month, category) totals are kept in the document's ``aggregates``
+    section and updated together with every transaction write.
+
+    Transactions are decoded once into compact ``TxnRecord``s, cached in
+    date order after the first read and kept current on every write; reads
+    slice that index and only build ``Transaction`` objects for the result.
+    """
+
+    atomic_batches = True
+
+    def __init__(self, path: Path, *, journal: bool = False, compact_threshold: int = 4 * 1024 * 1024):
+        super().__init__()
         self.path = Path(path)
-        self._lock = RLock()
-        self._data = {"transactions": [], "budgets": {}}
+        self.journal = journal
+        self.journal_path = self.path.with_suffix(".journal")
+        self.compact_threshold = compact_threshold
+        self._data: Dict[str, Any] = {"transactions": [], "budgets": {}, "aggregates": {}}
+        self._journal_seq = 0
+        self._journal_size = 0
+        self._sorted: Optional[_SortedTxns] = None  # built lazily on first read
+        self._pending: List[str] = []  # journal lines not yet appended
+        self._dirty = False
+        self._batch_depth = 0
+        self._batch_txns: Optional[List[Dict]] = None  # pre-batch transactions, once a batch deletes
         self._load()
 
     # ---------- Internal ----------
@@ -37,6 +396,14 @@ class JsonFilePersistence(Persistence):
                 self.path.replace(backup)
         else:
             self._flush()
+        if "aggregates" not in self._data:  # file predates aggregates
+            self._rebuild_aggregates()
+        self._journal_seq = self._data.get("journal_seq", 0)
+        if self.journal_path.exists():
+            self._replay_journal()
+            if not self.journal:
+                # journal left behind by a journaled session: fold it in
+                self.compact()
 
     def _flush(self):
         self.path.parent.mkdir(parents=True, exist_ok=True)
@@ -45,92 +412,301 @@ class JsonFilePersistence(Persistence):
             json.dump(self._data, f, indent=2)
         tmp.replace(self.path)
 
-    # ---------- Serialization Helpers ----------
-    @staticmethod
-    def _txn_to_dict(txn: Transaction) -> Dict:
-        return {
-            "id": txn.id,
-            "amount": str(txn.amount),
-            "category": txn.category,
-            "description": txn.description,
-            "txn_date": txn.txn_date.isoformat(),
-            "created_at": txn.created_at.isoformat(),
-            "meta": txn.meta
-        }
+    # ---------- Journal ----------
+    def _apply_entry(self, entry: Dict, txn: Optional[Transaction] = None):
+        op = entry["op"]
+        if op == "txn":
+            data = entry["data"]
+            self._data["transactions"].append(data)
+            month_totals = self._data["aggregates"].setdefault(data["txn_date"][:7], {})
+            month_totals[data["category"]] = month_totals.get(data["category"], 0) + _to_cents(data["amount"])
+            if self._sorted is not None:
+                self._sorted.add(TxnRecord.from_transaction(txn) if txn else _record_from_dict(data))
+            if self._rollup is not None:
+                self._rollup.add(date.fromisoformat(data["txn_date"]).toordinal(), data["category"],
+                                 _to_cents(data["amount"]))
+            if txn is not None:  # live write, not journal replay
+                self._queue_saved(txn)
+        elif op == "delete":
+            self._remove(set(entry["data"]["ids"]))
+        elif op == "budget":
+            self._data["budgets"][entry["data"]["month"]] = entry["data"]
+        else:
+            raise PersistenceError(f"Unknown journal op: {op}")
 
-    @staticmethod
-    def _txn_from_dict(d: Dict) -> Transaction:
-        return Transaction(
-            id=d["id"],
-            amount=_money(d["amount"]),
-            category=d["category"],
-            description=d["description"],
-            txn_date=date.fromisoformat(d["txn_date"]),
-            created_at=datetime.fromisoformat(d["created_at"]),
-            meta=d.get("meta") or {}
-        )
-
-    @staticmethod
-    def _budget_to_dict(b: Budget) -> Dict:
-        return {
-            "id": b.id,
-            "month": b.month,
-            "created_at": b.created_at.isoformat(),
-            "categories": {
-                name: {
-                    "name": cat.name,
-                    "limit": str(cat.limit),
-                    "spent": str(cat.spent)
-                } for name, cat in b.categories.items()
-            }
-        }
+    def _remove(self, ids: Set[str]) -> List[Dict]:
+        if self._batch_depth and self._batch_txns is None:
+            # rollback can no longer just truncate: keep the pre-batch list
+            self._batch_txns = list(self._data["transactions"])
+        keep: List[Dict] = []
+        removed: List[Dict] = []
+        for d in self._data["transactions"]:
+            (removed if d["id"] in ids else keep).append(d)
+        if not removed:
+            return removed
+        self._data["transactions"] = keep
+        for d in removed:
+            month = d["txn_date"][:7]
+            month_totals = self._data["aggregates"].get(month, {})
+            left = month_totals.get(d["category"], 0) - _to_cents(d["amount"])
+            if left:
+                month_totals[d["category"]] = left
+            else:
+                month_totals.pop(d["category"], None)
+                if not month_totals:
+                    self._data["aggregates"].pop(month, None)
+            if self._rollup is not None:
+                self._rollup.add(date.fromisoformat(d["txn_date"]).toordinal(), d["category"],
+                                 -_to_cents(d["amount"]), -1)
+        if self._sorted is not None:
+            self._sorted.discard(ids)
+        return removed
 
-    @staticmethod
-    def _budget_from_dict(d: Dict) -> Budget:
-        cats = {
-            name: BudgetCategory(
-                name=v["name"],
-                limit=_money(v["limit"]),
-                spent=_money(v.get("spent", "0.00"))
-            ) for name, v in d["categories"].items()
-        }
-        return Budget(
-            id=d["id"],
-            month=d["month"],
-            created_at=datetime.fromisoformat(d["created_at"]),
-            categories=cats
-        )
+    def _replay_journal(self):
+        snapshot_seq = self._journal_seq
+        good = 0  # bytes up to the end of the last complete entry
+        newline = True
+        with self.journal_path.open("rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn tail from an interrupted append
+                good += len(line)
+                newline = line.endswith(b"\n")
+                if entry["seq"] <= snapshot_seq:
+                    continue  # already folded into the snapshot
+                self._apply_entry(entry)
+                self._journal_seq = entry["seq"]
+        # cut the torn tail (or terminate a complete last line) so the next
+        # append starts on a line of its own instead of extending garbage
+        with self.journal_path.open("r+b") as f:
+            f.truncate(good)
+            if not newline:
+                f.seek(good)
+                f.write(b"\n")
+                good += 1
+        self._journal_size = good
+
+    def _write(self, op: str, data: Dict, txn: Optional[Transaction] = None):
+        """Apply a mutation in memory and persist it unless a batch is open."""
+        if not self._batch_depth:
+            with self.batch():  # a lone write is its own unit of work, undone if it can't be saved
+                self._write(op, data, txn)
+            return
+        entry: Dict[str, Any] = {"op": op, "data": data}
+        self._apply_entry(entry, txn)
+        if self.journal:
+            self._journal_seq += 1
+            entry["seq"] = self._journal_seq
+            self._pending.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._dirty = True
+
+    def _commit(self):
+        """Persist pending writes: one journal append or one full flush.
+
+        Raises with nothing written if the flush or append fails; ``batch``
+        then rolls the in-memory state back.
+        """
+        if not self._dirty:
+            return
+        if not self.journal:
+            self._flush()
+        else:
+            chunk = "".join(self._pending)
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                with self.journal_path.open("a", encoding="utf-8") as f:
+                    f.write(chunk)
+            except BaseException:
+                if self.journal_path.exists():  # drop whatever part of the chunk got out
+                    with self.journal_path.open("r+b") as f:
+                        f.truncate(self._journal_size)
+                raise
+            self._pending = []
+            self._journal_size += len(chunk.encode("utf-8"))
+            if self._journal_size >= self.compact_threshold:
+                try:
+                    self.compact()
+                except Exception:  # the journal already holds the writes; compact next time
+                    logger.exception("Compacting %s failed", self.journal_path)
+        self._dirty = False
+        self._publish()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate it."""
+        with self._lock:
+            self._data["journal_seq"] = self._journal_seq
+            self._flush()
+            # snapshot records journal_seq, so a crash before truncation only
+            # leaves entries that replay will skip
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_size = 0
+
+    def close(self):
+        """Fold any journal into the snapshot so the file stands alone."""
+        with self._lock:
+            if self.journal and self.journal_path.exists():
+                self.compact()
+
+    def raw_state(self) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Copies of the stored ``(transactions, budgets by month)`` dicts, journal included."""
+        with self._lock:
+            return list(self._data["transactions"]), dict(self._data["budgets"])
+
+    def _decoded(self) -> _SortedTxns:
+        if self._sorted is None:
+            self._sorted = _SortedTxns(_record_from_dict(d) for d in self._data["transactions"])
+        return self._sorted
 
     # ---------- Public API ----------
     def save_transaction(self, txn: Transaction):
         with self._lock:
-            self._data["transactions"].append(self._txn_to_dict(txn))
-            self._flush()
+            self._write("txn", _txn_to_dict(txn), txn)
+
+    def delete_transactions(self, ids: Iterable[str]) -> int:
+        wanted = set(ids)
+        with self._lock:
+            found = [d for d in self._data["transactions"] if d["id"] in wanted]
+            if not found:
+                return 0
+            with self.batch():
+                self._write("delete", {"ids": [d["id"] for d in found]})
+                for d in found:
+                    self._queue_removed(_txn_from_dict(d))
+            return len(found)
 
-    def list_transactions(self, *, category: Optional[str] = None) -> List[Transaction]:
+    def list_transactions(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[Transaction]:
+        return [r.to_transaction() for r in self.list_records(
+            category=category, start=start, end=end, limit=limit, reverse=reverse
+        )]
+
+    def list_records(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[TxnRecord]:
+        _check_limit(limit)
+        with self._lock:
+            return self._decoded().select(
+                category=category, start=start, end=end, limit=limit, reverse=reverse
+            )
+
+    def category_totals(self, month: str) -> Dict[str, Decimal]:
         with self._lock:
-            txns = [self._txn_from_dict(t) for t in self._data["transactions"]]
-        if category:
-            txns = [t for t in txns if t.category.lower() == category.lower()]
-        return sorted(txns, key=lambda t: (t.txn_date, t.created_at))
+            return {c: _from_cents(v) for c, v in self._data["aggregates"].get(month, {}).items()}
+
+    def _rebuild_aggregates(self):
+        aggregates: Dict[str, Dict[str, int]] = {}
+        for d in self._data["transactions"]:
+            month_totals = aggregates.setdefault(d["txn_date"][:7], {})
+            month_totals[d["category"]] = month_totals.get(d["category"], 0) + _to_cents(d["amount"])
+        self._data["aggregates"] = aggregates
+
+    def rebuild_aggregates(self):
+        with self._lock:
+            self._rebuild_aggregates()
+            if self.journal:
+                self.compact()  # aggregates are only persisted in the snapshot
+            else:
+                self._flush()
 
     def get_budget(self, month: str) -> Optional[Budget]:
         with self._lock:
             bdict = self._data["budgets"].get(month)
             if not bdict:
                 return None
-            return self._budget_from_dict(bdict)
+            return _budget_from_dict(bdict)
 
     def save_budget(self, budget: Budget):
         with self._lock:
-            self._data["budgets"][budget.month] = self._budget_to_dict(budget)
-            self._flush()
+            self._write("budget", _budget_to_dict(budget))
 
-    # Convenience
-    def ensure_budget(self, month: str, factory: Callable[[], Budget]) -> Budget:
-        b = self.get_budget(month)
-        if b:
-            return b
-        b = factory()
-        self.save_budget(b)
-        return b
\ No newline at end of file
+    @contextmanager
+    def batch(self):
+        """Unit of work: defer persistence until the block exits.
+
+        If the block raises, or its writes cannot be persisted, in-memory
+        state is rolled back and nothing is written. Nested batches join the
+        outermost one.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            if self._batch_depth > 1:
+                try:
+                    yield self
+                finally:
+                    self._batch_depth -= 1
+                return
+            txn_count = len(self._data["transactions"])
+            self._batch_txns = None
+            budgets = dict(self._data["budgets"])
+            aggregates = {m: dict(c) for m, c in self._data["aggregates"].items()}
+            journal_seq = self._journal_seq
+            try:
+                yield self
+                self._commit()
+            except BaseException:
+                if self._batch_txns is not None:  # the batch deleted: restore the whole list
+                    self._data["transactions"] = self._batch_txns
+                    self._sorted = None
+                else:
+                    added = self._data["transactions"][txn_count:]
+                    del self._data["transactions"][txn_count:]
+                    if self._sorted is not None and added:
+                        self._sorted.discard({d["id"] for d in added})
+                self._data["budgets"] = budgets
+                self._data["aggregates"] = aggregates
+                self._rollup_reset()
+                self._journal_seq = journal_seq
+                self._pending = []
+                self._dirty = False
+                self._discard_unpublished()
+                raise
+            finally:
+                self._batch_txns = None
+                self._batch_depth -= 1
+
+
+def _uri_path(rest: str) -> str:
+    # SQLAlchemy style: sqlite:///relative.db, sqlite:////abs/path.db
+    return rest[3:] if rest.startswith("///") else rest
+
+
+def open_store(uri: str | Path) -> Persistence:
+    """Open a store from a data path / URI.
+
+    ``sqlite:<path>`` or a ``.db``/``.sqlite``/``.sqlite3`` path selects
+    SqlitePersistence, ``journal:<path>`` a journaled JSON file,
+    ``partitioned:<dir>`` (or an existing directory) the month-partitioned
+    layout, anything else the plain JSON file store.
+    """
+    text = str(uri)
+    if text.startswith("sqlite:") or Path(text).suffix.lower() in {".db", ".sqlite", ".sqlite3"}:
+        from .sqlite_persistence import SqlitePersistence  # local import: module imports us
+        if text.startswith("sqlite:"):
+            text = _uri_path(text[len("sqlite:"):])
+        return SqlitePersistence(text)
+    if text.startswith("journal:"):
+        return JsonFilePersistence(Path(_uri_path(text[len("journal:"):])), journal=True)
+    if text.startswith("partitioned:") or Path(text).is_dir():
+        from .partitioned_persistence import PartitionedJsonPersistence
+        if text.startswith("partitioned:"):
+            text = _uri_path(text[len("partitioned:"):])
+        root = Path(text)
+        # data/state -> migrates data/state.json on first open
+        return PartitionedJsonPersistence(root, migrate_from=root.with_suffix(".json"))
+    return JsonFilePersistence(Path(text))
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from datetime import date
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (day ordinal, category, cents, count)
+RollupRow = Tuple[int, str, int, int]
+
+
+class _Series:
+    """Dense per-day cents/count arrays plus prefix sums refreshed lazily."""
+
+    __slots__ = ("cents", "counts", "prefix_cents", "prefix_counts", "dirty_from")
+
+    def __init__(self, n_days: int):
+        self.cents = [0] * n_days
+        self.counts = [0] * n_days
+        self.prefix_cents = [0] * (n_days + 1)
+        self.prefix_counts = [0] * (n_days + 1)
+        self.dirty_from = 0
+
+    def grow(self, before: int, after: int):
+        if before:
+            self.cents[:0] = [0] * before
+            self.counts[:0] = [0] * before
+            self.prefix_cents[:0] = [0] * before
+            self.prefix_counts[:0] = [0] * before
+            self.dirty_from = 0
+        if after:
+            self.cents.extend([0] * after)
+            self.counts.extend([0] * after)
+            last_cents, last_counts = self.prefix_cents[-1], self.prefix_counts[-1]
+            self.prefix_cents.extend([last_cents] * after)
+            self.prefix_counts.extend([last_counts] * after)
+
+    def add(self, i: int, cents: int, count: int):
+        self.cents[i] += cents
+        self.counts[i] += count
+        self.dirty_from = min(self.dirty_from, i)
+
+    def refresh(self):
+        n = len(self.cents)
+        pc, pn = self.prefix_cents, self.prefix_counts
+        for i in range(self.dirty_from, n):
+            pc[i + 1] = pc[i] + self.cents[i]
+            pn[i + 1] = pn[i] + self.counts[i]
+        self.dirty_from = n
+
+
+class DailyRollup:
+    """Per-day totals, overall and per category, answering any inclusive date
+    range with two prefix-sum lookups.
+
+    Inserts bump one day and mark the prefix arrays dirty from that day; the
+    next query re-accumulates only the dirty tail, which for the usual
+    "spent today" insert is a single step. Category keys are case-insensitive
+    to match ``list_transactions(category=...)``.
+    """
+
+    def __init__(self):
+        self.base: Optional[int] = None  # ordinal of index 0
+        self.n_days = 0
+        self._series: Dict[Optional[str], _Series] = {None: _Series(0)}
+        self._lock = Lock()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[RollupRow]) -> "DailyRollup":
+        rollup = cls()
+        for day, category, cents, count in rows:
+            rollup.add(day, category, cents, count)
+        return rollup
+
+    def _index(self, day: int) -> int:
+        if self.base is None:
+            self.base = day
+        before = max(0, self.base - day)
+        after = max(0, day - (self.base + self.n_days - 1))  # days past the current end
+        if before or after:
+            for series in self._series.values():
+                series.grow(before, after)
+            self.base -= before
+            self.n_days += before + after
+        return day - self.base
+
+    def add(self, day: int, category: str, cents: int, count: int = 1):
+        with self._lock:
+            i = self._index(day)
+            key = category.lower()
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.n_days)
+            series.add(i, cents, count)
+            self._series[None].add(i, cents, count)
+
+    def total(self, start: Optional[date] = None, end: Optional[date] = None,
+              category: Optional[str] = None) -> Tuple[int, int]:
+        """(cents, count) for start..end inclusive."""
+        with self._lock:
+            series = self._series.get(category.lower() if category else None)
+            if series is None or self.base is None:
+                return 0, 0
+            series.refresh()
+            lo = 0 if start is None else min(max(start.toordinal() - self.base, 0), self.n_days)
+            hi = self.n_days if end is None else min(max(end.toordinal() - self.base + 1, 0), self.n_days)
+            if hi <= lo:
+                return 0, 0
+            return (series.prefix_cents[hi] - series.prefix_cents[lo],
+                    series.prefix_counts[hi] - series.prefix_counts[lo])
+
+    def days(self) -> Dict[Tuple[int, Optional[str]], Tuple[int, int]]:
+        """Non-empty (day, category-or-None) -> (cents, count) cells."""
+        with self._lock:
+            out: Dict[Tuple[int, Optional[str]], Tuple[int, int]] = {}
+            base = self.base
+            if base is None:
+                return out  # nothing added yet
+            for key, series in self._series.items():
+                for i, (cents, count) in enumerate(zip(series.cents, series.counts)):
+                    if count or cents:
+                        out[(base + i, key)] = (cents, count)
+            return out
+
+    def diff(self, other: "DailyRollup") -> List[str]:
+        """Human-readable cells where the two rollups disagree."""
+        mine, theirs = self.days(), other.days()
+        problems = []
+        for day, key in sorted(set(mine) | set(theirs), key=lambda k: (k[0], k[1] or "")):
+            a, b = mine.get((day, key), (0, 0)), theirs.get((day, key), (0, 0))
+            if a != b:
+                label = key or "<all>"
+                problems.append(f"{date.fromordinal(day)} {label}: rollup {a} != recomputed {b}")
+        return problems
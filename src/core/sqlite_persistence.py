@@ -0,0 +1,295 @@
+from __future__ import annotations
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Iterable
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from .models import Transaction, TxnRecord, Budget, BudgetCategory, _to_cents, _from_cents
+from .persistence import Persistence, _check_limit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    amount_cents INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    txn_date TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    meta TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_txn_date ON transactions (txn_date, created_at);
+CREATE INDEX IF NOT EXISTS idx_txn_category ON transactions (category COLLATE NOCASE, txn_date, created_at);
+CREATE TABLE IF NOT EXISTS budgets (
+    month TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS budget_categories (
+    month TEXT NOT NULL,
+    name TEXT NOT NULL,
+    limit_cents INTEGER NOT NULL,
+    spent_cents INTEGER NOT NULL,
+    PRIMARY KEY (month, name)
+);
+CREATE INDEX IF NOT EXISTS idx_budget_categories_month ON budget_categories (month);
+"""
+
+AGGREGATES_SCHEMA = """
+CREATE TABLE category_totals (
+    month TEXT NOT NULL,
+    category TEXT NOT NULL,
+    total_cents INTEGER NOT NULL,
+    PRIMARY KEY (month, category)
+);
+"""
+
+UPSERT_TOTAL = (
+    "INSERT INTO category_totals (month, category, total_cents) VALUES (?, ?, ?) "
+    "ON CONFLICT (month, category) DO UPDATE SET total_cents = total_cents + excluded.total_cents"
+)
+
+_MICROSECOND = timedelta(microseconds=1)
+ID_CHUNK = 500  # ids per "IN (...)" query, under SQLite's bound-parameter limit
+
+TXN_COLUMNS = "id, amount_cents, category, description, txn_date, created_at, meta"
+
+
+class SqlitePersistence(Persistence):
+    """Persistence backed by a stdlib sqlite3 database (WAL mode).
+
+    Amounts are stored as integer cents so filtering, ordering and sums run
+    inside SQLite against the date/category indexes.
+    """
+
+    atomic_batches = True
+
+    def __init__(self, path: str | Path):
+        super().__init__()
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        has_totals = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_totals'"
+        ).fetchone()
+        if not has_totals:  # database predates aggregates
+            self._conn.executescript(AGGREGATES_SCHEMA)
+            self.rebuild_aggregates()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _tx(self):
+        """BEGIN/COMMIT around the block unless a transaction is already open."""
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN")
+            try:
+                yield
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # a failed COMMIT can leave the transaction open; never let
+                # later writes join it
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                self._rollup_reset()
+                self._discard_unpublished()
+                raise
+            self._publish()
+
+    # ---------- Serialization Helpers ----------
+    @staticmethod
+    def _txn_to_row(txn: Transaction) -> Tuple:
+        return (
+            txn.id,
+            _to_cents(txn.amount),
+            txn.category,
+            txn.description,
+            txn.txn_date.isoformat(),
+            txn.created_at.isoformat(),
+            json.dumps(txn.meta) if txn.meta else None,
+        )
+
+    @staticmethod
+    def _txn_from_row(row: Tuple) -> Transaction:
+        id_, cents, category, description, txn_date, created_at, meta = row
+        return Transaction(
+            id=id_,
+            amount=_from_cents(cents),
+            category=category,
+            description=description,
+            txn_date=date.fromisoformat(txn_date),
+            created_at=datetime.fromisoformat(created_at),
+            meta=json.loads(meta) if meta else {}
+        )
+
+    # ---------- Public API ----------
+    def save_transaction(self, txn: Transaction):
+        self.save_transactions([txn])
+
+    def save_transactions(self, txns: Iterable[Transaction]) -> List[Transaction]:
+        saved = list(txns)
+        rows = [self._txn_to_row(t) for t in saved]
+        with self._tx():
+            self._conn.executemany(
+                f"INSERT INTO transactions ({TXN_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.executemany(UPSERT_TOTAL, [(r[4][:7], r[2], r[1]) for r in rows])
+            for txn in saved:
+                self._rollup_add(txn)
+                self._queue_saved(txn)
+        return saved
+
+    def delete_transactions(self, ids: Iterable[str]) -> int:
+        wanted = list(set(ids))
+        found = 0
+        with self._tx():
+            for i in range(0, len(wanted), ID_CHUNK):
+                chunk = wanted[i:i + ID_CHUNK]
+                marks = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT {TXN_COLUMNS} FROM transactions WHERE id IN ({marks})", chunk
+                ).fetchall()
+                if not rows:
+                    continue
+                self._conn.execute(f"DELETE FROM transactions WHERE id IN ({marks})", chunk)
+                self._conn.executemany(UPSERT_TOTAL, [(r[4][:7], r[2], -r[1]) for r in rows])
+                for row in rows:
+                    txn = self._txn_from_row(row)
+                    if self._rollup is not None:
+                        self._rollup.add(txn.txn_date.toordinal(), txn.category, -row[1], -1)
+                    self._queue_removed(txn)
+                found += len(rows)
+            if found:
+                self._conn.execute("DELETE FROM category_totals WHERE total_cents = 0")
+        return found
+
+    @contextmanager
+    def batch(self):
+        """Unit of work mapped onto one SQLite transaction (rolled back on error)."""
+        with self._tx():
+            yield self
+
+    @staticmethod
+    def _where(category: Optional[str], start: Optional[date], end: Optional[date]) -> Tuple[str, List]:
+        clauses: List[str] = []
+        params: List = []
+        if category:
+            clauses.append("category = ? COLLATE NOCASE")
+            params.append(category)
+        if start:
+            clauses.append("txn_date >= ?")
+            params.append(start.isoformat())
+        if end:
+            clauses.append("txn_date <= ?")
+            params.append(end.isoformat())
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _select(self, category, start, end, limit, reverse) -> List[Tuple]:
+        _check_limit(limit)  # SQLite reads a negative LIMIT as "no limit"
+        where, params = self._where(category, start, end)
+        order = "DESC" if reverse else "ASC"
+        sql = f"SELECT {TXN_COLUMNS} FROM transactions{where} ORDER BY txn_date {order}, created_at {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def list_transactions(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[Transaction]:
+        rows = self._select(category, start, end, limit, reverse)
+        return [self._txn_from_row(r) for r in rows]
+
+    def list_records(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[TxnRecord]:
+        rows = self._select(category, start, end, limit, reverse)
+        return [
+            TxnRecord(
+                id=id_,
+                cents=cents,
+                category=cat,
+                description=desc,
+                day=date.fromisoformat(txn_date).toordinal(),
+                created_us=(datetime.fromisoformat(created_at) - datetime.min) // _MICROSECOND,
+                meta=json.loads(meta) if meta else None,
+            )
+            for id_, cents, cat, desc, txn_date, created_at, meta in rows
+        ]
+
+    def _rollup_rows(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT txn_date, category, SUM(amount_cents), COUNT(*) FROM transactions GROUP BY txn_date, category"
+            ).fetchall()
+        return ((date.fromisoformat(d).toordinal(), cat, cents, count) for d, cat, cents, count in rows)
+
+    def category_totals(self, month: str) -> Dict[str, Decimal]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, total_cents FROM category_totals WHERE month = ?", (month,)
+            ).fetchall()
+        return {category: _from_cents(cents) for category, cents in rows}
+
+    def rebuild_aggregates(self):
+        with self._tx():
+            self._conn.execute("DELETE FROM category_totals")
+            self._conn.execute(
+                "INSERT INTO category_totals (month, category, total_cents) "
+                "SELECT substr(txn_date, 1, 7), category, SUM(amount_cents) FROM transactions GROUP BY 1, 2"
+            )
+
+    def get_budget(self, month: str) -> Optional[Budget]:
+        with self._lock:
+            head = self._conn.execute(
+                "SELECT id, created_at FROM budgets WHERE month = ?", (month,)
+            ).fetchone()
+            if not head:
+                return None
+            rows = self._conn.execute(
+                "SELECT name, limit_cents, spent_cents FROM budget_categories WHERE month = ?", (month,)
+            ).fetchall()
+        cats = {
+            name: BudgetCategory(name=name, limit=_from_cents(limit), spent=_from_cents(spent))
+            for name, limit, spent in rows
+        }
+        return Budget(id=head[0], month=month, created_at=datetime.fromisoformat(head[1]), categories=cats)
+
+    def save_budget(self, budget: Budget):
+        with self._tx():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO budgets (month, id, created_at) VALUES (?, ?, ?)",
+                (budget.month, budget.id, budget.created_at.isoformat()),
+            )
+            self._conn.execute("DELETE FROM budget_categories WHERE month = ?", (budget.month,))
+            self._conn.executemany(
+                "INSERT INTO budget_categories (month, name, limit_cents, spent_cents) VALUES (?, ?, ?, ?)",
+                [
+                    (budget.month, name, _to_cents(cat.limit), _to_cents(cat.spent))
+                    for name, cat in budget.categories.items()
+                ],
+            )
@@ -1,15 +1,178 @@
 from __future__ import annotations
-from typing import List
+import re
+import time
+from collections import OrderedDict
+from threading import BoundedSemaphore, Condition, Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CacheKey = Tuple[Tuple[str, str], ...]
+
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")  # mock "tokens": words with their trailing space
+
+
+def cache_key(messages: List[dict]) -> CacheKey:
+    """Normalized form of a message list: (role, content) pairs with
+    whitespace runs in content collapsed and other keys dropped, so prompts
+    differing only in layout share a cache entry."""
+    return tuple(
+        (str(m.get("role", "")).strip(), _WS_RE.sub(" ", str(m.get("content", ""))).strip())
+        for m in messages
+    )
+
+
+class _Call:
+    """One generation in progress, shared by every identical concurrent request."""
+
+    def __init__(self):
+        self.cond = Condition()
+        self.tokens: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
 
 class LLMAdapter:
-    def complete(self, messages: List[dict]) -> str:
+    """Base adapter: subclasses implement ``_generate(messages)``, yielding
+    text pieces (tokens) as the model produces them.
+
+    ``stream`` and ``complete`` add, in order: an LRU cache of finished
+    responses (``cache_size`` entries, keyed by ``cache_key``), in-flight
+    deduplication (a request identical to one already generating follows
+    its tokens instead of starting another) and a cap of
+    ``max_concurrency`` generations running at once; further requests wait
+    for a slot.
+    """
+
+    def __init__(self, cache_size: int = 256, max_concurrency: int = 4):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._inflight: Dict[CacheKey, _Call] = {}
+        self._lock = Lock()
+        self._slots = BoundedSemaphore(max_concurrency)
+        self.hits = 0
+        self.misses = 0
+        self.deduped = 0
+        self.generations = 0
+
+    def _generate(self, messages: List[dict]) -> Iterator[str]:
         raise NotImplementedError
 
-class MockLLMAdapter(LLMAdapter):
     def complete(self, messages: List[dict]) -> str:
+        return "".join(self.stream(messages))
+
+    def stream(self, messages: List[dict]) -> Iterator[str]:
+        """Yield the response piece by piece (a cached response comes as one piece)."""
+        key = cache_key(messages)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                running = self._inflight.get(key)
+                if running is not None:
+                    self.deduped += 1
+                    running.followers += 1
+                    call, leader = running, False
+                else:
+                    self.misses += 1
+                    call = self._inflight[key] = _Call()
+                    leader = True
+        if cached is not None:
+            yield cached
+        elif leader:
+            yield from self._lead(key, call, messages)
+        else:
+            yield from self._follow(call)
+
+    def _lead(self, key: CacheKey, call: _Call, messages: List[dict]) -> Iterator[str]:
+        finished = False
+        try:
+            with self._slots:
+                with self._lock:
+                    self.generations += 1
+                gen = self._generate(messages)
+                try:
+                    for token in gen:
+                        with call.cond:
+                            call.tokens.append(token)
+                            call.cond.notify_all()
+                        yield token
+                except GeneratorExit:
+                    # our caller stopped reading: drop the partial response,
+                    # unless others are following along and need the rest
+                    with self._lock:
+                        orphan = not call.followers
+                        if orphan:
+                            self._inflight.pop(key, None)  # nobody can join from here on
+                    if not orphan:
+                        for token in gen:
+                            with call.cond:
+                                call.tokens.append(token)
+                                call.cond.notify_all()
+                        finished = True
+                    raise
+                finished = True
+        except BaseException as e:
+            if not finished:
+                call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+                if finished and self.cache_size > 0:
+                    self._cache[key] = "".join(call.tokens)
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            with call.cond:
+                call.done = True
+                call.cond.notify_all()
+
+    @staticmethod
+    def _follow(call: _Call) -> Iterator[str]:
+        i = 0
+        while True:
+            with call.cond:
+                while i == len(call.tokens) and not call.done:
+                    call.cond.wait()
+                new = call.tokens[i:]
+                done, error = call.done, call.error
+            i += len(new)
+            yield from new
+            if done and i == len(call.tokens):
+                if error is not None:
+                    raise RuntimeError("LLM generation failed") from error
+                return
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "deduped": self.deduped,
+                    "generations": self.generations, "size": len(self._cache), "max_size": self.cache_size}
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class MockLLMAdapter(LLMAdapter):
+    """Deterministic echo model. ``token_latency`` (seconds per token, plus
+    ``first_token_latency`` before the first) simulates generation speed so
+    streaming and caching gains can be measured offline."""
+
+    def __init__(self, token_latency: float = 0.0, first_token_latency: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.token_latency = token_latency
+        self.first_token_latency = first_token_latency
+
+    def _generate(self, messages: List[dict]) -> Iterator[str]:
         # echo last user message for determinism
         last_user = next((m for m in reversed(messages) if m.get("role") == "user"), None)
-        if not last_user:
-            return "Hello."
-        content = last_user.get("content", "")
-        return f"(mock echo) {content}"
\ No newline at end of file
+        text = f"(mock echo) {last_user.get('content', '')}" if last_user else "Hello."
+        if self.first_token_latency:
+            time.sleep(self.first_token_latency)
+        for token in _TOKEN_RE.findall(text):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            yield token
@@ -0,0 +1,185 @@
+"""Compact spending context for LLM prompts.
+
+Serializing the transaction history into a prompt grows without bound;
+``ContextBuilder`` instead renders a fixed-shape summary whose cost depends
+only on the number of categories, months and recent items shown:
+
+* budget status for the current month (``BudgetService.summary``, cached
+  there and invalidated by writes),
+* per-category totals for the previous months (the store's materialized
+  (month, category) aggregates, maintained on every save),
+* the most recent transactions, kept in a small window that store
+  listeners update as transactions commit.
+
+The section is capped at ``max_chars`` (or ``max_tokens``); lines are added
+in the order above until the budget runs out.
+"""
+
+from __future__ import annotations
+
+import bisect
+from datetime import date
+from decimal import Decimal
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+from core import Persistence, Transaction
+
+CHARS_PER_TOKEN = 4  # rough average for English text with numbers
+
+# (txn_date, created_at, id, category, amount, description); sorts oldest first
+_Recent = Tuple[date, object, str, str, Decimal, str]
+
+
+def _prev_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year - 1}-12" if mon == 1 else f"{year}-{mon - 1:02d}"
+
+
+class ContextBuilder:
+    """Prompt section summarizing a store's spending within a size budget.
+
+    ``budget_service`` (a ``services.budgets.BudgetService``) supplies limits
+    for the budget status; without it the current month shows totals only.
+    """
+
+    def __init__(
+        self,
+        store: Persistence,
+        budget_service=None,
+        recent: int = 10,
+        history_months: int = 2,
+        max_chars: int = 2000,
+        max_tokens: Optional[int] = None,
+        max_categories: int = 8,
+    ):
+        self.store = store
+        self.budget_service = budget_service
+        self.recent_size = recent
+        self.history_months = history_months
+        self.max_chars = max_tokens * CHARS_PER_TOKEN if max_tokens is not None else max_chars
+        self.max_categories = max_categories
+        self._lock = Lock()
+        self._recent: Optional[List[_Recent]] = None  # loaded on first render
+        store.add_listener(self.on_saved)
+        store.add_removal_listener(self.on_removed)
+
+    # ---------- Incremental state ----------
+    @staticmethod
+    def _entry(t: Transaction) -> _Recent:
+        return (t.txn_date, t.created_at, t.id, t.category, t.amount, t.description)
+
+    def _ensure_recent(self) -> List[_Recent]:
+        with self._lock:
+            if self._recent is not None:
+                return self._recent
+        loaded = sorted(self._entry(t) for t in self.store.list_transactions(limit=self.recent_size, reverse=True))
+        with self._lock:
+            if self._recent is None:
+                self._recent = loaded
+            else:  # a commit arrived while loading: merge without duplicates
+                self._merge(self._recent, loaded)
+            return self._recent
+
+    def _merge(self, recent: List[_Recent], entries: Iterable[_Recent]):
+        # caller holds the lock; ``recent`` is ``self._recent``
+        have = {e[2] for e in recent}
+        for e in entries:
+            if e[2] in have:
+                continue
+            if len(recent) >= self.recent_size and e <= recent[0]:
+                continue  # older than everything kept
+            bisect.insort(recent, e)
+            have.add(e[2])
+            if len(recent) > self.recent_size:
+                have.discard(recent.pop(0)[2])
+
+    def on_saved(self, txns: Iterable[Transaction]):
+        """Store listener: fold newly committed transactions into the recent window."""
+        with self._lock:
+            if self._recent is None:
+                return  # not loaded yet; the first render reads them from the store
+            self._merge(self._recent, (self._entry(t) for t in txns))
+
+    def on_removed(self, txns: Iterable[Transaction]):
+        """Store removal listener: reload the window if it showed a deleted transaction."""
+        with self._lock:
+            if self._recent is not None and {t.id for t in txns} & {e[2] for e in self._recent}:
+                self._recent = None
+
+    # ---------- Rendering ----------
+    def _budget_lines(self, month: str) -> List[str]:
+        if self.budget_service is not None:
+            rows = self.budget_service.summary(month)
+        else:
+            rows = [{"category": c, "spent": f"{v:.2f}", "limit": "0.00"}
+                    for c, v in sorted(self.store.category_totals(month).items())]
+        rows = sorted(rows, key=lambda r: Decimal(r["spent"]), reverse=True)
+        lines = []
+        for r in rows[: self.max_categories]:
+            if Decimal(r["limit"]) == 0:
+                lines.append(f"- {r['category']}: spent {r['spent']} (no limit)")
+            else:
+                lines.append(f"- {r['category']}: spent {r['spent']} of {r['limit']}")
+        if len(rows) > self.max_categories:
+            lines.append(f"- ({len(rows) - self.max_categories} more categories)")
+        return lines
+
+    def _month_line(self, month: str) -> Optional[str]:
+        totals = self.store.category_totals(month)
+        if not totals:
+            return None
+        top = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[: self.max_categories]
+        parts = ", ".join(f"{c} {v:.2f}" for c, v in top)
+        return f"- {month}: total {sum(totals.values()):.2f} ({parts})"
+
+    def sections(self, today: Optional[date] = None) -> List[Tuple[str, List[str]]]:
+        """(heading, lines) in priority order, before size capping."""
+        month = (today or date.today()).strftime("%Y-%m")
+        out = []
+        budget = self._budget_lines(month)
+        if budget:
+            out.append((f"Budget {month}:", budget))
+        history = []
+        m = month
+        for _ in range(self.history_months):
+            m = _prev_month(m)
+            line = self._month_line(m)
+            if line:
+                history.append(line)
+        if history:
+            out.append(("Previous months:", history))
+        recent = self._ensure_recent()
+        with self._lock:
+            recent = list(recent)
+        if recent:
+            out.append(("Recent transactions:", [
+                f"- {d.isoformat()} {cat} {amount:.2f} {desc}".rstrip()
+                for d, _, _, cat, amount, desc in reversed(recent)
+            ]))
+        return out
+
+    def build(self, today: Optional[date] = None) -> str:
+        """The context section, at most ``max_chars`` characters."""
+        budget = self.max_chars
+        out: List[str] = []
+        used = 0
+        for heading, lines in self.sections(today):
+            # a heading is only worth its space with at least one line under it
+            if used + len(heading) + 1 + len(lines[0]) + 1 > budget:
+                break
+            out.append(heading)
+            used += len(heading) + 1
+            for line in lines:
+                if used + len(line) + 1 > budget:
+                    return "\n".join(out)
+                out.append(line)
+                used += len(line) + 1
+        return "\n".join(out)
+
+    def messages(self, text: str, system: str = "You help the user track spending and budgets.",
+                 today: Optional[date] = None) -> List[dict]:
+        """Chat messages for an ``LLMAdapter``: system prompt plus context, then ``text``."""
+        context = self.build(today)
+        content = f"{system}\n\n{context}" if context else system
+        return [{"role": "system", "content": content}, {"role": "user", "content": text}]
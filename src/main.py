@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -11,8 +12,36 @@ if str(CURRENT_DIR) not in sys.path:
     sys.path.insert(0, str(CURRENT_DIR))
 
 from chat.orchestrator import ChatOrchestrator  # core orchestrator
+from chat.script import run_script
 
-def main():
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Finance tracker chat.")
+    p.add_argument("--data", default="data/state.json", help="store path or URI (see open_store)")
+    p.add_argument("--script", metavar="FILE",
+                   help="run commands from FILE ('-' for stdin) instead of chatting; implied when stdin is piped")
+    p.add_argument("--commit-every", type=int, default=0, metavar="N",
+                   help="in script mode, commit after every N commands (default: once at the end)")
+    p.add_argument("--quiet", action="store_true", help="in script mode, print only the summary")
+    return p
+
+
+def run_batch(args) -> int:
+    orch = ChatOrchestrator(data_path=args.data, onboarding=False)
+    show = None if args.quiet else (lambda command, response: print(response))
+    if args.script in (None, "-"):
+        report = run_script(orch, sys.stdin, commit_every=args.commit_every, on_response=show)
+    else:
+        with open(args.script, "r", encoding="utf-8") as f:
+            report = run_script(orch, f, commit_every=args.commit_every, on_response=show)
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.script is not None or not sys.stdin.isatty():
+        return run_batch(args)
     banner = (
         "Finance Tracker Chat (MVP)\n"
         "--------------------------------------------------\n"
@@ -37,7 +66,7 @@ def main():
         "--------------------------------------------------"
     )
     print(banner)
-    orch = ChatOrchestrator()
+    orch = ChatOrchestrator(data_path=args.data)
     while True:
         try:
             user = input("> ").strip()
@@ -59,4 +88,4 @@ def main():
             print(f"Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -5,6 +5,13 @@ Usage pattern (example):
     from src.receipt.ocr import extract_text
     text = extract_text("path/to/receipt.jpg")
 
+    # many images across all cores, results as each one finishes
+    for path, lines in iter_extract(paths, workers=4, timeout=30):
+        ...
+
+    # one Tesseract process per 32 images instead of one per image
+    results = bulk_extract(paths, backend="batch", workers=4)
+
 Design goals:
  - Keep optional: if Tesseract binary or Pillow not present, raise a clear error.
  - Allow a portable (repo-local) install under tools/tesseract/tesseract.exe
@@ -17,11 +24,17 @@ To use a portable binary:
 
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import io
 import os
+import tempfile
+
+from .ocr_cache import OCRCache
 
 PORTABLE_TESSERACT = Path(__file__).resolve().parents[2] / "tools" / "tesseract" / "tesseract.exe"
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "ocr_cache"
 
 
 class OCRError(RuntimeError):
@@ -76,7 +89,99 @@ def _assert_deps() -> None:
         ) from e
 
 
-def extract_text(image_path: str | Path, lang: str = "eng") -> str:
+_READY = False
+
+
+def _ensure_ready() -> None:
+    """Configure and verify Tesseract once per process.
+
+    ``_assert_deps`` shells out for the Tesseract version, so it must not run
+    per image.
+    """
+    global _READY
+    if _READY:
+        return
+    _configure_tesseract()
+    _assert_deps()
+    _READY = True
+
+
+def _worker_init() -> None:
+    # the parent already verified deps; workers only need the binary path
+    global _READY
+    _configure_tesseract()
+    _READY = True
+
+
+def _engine_signature() -> str:
+    """Settings besides language that change OCR output (part of the cache key)."""
+    cmd = os.environ.get("TESSERACT_CMD") or (str(PORTABLE_TESSERACT) if PORTABLE_TESSERACT.exists() else "tesseract")
+    return f"{cmd}|{os.environ.get('TESSDATA_PREFIX', '')}"
+
+
+_CACHE: Optional[OCRCache] = None
+_CACHE_CONFIGURED = False
+
+
+def configure_cache(directory: str | Path | None = None, max_bytes: Optional[int] = None,
+                    enabled: bool = True) -> Optional[OCRCache]:
+    """Set the cache used by extract_text/extract_lines/bulk_extract.
+
+    Defaults come from ``OCR_CACHE_DIR`` (else ``data/ocr_cache`` in the repo)
+    and ``OCR_CACHE_MAX_MB`` (64); ``enabled=False`` turns caching off.
+    """
+    global _CACHE, _CACHE_CONFIGURED
+    _CACHE_CONFIGURED = True
+    if not enabled:
+        _CACHE = None
+        return None
+    directory = directory or os.environ.get("OCR_CACHE_DIR") or DEFAULT_CACHE_DIR
+    if max_bytes is None:
+        max_bytes = int(float(os.environ.get("OCR_CACHE_MAX_MB", "64")) * 1024 * 1024)
+    _CACHE = OCRCache(directory, max_bytes=max_bytes)
+    return _CACHE
+
+
+def get_cache() -> Optional[OCRCache]:
+    if not _CACHE_CONFIGURED:
+        configure_cache(enabled=os.environ.get("OCR_CACHE", "1") != "0")
+    return _CACHE
+
+
+def _cache_key(data: bytes, lang: str, preprocess: bool = False) -> str:
+    settings = [lang, _engine_signature()]
+    if preprocess:  # keeps keys of unprocessed results unchanged
+        settings.append("preprocess")
+    return OCRCache.key(data, *settings)
+
+
+def _ocr_bytes(data: bytes, lang: str, timeout: Optional[float], label: str | Path,
+               preprocess: bool = False) -> str:
+    _ensure_ready()
+    import pytesseract  # type: ignore
+
+    config = ""
+    img: Any  # OpenCV array or PIL image; pytesseract takes either
+    if preprocess:
+        from .preprocess import PreprocessOptions, preprocess_bytes
+
+        opts = PreprocessOptions()
+        img = preprocess_bytes(data, opts)
+        config = f"--dpi {opts.target_dpi}"
+    else:
+        from PIL import Image  # defer heavy import
+
+        img = Image.open(io.BytesIO(data))
+    try:
+        return pytesseract.image_to_string(img, lang=lang, config=config, timeout=timeout or 0)
+    except RuntimeError as e:  # pytesseract reports timeouts as a bare RuntimeError
+        if timeout and "timeout" in str(e).lower():
+            raise OCRError(f"OCR timed out after {timeout}s: {label}") from e
+        raise
+
+
+def extract_text(image_path: str | Path, lang: str = "eng", timeout: Optional[float] = None,
+                 use_cache: bool = True, preprocess: bool = False) -> str:
     """Extract raw text from an image file using Tesseract.
 
     Parameters
@@ -85,34 +190,220 @@ def extract_text(image_path: str | Path, lang: str = "eng") -> str:
         Path to image (jpg, png, etc.)
     lang : str
         Tesseract language code (default 'eng').
+    timeout : float | None
+        Seconds before the Tesseract process is killed (None = no limit).
+    use_cache : bool
+        Look up / store the result in the OCR cache (see ``configure_cache``).
+    preprocess : bool
+        Crop, downscale, deskew and threshold the photo with OpenCV first
+        (see ``receipt.preprocess``); much faster on large phone photos.
     """
-    _configure_tesseract()
-    _assert_deps()
-    from PIL import Image  # defer heavy import
-    import pytesseract  # type: ignore
+    data = Path(image_path).read_bytes()
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        key = _cache_key(data, lang, preprocess)
+        text = cache.get(key)
+        if text is not None:
+            return text
+    text = _ocr_bytes(data, lang, timeout, image_path, preprocess=preprocess)
+    if cache is not None:
+        cache.put(key, text)
+    return text
 
-    img = Image.open(image_path)
-    return pytesseract.image_to_string(img, lang=lang)
 
+def _lines(text: str) -> List[str]:
+    return [ln.strip() for ln in text.splitlines() if ln.strip()]
 
-def extract_lines(image_path: str | Path, lang: str = "eng") -> List[str]:
+
+def extract_lines(image_path: str | Path, lang: str = "eng", timeout: Optional[float] = None,
+                  use_cache: bool = True, preprocess: bool = False) -> List[str]:
     """Extract text and return non-empty stripped lines."""
-    text = extract_text(image_path, lang=lang)
-    return [ln.strip() for ln in text.splitlines() if ln.strip()]
+    return _lines(extract_text(image_path, lang=lang, timeout=timeout, use_cache=use_cache,
+                               preprocess=preprocess))
+
+
+OCRResult = Tuple[str, Union[List[str], OCRError]]
+# in-flight work: a cache key (one image) or a batch of (path, cache key)
+_Job = Union[Optional[str], List[Tuple[str, Optional[str]]]]
+
+
+BACKENDS = ("process", "batch")
+
+
+def iter_extract(
+    paths: Iterable[str | Path],
+    lang: str = "eng",
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    preprocess: bool = False,
+    backend: str = "process",
+    batch_size: int = 32,
+) -> Iterator[OCRResult]:
+    """Yield ``(path, lines | OCRError)`` as each image finishes.
+
+    ``backend="process"`` runs one pytesseract call per image, in a pool of
+    ``workers`` processes (default: CPU count; ``workers=1`` stays
+    in-process). ``backend="batch"`` hands up to ``batch_size`` images to a
+    single Tesseract invocation, with ``workers`` batches in flight, which
+    avoids per-image process start-up (see ``receipt.tesseract_batch``).
+    Cached images are answered without OCR; ``preprocess`` runs the OpenCV
+    clean-up before Tesseract. Dependencies are checked once, before the
+    first real OCR, and raise ``OCRError``; per-image failures (including
+    ``timeout``) are yielded. Results arrive in completion order, so parsing
+    can start immediately.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {backend!r} (expected one of {BACKENDS})")
+    workers = workers or os.cpu_count() or 1
+    cache = get_cache()
+    pool: Optional[Executor]
+    if backend == "batch":
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_worker_init) if workers > 1 else None
+    pending: Dict[Future, _Job] = {}
+    chunk: List[Tuple[str, Optional[str]]] = []
+    try:
+        for p, key, hit in _lookup(paths, cache, lang, preprocess):
+            if hit is not None:
+                yield hit
+                continue
+            _ensure_ready()
+            # OCR itself bypasses the cache; results are stored here so the
+            # hit/miss counters and eviction stay in this process
+            if backend == "batch":
+                chunk.append((p, key))
+                if len(chunk) < batch_size:
+                    continue
+                job, chunk = chunk, []
+                if pool is None:
+                    yield from _store_batch(cache, job, _extract_batch(job, lang, timeout, preprocess, False))
+                    continue
+                pending[pool.submit(_extract_batch, job, lang, timeout, preprocess, True)] = job
+            elif pool is None:
+                yield _store(cache, key, *_extract_text_one(p, lang, timeout, preprocess))
+                continue
+            else:
+                pending[pool.submit(_extract_text_one, p, lang, timeout, preprocess)] = key
+            if len(pending) >= workers * 2:  # bound in-flight work for huge folders
+                yield from _drain(pending, cache)
+        if chunk:
+            if pool is None:
+                yield from _store_batch(cache, chunk, _extract_batch(chunk, lang, timeout, preprocess, False))
+            else:
+                pending[pool.submit(_extract_batch, chunk, lang, timeout, preprocess, True)] = chunk
+        while pending:
+            yield from _drain(pending, cache)
+    finally:
+        if pool is not None:
+            for fut in pending:  # shutdown(cancel_futures=True) needs Python 3.9
+                fut.cancel()
+            pool.shutdown()
+
+
+def _lookup(paths: Iterable[str | Path], cache: Optional[OCRCache], lang: str,
+            preprocess: bool) -> Iterator[Tuple[str, Optional[str], Optional[OCRResult]]]:
+    """``(path, cache key, result)``; ``result`` is set for cache hits and unreadable files."""
+    for p in paths:
+        p = str(p)
+        if cache is None:
+            yield p, None, None
+            continue
+        try:
+            key = _cache_key(Path(p).read_bytes(), lang, preprocess)
+        except OSError as e:
+            yield p, None, (p, OCRError(str(e)))
+            continue
+        text = cache.get(key)
+        yield p, key, (None if text is None else (p, _lines(text)))
+
+
+def _extract_batch(job: List[Tuple[str, Optional[str]]], lang: str, timeout: Optional[float],
+                   preprocess: bool, single_thread: bool) -> List[Tuple[str, Union[str, OCRError]]]:
+    """OCR a chunk in one Tesseract run; falls back to per-image calls if it fails,
+    so one unreadable image only costs its own result."""
+    from .tesseract_batch import run_batch
+
+    paths = [p for p, _ in job]
+    try:
+        if not preprocess:
+            texts = run_batch(paths, lang=lang, timeout=timeout, single_thread=single_thread)
+        else:
+            import cv2  # type: ignore
+            from .preprocess import PreprocessOptions, preprocess_bytes
 
+            opts = PreprocessOptions()
+            with tempfile.TemporaryDirectory(prefix="ocr-prep-") as tmp:
+                cleaned = []
+                for i, p in enumerate(paths):
+                    out = Path(tmp) / f"{i}.png"
+                    cv2.imwrite(str(out), preprocess_bytes(Path(p).read_bytes(), opts))
+                    cleaned.append(out)
+                texts = run_batch(cleaned, lang=lang, timeout=timeout, single_thread=single_thread,
+                                  config=("--dpi", str(opts.target_dpi)))
+        return list(zip(paths, texts))
+    except Exception:  # e.g. cv2.error or a missing cv2: each image then reports its own error
+        return [_extract_text_one(p, lang, timeout, preprocess) for p in paths]
 
-def bulk_extract(paths: Iterable[str | Path], lang: str = "eng") -> dict[str, List[str]]:
+
+def _store_batch(cache: Optional[OCRCache], job: List[Tuple[str, Optional[str]]],
+                 outcomes: List[Tuple[str, Union[str, OCRError]]]) -> Iterator[OCRResult]:
+    for (_, key), (path, outcome) in zip(job, outcomes):
+        yield _store(cache, key, path, outcome)
+
+
+def _extract_text_one(path: str, lang: str, timeout: Optional[float],
+                      preprocess: bool = False) -> Tuple[str, Union[str, OCRError]]:
+    try:
+        return path, extract_text(path, lang=lang, timeout=timeout, use_cache=False, preprocess=preprocess)
+    except OCRError as e:
+        return path, e
+    except Exception as e:
+        return path, OCRError(str(e))
+
+
+def _store(cache: Optional[OCRCache], key: Optional[str], path: str,
+           outcome: Union[str, OCRError]) -> OCRResult:
+    if isinstance(outcome, OCRError):
+        return path, outcome
+    if cache is not None and key is not None:
+        cache.put(key, outcome)
+    return path, _lines(outcome)
+
+
+def _drain(pending: Dict[Future, _Job], cache: Optional[OCRCache]) -> Iterator[OCRResult]:
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for fut in done:
+        job = pending.pop(fut)
+        if isinstance(job, list):  # a batch
+            yield from _store_batch(cache, job, fut.result())
+        else:
+            yield _store(cache, job, *fut.result())
+
+
+def bulk_extract(
+    paths: Iterable[str | Path],
+    lang: str = "eng",
+    workers: Optional[int] = 1,
+    timeout: Optional[float] = None,
+    preprocess: bool = False,
+    backend: str = "process",
+    batch_size: int = 32,
+) -> dict[str, List[str]]:
     """Process multiple image paths; return mapping path -> lines.
 
-    Continues past individual failures, aggregating errors.
+    Continues past individual failures, aggregating errors. See
+    ``iter_extract`` for ``workers``/``timeout``/``preprocess``, the
+    ``backend="batch"`` single-invocation mode and a streaming variant.
     """
     results: dict[str, List[str]] = {}
     errors: dict[str, str] = {}
-    for p in paths:
-        try:
-            results[str(p)] = extract_lines(p, lang=lang)
-        except Exception as e:  # pragma: no cover - simple passthrough
-            errors[str(p)] = str(e)
+    for path, outcome in iter_extract(paths, lang=lang, workers=workers, timeout=timeout,
+                                      preprocess=preprocess, backend=backend, batch_size=batch_size):
+        if isinstance(outcome, OCRError):
+            errors[path] = str(outcome)
+        else:
+            results[path] = outcome
     if errors:
         # Include partial success info
         raise OCRError(
@@ -125,5 +416,8 @@ __all__ = [
     "OCRError",
     "extract_text",
     "extract_lines",
+    "iter_extract",
     "bulk_extract",
+    "configure_cache",
+    "get_cache",
 ]
\ No newline at end of file
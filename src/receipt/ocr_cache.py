@@ -0,0 +1,107 @@
+"""Content-addressed on-disk cache for OCR output.
+
+Entries are keyed by the SHA-256 of the image bytes plus the OCR settings
+(language, engine signature), stored as UTF-8 text files and evicted least
+recently used first once the directory exceeds ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+
+class OCRCache:
+    def __init__(self, directory: str | Path, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._size: Optional[int] = None  # scanned lazily, then maintained
+
+    @staticmethod
+    def key(image_bytes: bytes, *settings: str) -> str:
+        h = hashlib.sha256(image_bytes)
+        for s in settings:
+            h.update(b"\0" + s.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def _entries(self):
+        return self.directory.glob("*/*.txt") if self.directory.exists() else []
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(p.stat().st_size for p in self._entries())
+        return self._size
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+            os.utime(path)  # mtime doubles as last-access time for LRU
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = text.encode("utf-8")
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        with self._lock:
+            size = self._current_size()
+            old = path.stat().st_size if path.exists() else 0
+            tmp.replace(path)
+            self._size = size + len(data) - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        for _, nbytes, p in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+            size -= nbytes
+        self._size = size
+
+    def clear(self) -> None:
+        with self._lock:
+            for p in list(self._entries()):
+                p.unlink(missing_ok=True)
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes": self._current_size(),
+                "max_bytes": self.max_bytes,
+            }
+
+
+__all__ = ["OCRCache"]
@@ -0,0 +1,184 @@
+"""OpenCV clean-up of receipt photos before OCR.
+
+Phone photos are large colour images with the receipt somewhere in the frame,
+usually a little rotated. Tesseract's run time grows with pixel count and it
+reads best at roughly 300 DPI with dark text on a white background, so the
+pipeline here is::
+
+    grayscale -> cap size -> crop + square up the paper -> scale to target DPI
+              -> deskew residual text tilt -> adaptive threshold
+
+Every step works on a ``numpy`` array; ``preprocess_bytes`` decodes an encoded
+image (jpg/png) straight into that pipeline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import cv2  # type: ignore
+except ImportError:  # pragma: no cover - surfaced on first use
+    cv2 = None  # type: ignore[assignment]
+
+# Thermal receipts are 80mm (or 58mm) rolls with ~72mm of printable width.
+RECEIPT_WIDTH_IN = 72 / 25.4
+
+
+@dataclass
+class PreprocessOptions:
+    target_dpi: int = 300
+    crop: bool = True
+    deskew: bool = True
+    threshold: bool = True
+    max_deskew_deg: float = 15.0  # larger "angles" are usually layout, not skew
+
+    @property
+    def target_width(self) -> int:
+        return int(round(RECEIPT_WIDTH_IN * self.target_dpi))
+
+
+def _require_cv2():
+    if cv2 is None:
+        from .ocr import OCRError  # local import: ocr imports this module lazily
+
+        raise OCRError("opencv-python is required for OCR preprocessing")
+    return cv2
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+def resize_to_width(gray: np.ndarray, width: int) -> np.ndarray:
+    h, w = gray.shape[:2]
+    if w == width or w == 0:
+        return gray
+    scale = width / w
+    interp = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    return cv2.resize(gray, (width, max(1, int(round(h * scale)))), interpolation=interp)
+
+
+def _upright(rect) -> Tuple[float, float, float]:
+    """``(angle, width, height)`` of a ``cv2.minAreaRect`` once squared up.
+
+    ``angle`` is the box's counter-clockwise tilt folded into [-45, 45].
+    OpenCV versions disagree on the raw range ([-90, 0) vs (0, 90]); each
+    quarter turn of folding swaps which side counts as the width.
+    """
+    (_, _), (w, h), angle = rect
+    while angle > 45:
+        angle -= 90
+        w, h = h, w
+    while angle < -45:
+        angle += 90
+        w, h = h, w
+    return -angle, w, h
+
+
+def find_receipt(gray: np.ndarray, min_area: float = 0.1):
+    """``cv2.minAreaRect`` of the largest bright region (the paper), or None.
+
+    None means nothing covers at least ``min_area`` of the frame, or the paper
+    already fills it, in which case cropping would not help.
+    """
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, mask = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # close the gaps printed text leaves in the paper blob
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (15, 15))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    largest = max(contours, key=cv2.contourArea)
+    frame = gray.shape[0] * gray.shape[1]
+    area = cv2.contourArea(largest)
+    if area < min_area * frame or area > 0.9 * frame:
+        return None
+    return cv2.minAreaRect(largest)
+
+
+def crop_rect(gray: np.ndarray, rect) -> np.ndarray:
+    """Rotate ``rect`` upright and cut it out (crop + coarse deskew in one warp)."""
+    (cx, cy), _, _ = rect
+    angle, w, h = _upright(rect)
+    matrix = cv2.getRotationMatrix2D((cx, cy), -angle, 1.0)
+    # shift so the rectangle's centre lands in the middle of the output
+    matrix[0, 2] += w / 2 - cx
+    matrix[1, 2] += h / 2 - cy
+    return cv2.warpAffine(gray, matrix, (int(round(w)), int(round(h))),
+                          flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def skew_angle(gray: np.ndarray) -> float:
+    """Rotation (degrees, counter-clockwise positive) of the text block."""
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    # smear characters into text lines so the fitted rectangle follows the lines
+    ink = cv2.dilate(ink, cv2.getStructuringElement(cv2.MORPH_RECT, (25, 3)))
+    coords = cv2.findNonZero(ink)
+    if coords is None or len(coords) < 10:
+        return 0.0
+    return _upright(cv2.minAreaRect(coords))[0]
+
+
+def rotate(gray: np.ndarray, angle: float) -> np.ndarray:
+    h, w = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(gray, matrix, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    # adaptive: phone photos have uneven lighting across the slip
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+
+
+def preprocess(image: np.ndarray, options: Optional[PreprocessOptions] = None) -> np.ndarray:
+    """Run the full pipeline; returns a single-channel uint8 image."""
+    _require_cv2()
+    opts = options or PreprocessOptions()
+    gray = to_gray(image)
+    # work at no more than ~2x the final size; everything after scales with pixels
+    if gray.shape[1] > 2 * opts.target_width:
+        gray = resize_to_width(gray, 2 * opts.target_width)
+    if opts.crop:
+        rect = find_receipt(gray)
+        if rect is not None:
+            if opts.deskew and abs(_upright(rect)[0]) <= opts.max_deskew_deg:
+                gray = crop_rect(gray, rect)
+            else:
+                x, y, w, h = cv2.boundingRect(cv2.boxPoints(rect).astype(np.int32))
+                gray = gray[max(y, 0):y + h, max(x, 0):x + w]
+    gray = resize_to_width(gray, opts.target_width)
+    if opts.deskew:  # residual tilt of the print on the paper
+        angle = skew_angle(gray)
+        if 0.3 < abs(angle) <= opts.max_deskew_deg:
+            gray = rotate(gray, -angle)
+    if opts.threshold:
+        gray = binarize(gray)
+    return gray
+
+
+def preprocess_bytes(data: bytes, options: Optional[PreprocessOptions] = None) -> np.ndarray:
+    """Decode an encoded image and preprocess it."""
+    _require_cv2()
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if image is None:
+        from .ocr import OCRError
+
+        raise OCRError("Could not decode image for preprocessing")
+    return preprocess(image, options)
+
+
+__all__ = [
+    "PreprocessOptions",
+    "preprocess",
+    "preprocess_bytes",
+    "find_receipt",
+    "skew_angle",
+]
@@ -0,0 +1,72 @@
+"""Run Tesseract once for many images.
+
+``pytesseract.image_to_string`` starts a fresh ``tesseract`` process (and
+loads the traineddata) for every image, which dominates the cost for small
+receipts. Tesseract also accepts a text file listing image paths; it then
+OCRs them all in one process and ends each page's text with a form feed, so
+the output can be split back per image.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from .ocr import OCRError
+
+PAGE_SEPARATOR = "\f"
+
+
+def tesseract_cmd() -> str:
+    import pytesseract  # type: ignore
+
+    return pytesseract.pytesseract.tesseract_cmd
+
+
+def run_batch(
+    images: Sequence[str | Path],
+    lang: str = "eng",
+    timeout: Optional[float] = None,
+    config: Sequence[str] = (),
+    single_thread: bool = False,
+) -> List[str]:
+    """OCR ``images`` in one Tesseract invocation; returns one text per image.
+
+    ``timeout`` is per image and scaled to the batch. ``single_thread`` sets
+    ``OMP_THREAD_LIMIT=1`` so several batches can run side by side without
+    oversubscribing cores. Raises ``OCRError`` if Tesseract fails or the
+    output does not split into exactly one page per image (e.g. a
+    multi-page TIFF in the list).
+    """
+    if not images:
+        return []
+    env = dict(os.environ, OMP_THREAD_LIMIT="1") if single_thread else None
+    with tempfile.TemporaryDirectory(prefix="ocr-batch-") as tmp:
+        listfile = Path(tmp) / "images.txt"
+        listfile.write_text("\n".join(str(Path(p).resolve()) for p in images) + "\n", encoding="utf-8")
+        try:
+            proc = subprocess.run(
+                [tesseract_cmd(), str(listfile), "stdout", "-l", lang, *config],
+                capture_output=True,
+                timeout=timeout * len(images) if timeout else None,
+                env=env,
+            )
+        except subprocess.TimeoutExpired as e:
+            raise OCRError(f"OCR batch of {len(images)} timed out") from e
+        except OSError as e:
+            raise OCRError(f"Could not start Tesseract: {e}") from e
+    if proc.returncode != 0:
+        raise OCRError(f"Tesseract batch failed ({proc.returncode}): {proc.stderr.decode(errors='replace').strip()}")
+    pages = proc.stdout.decode("utf-8", errors="replace").split(PAGE_SEPARATOR)
+    # every page is terminated by the separator, leaving one empty tail
+    if len(pages) == len(images) + 1 and not pages[-1].strip():
+        pages.pop()
+    if len(pages) != len(images):
+        raise OCRError(f"Tesseract batch returned {len(pages)} pages for {len(images)} images")
+    return pages
+
+
+__all__ = ["run_batch", "tesseract_cmd", "PAGE_SEPARATOR"]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple, Iterable
+
+import numpy as np
+
+from core import Persistence, TxnRecord, _from_cents
+
+# numpy datetime64[D] counts days from 1970-01-01; TxnRecord.day is a date ordinal
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass
+class Columns:
+    """Columnar view of a set of transaction records."""
+    cents: np.ndarray       # int64
+    days: np.ndarray        # int64 date ordinals
+    cat_codes: np.ndarray   # int32 index into categories
+    categories: List[str]
+
+    @classmethod
+    def from_records(cls, records: Iterable[TxnRecord]) -> "Columns":
+        records = list(records)
+        codes: Dict[str, int] = {}
+        cat_codes = np.fromiter(
+            (codes.setdefault(r.category, len(codes)) for r in records), dtype=np.int32, count=len(records)
+        )
+        return cls(
+            cents=np.fromiter((r.cents for r in records), dtype=np.int64, count=len(records)),
+            days=np.fromiter((r.day for r in records), dtype=np.int64, count=len(records)),
+            cat_codes=cat_codes,
+            categories=list(codes),
+        )
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+
+class AnalyticsService:
+    """Window totals, breakdowns and time series computed with numpy.
+
+    Each query pulls only the records in its date window from the store
+    (``Persistence.list_records``) and works on int64 cent columns.
+    """
+
+    def __init__(self, store: Persistence):
+        self.store = store
+
+    def columns(self, start: Optional[date] = None, end: Optional[date] = None,
+                category: Optional[str] = None) -> Columns:
+        return Columns.from_records(self.store.list_records(category=category, start=start, end=end))
+
+    @staticmethod
+    def window(days: int, today: Optional[date] = None) -> Tuple[date, date]:
+        """Inclusive (start, end) covering the last ``days`` days up to today."""
+        end = today or date.today()
+        return end - timedelta(days=max(days, 1) - 1), end
+
+    def window_total(self, start: Optional[date] = None, end: Optional[date] = None,
+                     category: Optional[str] = None) -> Tuple[Decimal, int]:
+        # plain totals come straight from the store's prefix-sum rollup
+        return self.store.transaction_stats(category=category, start=start, end=end)
+
+    def by_category(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Decimal]:
+        cols = self.columns(start, end)
+        if not len(cols):
+            return {}
+        sums = np.zeros(len(cols.categories), dtype=np.int64)
+        np.add.at(sums, cols.cat_codes, cols.cents)
+        return {name: _from_cents(int(sums[i])) for i, name in enumerate(cols.categories)}
+
+    def daily(self, start: date, end: date, category: Optional[str] = None) -> np.ndarray:
+        """int64 cents per day for start..end (inclusive), zero-filled."""
+        cols = self.columns(start, end, category)
+        n_days = (end - start).days + 1
+        out = np.zeros(n_days, dtype=np.int64)
+        np.add.at(out, cols.days - start.toordinal(), cols.cents)
+        return out
+
+    def series(self, start: date, end: date, freq: str = "D",
+               category: Optional[str] = None) -> List[Tuple[date, Decimal]]:
+        """Totals per day ("D"), ISO week ("W", keyed by Monday) or month ("M")."""
+        daily = self.daily(start, end, category)
+        if freq == "D":
+            return [(start + timedelta(days=i), _from_cents(int(c))) for i, c in enumerate(daily)]
+        days64 = np.arange(start.toordinal(), end.toordinal() + 1) - _EPOCH_ORDINAL
+        if freq == "W":
+            # 1970-01-01 was a Thursday: shift by 3 so buckets start on Monday
+            buckets = (days64 + 3) // 7
+            labels = buckets * 7 - 3
+        elif freq == "M":
+            buckets = days64.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+            labels = buckets.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        else:
+            raise ValueError(f"Unsupported frequency: {freq}")
+        keys, first = np.unique(buckets, return_index=True)
+        sums = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(sums, np.searchsorted(keys, buckets), daily)
+        return [
+            (date.fromordinal(int(labels[i]) + _EPOCH_ORDINAL), _from_cents(int(s)))
+            for i, s in zip(first, sums)
+        ]
+
+    def rolling_average(self, start: date, end: date, window: int = 7,
+                        category: Optional[str] = None) -> List[Tuple[date, Decimal]]:
+        """Trailing ``window``-day mean of daily spend, for each day with a full window."""
+        daily = self.daily(start, end, category)
+        if window <= 0 or len(daily) < window:
+            return []
+        csum = np.concatenate(([0], np.cumsum(daily)))
+        means = (csum[window:] - csum[:-window]) / window
+        return [
+            (start + timedelta(days=window - 1 + i), _from_cents(int(round(m))))
+            for i, m in enumerate(means)
+        ]
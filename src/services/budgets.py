@@ -1,54 +1,155 @@
 from __future__ import annotations
+from dataclasses import replace
 from datetime import date
-from typing import Dict, Any, List
+from threading import Lock, RLock
+from typing import Dict, Any, Iterable, List, Optional
 from decimal import Decimal
 
 from core import Budget, BudgetCategory, Transaction, Persistence, _money
 
 class BudgetService:
+    """Budget limits per month, with spending read from the store's aggregates.
+
+    Budgets and summary rows are cached per month. Budget writes made through
+    this service update the cache, and new transactions (from any writer
+    on the same store, via ``store.add_listener``) drop the summaries of
+    their months, so repeated reads decode nothing. Call ``invalidate`` after
+    changing budgets on the store directly.
+
+    Cached budgets are never modified: writers save a changed copy and swap
+    it in, so readers on other threads always see a whole budget.
+    """
+
     def __init__(self, store: Persistence):
         self.store = store
+        self._lock = Lock()
+        self._write_lock = RLock()  # one read-modify-save at a time
+        self._budgets: Dict[str, Optional[Budget]] = {}
+        self._summaries: Dict[str, List[dict]] = {}
+        self._generation = 0  # bumped by every invalidation; guards caching a stale read
+        store.add_listener(self.transactions_saved)
+        store.add_removal_listener(self.transactions_saved)  # deletes change the totals too
 
     def month_key(self, dt: date) -> str:
         return dt.strftime("%Y-%m")
 
-    def get_or_create(self, month: str, categories: Dict[str, Any] | None = None) -> Budget:
-        existing = self.store.get_budget(month)
-        if existing:
-            return existing
-        categories = categories or {}
-        b = Budget.create(month, categories)
-        self.store.save_budget(b)
+    # ---------- Cache ----------
+    def invalidate(self, month: Optional[str] = None):
+        """Forget cached budgets and summaries for ``month`` (all months if None)."""
+        with self._lock:
+            self._generation += 1
+            if month is None:
+                self._budgets.clear()
+                self._summaries.clear()
+            else:
+                self._budgets.pop(month, None)
+                self._summaries.pop(month, None)
+
+    def transactions_saved(self, txns: Iterable[Transaction]):
+        """Drop cached summaries for the months of ``txns``.
+
+        Registered as a store listener; call it directly for writes inside an
+        open ``store.batch()``, which listeners only hear about at commit.
+        """
+        months = {self.month_key(t.txn_date) for t in txns}
+        with self._lock:
+            self._generation += 1
+            for month in months:
+                self._summaries.pop(month, None)
+
+    def _budget(self, month: str) -> Optional[Budget]:
+        # the cached object is shared and must not be modified; see _save
+        try:  # one lookup, so a concurrent invalidation can't slip in between check and read
+            return self._budgets[month]
+        except KeyError:
+            pass
+        with self._lock:
+            generation = self._generation
+        b = self.store.get_budget(month)
+        with self._lock:
+            if generation == self._generation:
+                self._budgets[month] = b
         return b
 
+    def _save(self, b: Budget):
+        self.store.save_budget(b)
+        with self._lock:
+            self._generation += 1
+            self._budgets[b.month] = b
+            self._summaries.pop(b.month, None)
+
+    def get_or_create(self, month: str, categories: Dict[str, Any] | None = None) -> Budget:
+        with self._write_lock:
+            existing = self._budget(month)
+            if existing:
+                return existing
+            categories = categories or {}
+            b = Budget.create(month, categories)
+            self._save(b)
+            return b
+
     def apply(self, txn: Transaction):
+        """Make sure txn's category is tracked in its month's budget.
+
+        Spent amounts are not stored on the budget; ``summary`` reads them from
+        the store's per-(month, category) aggregates.
+        """
+        self.transactions_saved([txn])
         month = self.month_key(txn.txn_date)
-        b = self.store.get_budget(month)
-        if not b:
-            b = Budget.create(month, {txn.category: Decimal("0.00")})
-        b.apply_transaction(txn)
-        self.store.save_budget(b)
+        b = self._budget(month)
+        if b and txn.category in b.categories:
+            return
+        with self._write_lock:
+            b = self._budget(month)
+            if b and txn.category in b.categories:
+                return
+            new_cat = BudgetCategory(name=txn.category, limit=Decimal("0.00"))
+            if not b:
+                b = Budget.create(month, {txn.category: new_cat})
+            else:
+                b = replace(b, categories={**b.categories, txn.category: new_cat})
+            self._save(b)
 
     def summary(self, month: str) -> List[dict]:
-        b = self.store.get_budget(month)
-        if not b:
+        rows = self._summaries.get(month)
+        if rows is None:
+            with self._lock:
+                generation = self._generation
+            rows = self._summary(month)
+            with self._lock:
+                if generation == self._generation:
+                    self._summaries[month] = rows
+        return [dict(r) for r in rows]
+
+    def _summary(self, month: str) -> List[dict]:
+        b = self._budget(month)
+        totals = self.store.category_totals(month)
+        if not b and not totals:
             return []
-        return b.summary()
+        limits = {name: cat.limit for name, cat in b.categories.items()} if b else {}
+        cats = {
+            name: BudgetCategory(
+                name=name,
+                limit=limits.get(name, Decimal("0.00")),
+                spent=totals.get(name, Decimal("0.00"))
+            ) for name in set(limits) | set(totals)
+        }
+        return Budget(id=b.id if b else "", month=month, categories=cats).summary()
 
     def set_limits(self, month: str, updates: Dict[str, Any]):
-        b = self.get_or_create(month)
-        for name, limit in updates.items():
-            cat = b.categories.get(name)
-            if not cat:
-                cat = BudgetCategory(name=name, limit=_money(limit))
-                b.categories[name] = cat
-            else:
-                cat.limit = _money(limit)
-        self.store.save_budget(b)
-        return b
+        limits = {name: _money(limit) for name, limit in updates.items()}
+        with self._write_lock:
+            b = self.get_or_create(month)
+            categories = dict(b.categories)
+            for name, limit in limits.items():
+                cat = categories.get(name)
+                categories[name] = replace(cat, limit=limit) if cat else BudgetCategory(name=name, limit=limit)
+            b = replace(b, categories=categories)
+            self._save(b)
+            return b
 
     def list_limits(self, month: str) -> List[dict]:
-        b = self.store.get_budget(month)
+        b = self._budget(month)
         if not b:
             return []
         out: List[dict] = []
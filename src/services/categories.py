@@ -1,25 +1,291 @@
 from __future__ import annotations
-from typing import List, Tuple
+import csv
+import json
+import re
+from collections import OrderedDict, deque
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import Persistence, Transaction
+
+DEFAULT_RULES: List[Tuple[str, str]] = [
+    ("grocery", "Groceries"),
+    ("supermarket", "Groceries"),
+    ("fuel", "Transport"),
+    ("gas", "Transport"),
+    ("uber", "Transport"),
+    ("rent", "Housing"),
+    ("coffee", "Dining"),
+    ("restaurant", "Dining"),
+    ("pharmacy", "Health"),
+]
+
+_NO_MATCH = 1 << 62
+# below this many rules, C-level ``kw in text`` per rule beats stepping the
+# automaton one character at a time in Python (see benchmarks/bench_category_resolve.py)
+LINEAR_MAX_RULES = 64
+
+_DIGITS_RE = re.compile(r"\d+")
+_TOKEN_RE = re.compile(r"[^\W\d_]{2,}")  # words of 2+ letters; store numbers, amounts etc. drop out
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher over a list of keywords.
+
+    ``first(text)`` returns the index of the earliest keyword (in list order)
+    occurring anywhere in ``text``, or -1, in one pass over the text no
+    matter how many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        goto: List[Dict[str, int]] = [{}]
+        best: List[int] = [_NO_MATCH]  # lowest keyword index ending at each node
+        for index, keyword in enumerate(keywords):
+            if not keyword:
+                continue
+            node = 0
+            for ch in keyword:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = goto[node][ch] = len(goto)
+                    goto.append({})
+                    best.append(_NO_MATCH)
+                node = nxt
+            best[node] = min(best[node], index)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            # a node also matches everything its longest proper suffix matches
+            best[node] = min(best[node], best[fail[node]])
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                queue.append(child)
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def first(self, text: str) -> int:
+        goto, fail, best = self._goto, self._fail, self._best
+        node, found = 0, _NO_MATCH
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break
+        return -1 if found == _NO_MATCH else found
+
 
 class CategoryResolver:
-    def __init__(self, rules: List[Tuple[str, str]] | None = None, default: str = "Other"):
-        # rules: list of (keyword_lower, category)
+    """Maps a description to a category by keyword rules.
+
+    Rules are compiled once into a ``KeywordAutomaton``, so large merchant
+    lists cost one pass over the text instead of one substring search per
+    rule; small lists keep the plain scan, which is faster at that size.
+
+    With an automaton, rule results are also memoized (LRU, ``memo_size``
+    entries) per normalized description; for small lists the scan is
+    cheaper than the memo lookup itself. When no rule matches, a token index learned from past
+    transactions (see ``learn_from``) votes for the category most often
+    seen with the description's words.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str]] | None = None, default: str = "Other",
+                 memo_size: int = 4096):
+        # rules: list of (keyword, category); the first rule whose keyword
+        # occurs in the text wins, matching is case-insensitive
         self.default = default
-        self.rules = rules or [
-            ("grocery", "Groceries"),
-            ("supermarket", "Groceries"),
-            ("fuel", "Transport"),
-            ("gas", "Transport"),
-            ("uber", "Transport"),
-            ("rent", "Housing"),
-            ("coffee", "Dining"),
-            ("restaurant", "Dining"),
-            ("pharmacy", "Health"),
-        ]
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self._history: Optional[Persistence] = None
+        self._index: Optional[Dict[str, Dict[str, int]]] = None  # token -> category -> count
+        # (+1 saved / -1 deleted, txn) events that arrived while the index was being built
+        self._arrived: Optional[List[Tuple[int, Transaction]]] = None
+        self.rules = rules or DEFAULT_RULES
+
+    @property
+    def rules(self) -> List[Tuple[str, str]]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: Iterable[Tuple[str, str]]):
+        self._rules = [(kw.lower(), cat) for kw, cat in rules]
+        self._automaton = (
+            KeywordAutomaton(kw for kw, _ in self._rules) if len(self._rules) > LINEAR_MAX_RULES else None
+        )
+        # digit runs can share a memo entry unless some keyword contains digits
+        self._digits_matter = any(ch.isdigit() for kw, _ in self._rules for ch in kw)
+        with self._lock:
+            self._memo.clear()
+
+    @classmethod
+    def from_file(cls, path: str | Path, default: str = "Other") -> "CategoryResolver":
+        """Load rules from JSON (``[[keyword, category], ...]`` or
+        ``{keyword: category}``) or CSV-style text (``keyword,category`` per
+        line; blank lines and ``#`` comments are skipped). File order is
+        rule priority.
+        """
+        path = Path(path)
+        with path.open("r", encoding="utf-8", newline="") as f:
+            rules: List[Tuple[str, str]]
+            if path.suffix.lower() == ".json":
+                raw = json.load(f)
+                rules = list(raw.items()) if isinstance(raw, dict) else [tuple(r) for r in raw]
+            else:
+                rules = []
+                for row in csv.reader(f):
+                    if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                        continue
+                    if len(row) < 2:
+                        raise ValueError(f"{path}: expected 'keyword,category', got {row!r}")
+                    rules.append((row[0].strip(), row[1].strip()))
+        return cls(rules, default=default)
+
+    def _memo_key(self, low: str) -> str:
+        # "STARBUCKS #1234" and "#5678" share an entry: a keyword without
+        # digits matches the same way whatever the numbers are (NUL cannot
+        # occur in a keyword, so it stands in for any digit run)
+        return low if self._digits_matter else _DIGITS_RE.sub("\0", low)
+
+    def _match_rules(self, low: str) -> Optional[str]:
+        if self._automaton is None:
+            for kw, cat in self._rules:
+                if kw and kw in low:
+                    return cat
+            return None
+        hit = self._automaton.first(low)
+        return self._rules[hit][1] if hit >= 0 else None
 
     def resolve(self, text: str) -> str:
         low = text.lower()
-        for kw, cat in self.rules:
-            if kw in low:
-                return cat
-        return self.default
\ No newline at end of file
+        if self._automaton is None:
+            category = self._match_rules(low)
+            return category if category is not None else self.vote(text) or self.default
+        key = self._memo_key(low)
+        with self._lock:
+            cached = key in self._memo
+            if cached:
+                self._memo.move_to_end(key)
+                category = self._memo[key]
+                self.hits += 1
+        if not cached:
+            category = self._match_rules(low)
+            with self._lock:
+                self.misses += 1
+                self._memo[key] = category
+                if len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        if category is not None:
+            return category
+        # history votes change as transactions arrive, so they are never memoized
+        return self.vote(text) or self.default
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._memo), "max_size": self.memo_size}
+
+    # ---------- Learning from history ----------
+    def learn_from(self, store: Persistence):
+        """Vote with categories of ``store``'s past transactions and keep
+        learning from new ones as they are saved (via ``add_listener``).
+
+        The index over existing history is built on the first vote.
+        """
+        with self._lock:
+            self._history = store
+            self._index = None
+            self._arrived = None
+        store.add_listener(self.learn)
+        store.add_removal_listener(self.forget)
+
+    def _ensure_index(self) -> Optional[Dict[str, Dict[str, int]]]:
+        with self._lock:
+            if self._index is not None or self._history is None:
+                return self._index
+            store = self._history
+            if self._arrived is None:
+                self._arrived = []
+        index: Dict[str, Dict[str, int]] = {}
+        scanned = set()
+        for r in store.list_records():
+            self._add_to_index(index, r.description, r.category)
+            scanned.add(r.id)
+        with self._lock:
+            if self._index is None:
+                # writes that committed during the scan may or may not be in it
+                for delta, t in self._arrived or ():
+                    if delta > 0 and t.id not in scanned:
+                        self._add_to_index(index, t.description, t.category)
+                        scanned.add(t.id)
+                    elif delta < 0 and t.id in scanned:
+                        self._add_to_index(index, t.description, t.category, -1)
+                        scanned.discard(t.id)
+                self._index = index
+                self._arrived = None
+            return self._index
+
+    def _add_to_index(self, index: Dict[str, Dict[str, int]], description: str, category: str, delta: int = 1):
+        if category == self.default:
+            return  # "Other" teaches nothing
+        for token in set(_TOKEN_RE.findall(description.lower())):
+            counts = index.setdefault(token, {})
+            n = counts.get(category, 0) + delta
+            if n > 0:
+                counts[category] = n
+            else:
+                counts.pop(category, None)
+                if not counts:
+                    del index[token]
+
+    def _update(self, txns: Iterable[Transaction], delta: int):
+        with self._lock:
+            if self._index is None:
+                if self._arrived is not None:  # a build is scanning the store
+                    self._arrived.extend((delta, t) for t in txns)
+                return  # otherwise the initial scan sees the current state
+            for t in txns:
+                self._add_to_index(self._index, t.description, t.category, delta)
+
+    def learn(self, txns: Iterable[Transaction]):
+        """Add saved transactions to the token index (store listener)."""
+        self._update(txns, 1)
+
+    def forget(self, txns: Iterable[Transaction]):
+        """Take deleted transactions out of the token index (store removal listener)."""
+        self._update(txns, -1)
+
+    def vote(self, text: str) -> Optional[str]:
+        """Category most associated with ``text``'s words in past transactions.
+
+        Each known word votes with its category distribution (counts
+        normalised to 1), so a rare word counts as much as a common one.
+        Returns None without history or when no word has been seen.
+        """
+        index = self._ensure_index()
+        if not index:
+            return None
+        scores: Dict[str, float] = {}
+        with self._lock:
+            for token in set(_TOKEN_RE.findall(text.lower())):
+                counts = index.get(token)
+                if not counts:
+                    continue
+                total = sum(counts.values())
+                for category, n in counts.items():
+                    scores[category] = scores.get(category, 0.0) + n / total
+        if not scores:
+            return None
+        return max(sorted(scores), key=scores.__getitem__)
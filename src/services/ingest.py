@@ -0,0 +1,291 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core import Persistence, Transaction
+from .categories import CategoryResolver
+from .receipts import SimpleReceiptParser
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp"}
+CANNOT_REPLACE = "changed since it was ingested, and the store cannot delete the earlier transactions"
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+    txn_ids: List[str] = field(default_factory=list)
+    error: Optional[str] = None  # set when OCR failed; retried once the file changes
+
+
+class Manifest:
+    """Processed-files record: ``path -> (size, mtime, content hash, txn ids)``.
+
+    Stored as JSON and replaced atomically, so an interrupted run leaves the
+    previous manifest intact. Failed files are recorded too, but their
+    content does not count as known.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self.entries = {p: ManifestEntry(**e) for p, e in raw.get("files", {}).items()}
+        self._hashes = {e.sha256 for e in self.entries.values() if e.error is None}
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        return self.entries.get(path)
+
+    def knows_content(self, sha256: str) -> bool:
+        return sha256 in self._hashes
+
+    def record(self, path: str, entry: ManifestEntry):
+        self.entries[path] = entry
+        if entry.error is None:
+            self._hashes.add(entry.sha256)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"files": {p: asdict(e) for p, e in sorted(self.entries.items())}}, f, indent=1)
+        tmp.replace(self.path)
+
+
+@dataclass
+class IngestReport:
+    scanned: int = 0
+    unchanged: int = 0
+    duplicates: List[str] = field(default_factory=list)
+    ingested: Dict[str, int] = field(default_factory=dict)  # path -> transactions added
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def transactions(self) -> int:
+        return sum(self.ingested.values())
+
+    def summary(self) -> str:
+        parts = [
+            f"scanned {self.scanned}",
+            f"unchanged {self.unchanged}",
+            f"ingested {len(self.ingested)} ({self.transactions} transactions)",
+        ]
+        if self.duplicates:
+            parts.append(f"duplicates {len(self.duplicates)}")
+        if self.failed:
+            parts.append(f"failed {len(self.failed)}")
+        return ", ".join(parts)
+
+
+# (path, lines | error) pairs, the shape of receipt.ocr.iter_extract
+OCRFunc = Callable[[List[str]], Iterable[Tuple[str, object]]]
+
+
+class ReceiptIngestor:
+    """Turns a folder of receipt images into transactions, once per image.
+
+    A scan first compares each file's ``stat`` (size, mtime) against the
+    manifest, so unchanged files are never opened. Files whose stat changed
+    are hashed; identical content (touched, copied or renamed files, or
+    copies within one scan) is only re-recorded. Everything else is OCR'd,
+    parsed with ``SimpleReceiptParser`` and saved, dated by the image's
+    modification time. When a file's content changed, the transactions
+    booked from its old content are deleted in the same commit (stores that
+    cannot delete get the file reported as failed instead of booked twice).
+    The manifest is written after the store, so a
+    crash in between re-processes files rather than losing them. Images that
+    fail OCR are recorded with their error and retried only once they change.
+    """
+
+    def __init__(
+        self,
+        store: Persistence,
+        manifest_path: str | Path,
+        parser: Optional[SimpleReceiptParser] = None,
+        ocr: Optional[OCRFunc] = None,
+        recursive: bool = False,
+    ):
+        self.store = store
+        self.manifest = Manifest(manifest_path)
+        if parser is None:
+            resolver = CategoryResolver()
+            resolver.learn_from(store)
+            parser = SimpleReceiptParser(resolver)
+        self.parser = parser
+        self._ocr = ocr
+        self.recursive = recursive
+
+    def _extract(self, paths: List[str]):
+        if self._ocr is not None:
+            return self._ocr(paths)
+        from receipt.ocr import iter_extract  # defer OCR deps until something needs reading
+
+        return iter_extract(paths)
+
+    # ---------- Scanning ----------
+    def _walk(self, folder: Path) -> Iterator[os.DirEntry]:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        yield from self._walk(Path(entry.path))
+                elif entry.is_file() and Path(entry.name).suffix.lower() in IMAGE_SUFFIXES:
+                    yield entry
+
+    def changed_files(self, folder: str | Path, min_age: float = 0.0) -> Tuple[int, List[Tuple[str, os.stat_result]]]:
+        """Stat-only pass: ``(files seen, [(path, stat)])`` for new or modified images.
+
+        Files modified less than ``min_age`` seconds ago are left for a later
+        scan, so images still being copied in are not read half-written.
+        """
+        now = time.time()
+        seen, changed = 0, []
+        for entry in self._walk(Path(folder)):
+            seen += 1
+            st = entry.stat()
+            path = os.path.abspath(entry.path)
+            known = self.manifest.get(path)
+            if known and known.size == st.st_size and known.mtime_ns == st.st_mtime_ns:
+                continue
+            if min_age and now - st.st_mtime < min_age:
+                continue
+            changed.append((path, st))
+        return seen, changed
+
+    # ---------- Ingestion ----------
+    def ingest(self, folder: str | Path, min_age: float = 0.0) -> IngestReport:
+        seen, changed = self.changed_files(folder, min_age=min_age)
+        report = IngestReport(scanned=seen, unchanged=seen - len(changed))
+        todo: Dict[str, Tuple[os.stat_result, str]] = {}
+        first: Dict[str, str] = {}  # digest -> path of its first new file this scan
+        copies: Dict[str, List[Tuple[str, os.stat_result]]] = {}
+        relinked: List[Tuple[str, os.stat_result, str]] = []  # changed into a copy of known content
+        stale: Dict[str, List[str]] = {}  # path -> transactions booked from its previous content
+        for path, st in changed:
+            try:
+                digest = _sha256(Path(path))
+            except FileNotFoundError:
+                continue  # removed since the scan listed it
+            known = self.manifest.get(path)
+            if known is not None and known.sha256 != digest and known.txn_ids:
+                stale[path] = known.txn_ids
+            if self.manifest.knows_content(digest):
+                if path in stale:
+                    relinked.append((path, st, digest))
+                    continue
+                if known is not None and known.sha256 == digest:
+                    report.unchanged += 1
+                else:
+                    report.duplicates.append(path)
+                self.manifest.record(path, ManifestEntry(st.st_size, st.st_mtime_ns, digest,
+                                                         known.txn_ids if known else []))
+                continue
+            if digest in first:
+                copies.setdefault(first[digest], []).append((path, st))
+                continue
+            first[digest] = path
+            todo[path] = (st, digest)
+
+        owners: Dict[str, List[Transaction]] = {}
+        for path, outcome in (self._extract(list(todo)) if todo else ()):
+            st, digest = todo[path]
+            if isinstance(outcome, Exception):
+                for p, s in [(path, st)] + copies.get(path, []):
+                    self._fail(report, p, s, digest, str(outcome))
+                continue
+            day = datetime.fromtimestamp(st.st_mtime).date()
+            owners[path] = self._transactions("\n".join(outcome), day)
+
+        replacing = [p for path in owners for p in [path] + [c for c, _ in copies.get(path, [])]]
+        replacing += [p for p, _, _ in relinked]
+        txns = [t for found in owners.values() for t in found]
+        blocked: Set[str] = set()
+        if not self._replace([i for p in replacing for i in stale.get(p, ())], txns):
+            # booking a changed receipt while its old rows stay would count it twice
+            blocked = {p for p in replacing if p in stale}
+            self._replace([], [t for path, found in owners.items() if path not in blocked for t in found])
+        for path, found in owners.items():
+            st, digest = todo[path]
+            if path in blocked:
+                for p, s in [(path, st)] + copies.get(path, []):
+                    self._fail(report, p, s, digest, CANNOT_REPLACE)
+                continue
+            self.manifest.record(path, ManifestEntry(st.st_size, st.st_mtime_ns, digest, [t.id for t in found]))
+            report.ingested[path] = len(found)
+            for p, s in copies.get(path, []):
+                if p in blocked:
+                    self._fail(report, p, s, digest, CANNOT_REPLACE)
+                else:
+                    self.manifest.record(p, ManifestEntry(s.st_size, s.st_mtime_ns, digest))
+                    report.duplicates.append(p)
+        for p, s, digest in relinked:
+            if p in blocked:
+                self._fail(report, p, s, digest, CANNOT_REPLACE)
+            else:
+                self.manifest.record(p, ManifestEntry(s.st_size, s.st_mtime_ns, digest))
+                report.duplicates.append(p)
+        if changed:
+            self.manifest.save()
+        return report
+
+    def _replace(self, stale_ids: List[str], txns: List[Transaction]) -> bool:
+        """Save ``txns``, deleting ``stale_ids`` in the same commit.
+
+        Returns False, having saved nothing, if the store cannot delete.
+        """
+        if not stale_ids:
+            if txns:
+                self.store.save_transactions(txns)
+            return True
+        try:
+            with self.store.batch():
+                self.store.delete_transactions(stale_ids)
+                self.store.save_transactions(txns)
+        except NotImplementedError:
+            return False
+        return True
+
+    def _fail(self, report: IngestReport, path: str, st: os.stat_result, digest: str, error: str):
+        # rows booked from the file's earlier content stay, and so do their ids
+        known = self.manifest.get(path)
+        self.manifest.record(path, ManifestEntry(st.st_size, st.st_mtime_ns, digest,
+                                                 known.txn_ids if known else [], error=error))
+        report.failed[path] = error
+
+    def _transactions(self, text: str, day: date) -> List[Transaction]:
+        return self.parser.to_transactions(self.parser.parse(text), txn_date=day)
+
+    def watch(
+        self,
+        folder: str | Path,
+        interval: float = 5.0,
+        min_age: float = 2.0,
+        on_report: Optional[Callable[[IngestReport], None]] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ):
+        """Poll ``folder`` every ``interval`` seconds until ``stop()`` is true.
+
+        Each poll is a stat-only scan; images are read only when new or changed.
+        """
+        while not (stop and stop()):
+            report = self.ingest(folder, min_age=min_age)
+            if on_report and (report.ingested or report.failed or report.duplicates):
+                on_report(report)
+            time.sleep(interval)
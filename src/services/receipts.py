@@ -1,39 +1,132 @@
 from __future__ import annotations
+import os
 import re
-from typing import List
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 from decimal import Decimal
 from core import ReceiptLine, ReceiptParseResult, Transaction
 from .categories import CategoryResolver
 
-LINE_RE = re.compile(r"^(?P<desc>.+?)\s+(?P<amount>\d+[\.,]\d{2})$")
+AMOUNT_RE = re.compile(r"\d+[\.,]\d{2}")
+# "2 x Milk 2.50", "3x Eggs 4,20", "2 @ Soda 3.00": amount is the printed line total
+QTY_RE = re.compile(r"(?P<qty>\d+)\s*[xX×@*]\s+(?P<desc>.+)")
+# "Total 3.70", "TOTAL DUE: 12.00", "Grand total 9,99" (but not "Subtotal")
+TOTAL_RE = re.compile(r"(?:grand\s+)?total\b", re.IGNORECASE)
+# "Subtotal 6.70", "Sub-total: 6,70", "Tax 0.54", "VAT 20% 1.10", "Cash 20.00", "Change 5.30":
+# amounts on the receipt that are not items bought. Only a bare label and amount
+# match, so items like "Cash & Carry Rice 4.99" or "Tax free gift 3.00" stay items.
+NON_ITEM_RE = re.compile(
+    r"(?:sub[\s-]?total|tax|vat|cash|change):?\s+(?:\d+(?:[.,]\d+)?\s*%\s+)?\d+[.,]\d{2}", re.IGNORECASE
+)
+
+# (raw, description, amount text, quantity): plain strings are cheap to ship
+# back from worker processes, unlike dataclasses holding Decimals
+Row = Tuple[str, str, str, int]
+
+
+def _scan(text: str) -> Tuple[List[Row], Optional[str], List[str]]:
+    rows: List[Row] = []
+    warnings: List[str] = []
+    total = None
+    for raw in text.splitlines():
+        raw = raw.strip()
+        if not raw:
+            continue
+        if raw[0] in "tTgG" and TOTAL_RE.match(raw):
+            amounts = AMOUNT_RE.findall(raw)
+            if amounts:
+                total = amounts[-1]
+            continue
+        if raw[0] in "sStTvVcC" and NON_ITEM_RE.fullmatch(raw):
+            continue
+        # "<description> <amount>": split at the last whitespace run rather than
+        # matching a lazy "(.+?)\s+amount$", which retries at every position
+        parts = raw.rsplit(None, 1)
+        if len(parts) == 2 and AMOUNT_RE.fullmatch(parts[1]):
+            desc, amount = parts
+            m = QTY_RE.fullmatch(desc) if desc[0].isdigit() else None
+            if m:
+                rows.append((raw, m.group("desc"), amount, int(m.group("qty"))))
+            else:
+                rows.append((raw, desc, amount, 1))
+            continue
+        warnings.append(f"Unparsed line: {raw}")
+    return rows, total, warnings
+
+
+def _amount(text: str) -> Decimal:
+    return Decimal(text.replace(",", "."))
+
+
+def _build(text: str, scanned: Tuple[List[Row], Optional[str], List[str]]) -> ReceiptParseResult:
+    rows, total, warnings = scanned
+    # hot loop: positional fields and an inlined _amount
+    return ReceiptParseResult(
+        original_text=text,
+        lines=[ReceiptLine(raw, desc, Decimal(amount.replace(",", ".")), qty) for raw, desc, amount, qty in rows],
+        total_detected=_amount(total) if total else None,
+        warnings=warnings,
+    )
+
+
+def parse_text(text: str) -> ReceiptParseResult:
+    """Parse one receipt's text into item lines, the printed total and warnings."""
+    return _build(text, _scan(text))
+
+
+def _scan_chunk(texts: List[str]) -> List[Tuple[List[Row], Optional[str], List[str]]]:
+    return [_scan(t) for t in texts]
+
 
 class SimpleReceiptParser:
     def __init__(self, category_resolver: CategoryResolver | None = None):
         self.category_resolver = category_resolver or CategoryResolver()
 
     def parse(self, text: str) -> ReceiptParseResult:
-        lines: List[ReceiptLine] = []
-        warnings: List[str] = []
-        total_detected = None
-        for raw in [l.strip() for l in text.splitlines() if l.strip()]:
-            m = LINE_RE.match(raw)
-            if not m:
-                # try detect total
-                if raw.lower().startswith("total"):
-                    amt = re.findall(r"\d+[\.,]\d{2}", raw)
-                    if amt:
-                        total_detected = Decimal(amt[-1].replace(",", "."))
-                    continue
-                warnings.append(f"Unparsed line: {raw}")
-                continue
-            amt = Decimal(m.group("amount").replace(",", "."))
-            desc = m.group("desc").strip()
-            lines.append(ReceiptLine(raw=raw, description=desc, amount=amt))
-        return ReceiptParseResult(original_text=text, lines=lines, total_detected=total_detected, warnings=warnings)
-
-    def to_transactions(self, result: ReceiptParseResult, default_category: str = "Other"):
+        return parse_text(text)
+
+    def parse_many(
+        self, texts: Iterable[str], workers: Optional[int] = 1, chunksize: int = 256
+    ) -> Iterator[ReceiptParseResult]:
+        """Parse many receipts, yielding results in input order.
+
+        ``workers`` > 1 (None = CPU count) spreads chunks of ``chunksize``
+        texts over a process pool; at most ``2 * workers`` chunks are in
+        flight, so arbitrarily long inputs stream in bounded memory. Workers
+        return plain string tuples and the result objects are built here,
+        since pickling Decimals costs more than the regex work itself.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for text in texts:
+                yield parse_text(text)
+            return
+        it = iter(texts)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight: Deque[Tuple[List[str], Future]] = deque()
+            while True:
+                while len(in_flight) < 2 * workers:
+                    chunk = list(islice(it, chunksize))
+                    if not chunk:
+                        break
+                    in_flight.append((chunk, pool.submit(_scan_chunk, chunk)))
+                if not in_flight:
+                    return
+                chunk, fut = in_flight.popleft()
+                for text, scanned in zip(chunk, fut.result()):
+                    yield _build(text, scanned)
+
+    def to_transactions(self, result: ReceiptParseResult, default_category: str = "Other",
+                        txn_date: Optional[date] = None):
         txns: List[Transaction] = []
+        categories: Dict[str, str] = {}  # receipts repeat items; resolve each description once
         for line in result.lines:
-            cat = self.category_resolver.resolve(line.description)
-            txns.append(Transaction.create(amount=line.amount, category=cat, description=line.description))
-        return txns
\ No newline at end of file
+            cat = categories.get(line.description)
+            if cat is None:
+                cat = categories[line.description] = self.category_resolver.resolve(line.description)
+            txns.append(Transaction.create(amount=line.amount, category=cat, description=line.description,
+                                           txn_date=txn_date))
+        return txns
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from datetime import date
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Mapping, Any, Tuple
 from decimal import Decimal
 import csv
 from pathlib import Path
+from typing import TextIO
 
 from core import Transaction, Persistence
 
@@ -16,26 +17,58 @@ class TransactionService:
         self.store.save_transaction(txn)
         return txn
 
-    def list(self, *, category: Optional[str] = None) -> List[Transaction]:
-        return self.store.list_transactions(category=category)
+    def add_many(self, entries: Iterable[Mapping[str, Any]]) -> List[Transaction]:
+        """Create and save several transactions with a single store write.
 
-    def total_for(self, *, category: Optional[str] = None) -> Decimal:
-        txns = self.list(category=category)
-        total = sum(t.amount for t in txns)
+        Each entry holds the keyword arguments accepted by ``add``.
+        """
+        txns = [Transaction.create(**entry) for entry in entries]
+        return self.store.save_transactions(txns)
+
+    def list(
+        self,
+        *,
+        category: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: Optional[int] = None,
+        reverse: bool = False,
+    ) -> List[Transaction]:
+        return self.store.list_transactions(
+            category=category, start=start, end=end, limit=limit, reverse=reverse
+        )
+
+    def stats(
+        self, *, category: Optional[str] = None, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Tuple[Decimal, int]:
+        """(total, count) for the matching transactions; dates are inclusive."""
+        return self.store.transaction_stats(category=category, start=start, end=end)
+
+    def total_for(
+        self, *, category: Optional[str] = None, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Decimal:
+        total, _ = self.stats(category=category, start=start, end=end)
         return total
 
     def recent(self, n: int = 10) -> List[Transaction]:
-        txns = self.list()
-        return txns[-n:]
+        if n <= 0:
+            return []
+        txns = self.list(limit=n, reverse=True)
+        txns.reverse()
+        return txns
 
     def export_csv(self, path: str | Path) -> int:
         """Export all transactions to CSV. Returns count."""
-        txns = self.list()
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["id", "date", "category", "amount", "description"])
-            for t in txns:
-                w.writerow([t.id, t.txn_date.isoformat(), t.category, f"{t.amount:.2f}", t.description])
+            return self.write_csv(f)
+
+    def write_csv(self, f: TextIO) -> int:
+        """Write all transactions as CSV to an open text stream. Returns count."""
+        txns = self.list()
+        w = csv.writer(f)
+        w.writerow(["id", "date", "category", "amount", "description"])
+        for t in txns:
+            w.writerow([t.id, t.txn_date.isoformat(), t.category, f"{t.amount:.2f}", t.description])
         return len(txns)
\ No newline at end of file
@@ -3,3 +3,20 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+import pytest
+
+from core import JsonFilePersistence, PartitionedJsonPersistence, SqlitePersistence
+
+
+@pytest.fixture(params=["json", "journal", "sqlite", "partitioned"])
+def store_factory(request, tmp_path):
+    def make():
+        if request.param == "json":
+            return JsonFilePersistence(tmp_path / "state.json")
+        if request.param == "journal":
+            return JsonFilePersistence(tmp_path / "state.json", journal=True)
+        if request.param == "sqlite":
+            return SqlitePersistence(tmp_path / "state.db")
+        return PartitionedJsonPersistence(tmp_path / "state")
+    return make
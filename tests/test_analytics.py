@@ -0,0 +1,58 @@
+from datetime import date
+from decimal import Decimal
+
+from core import JsonFilePersistence
+from services.transactions import TransactionService
+from services.analytics import AnalyticsService
+from chat.intent import IntentParser
+from chat.orchestrator import ChatOrchestrator
+
+
+def _seeded(tmp_path):
+    store = JsonFilePersistence(tmp_path / "state.json")
+    svc = TransactionService(store)
+    svc.add(10, "Groceries", "a", txn_date=date(2025, 7, 30))
+    svc.add(5, "Dining", "b", txn_date=date(2025, 8, 1))
+    svc.add(2.5, "Groceries", "c", txn_date=date(2025, 8, 4))
+    svc.add(7, "Groceries", "d", txn_date=date(2025, 8, 4))
+    return AnalyticsService(store)
+
+
+def test_window_total_and_breakdown(tmp_path):
+    an = _seeded(tmp_path)
+    assert an.window_total(date(2025, 8, 1), date(2025, 8, 31)) == (Decimal("14.50"), 3)
+    assert an.window_total(category="groceries") == (Decimal("19.50"), 3)
+    assert an.by_category(date(2025, 8, 1)) == {"Dining": Decimal("5.00"), "Groceries": Decimal("9.50")}
+
+
+def test_series_daily_weekly_monthly(tmp_path):
+    an = _seeded(tmp_path)
+    daily = an.series(date(2025, 8, 1), date(2025, 8, 4))
+    assert [str(v) for _, v in daily] == ["5.00", "0.00", "0.00", "9.50"]
+    weekly = an.series(date(2025, 7, 28), date(2025, 8, 10), freq="W")
+    assert weekly == [(date(2025, 7, 28), Decimal("15.00")), (date(2025, 8, 4), Decimal("9.50"))]
+    monthly = an.series(date(2025, 7, 1), date(2025, 8, 31), freq="M", category="Groceries")
+    assert monthly == [(date(2025, 7, 1), Decimal("10.00")), (date(2025, 8, 1), Decimal("9.50"))]
+
+
+def test_rolling_average(tmp_path):
+    an = _seeded(tmp_path)
+    rolling = an.rolling_average(date(2025, 8, 1), date(2025, 8, 4), window=2)
+    assert rolling == [
+        (date(2025, 8, 2), Decimal("2.50")),
+        (date(2025, 8, 3), Decimal("0.00")),
+        (date(2025, 8, 4), Decimal("4.75")),
+    ]
+
+
+def test_trend_intent(tmp_path):
+    p = IntentParser()
+    r = p.parse("trend groceries 90d")
+    assert r.name == "trend" and r.args == {"category": "groceries", "window": "90d"}
+    assert p.parse("trend 30d").args == {"window": "30d"}
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"))
+    orch.handle("add 4.00 groceries milk")
+    resp = orch.handle("trend groceries 14d")
+    assert resp.startswith("Groceries last 14d: 4.00 across 1 transactions")
+    assert "Weekly:" in resp
+    assert "no transactions" in orch.handle("trend rent 30d")
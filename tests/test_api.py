@@ -0,0 +1,118 @@
+import threading
+from datetime import date
+
+import pytest
+
+pytest.importorskip("flask")
+
+from api.app import create_app  # noqa: E402
+from api.pool import StorePool  # noqa: E402
+from chat.orchestrator import ChatOrchestrator  # noqa: E402
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return StorePool(str(tmp_path / "{user}.json"), max_open=2)
+
+
+@pytest.fixture
+def client(pool):
+    return create_app(pool).test_client()
+
+
+def test_chat_and_structured_endpoints(client):
+    r = client.post("/users/alice/chat", json={"text": "set groceries 100"})
+    assert r.status_code == 200 and r.get_json()["response"] == "Set Groceries limit to 100.00."
+    r = client.post("/users/alice/transactions",
+                    json={"amount": "12.50", "category": "groceries", "description": "milk", "date": "2025-08-07"})
+    assert r.status_code == 201 and r.get_json()["amount"] == "12.50"
+    client.post("/users/alice/chat", json={"text": "add 5 groceries bread"})
+
+    r = client.get("/users/alice/transactions?category=Groceries&reverse=1")
+    body = r.get_json()
+    assert [t["description"] for t in body["transactions"]] == ["bread", "milk"]
+    assert (body["total"], body["count"]) == ("17.50", 2)
+
+    rows = client.get("/users/alice/budget").get_json()["categories"]
+    assert rows[0]["category"] == "Groceries" and rows[0]["spent"] == "5.00" and rows[0]["limit"] == "100.00"
+    assert client.get("/users/alice/budget?month=2025-08").get_json()["categories"][0]["spent"] == "12.50"
+
+    r = client.get("/users/alice/export.csv")
+    assert r.mimetype == "text/csv"
+    assert r.get_data(as_text=True).splitlines()[0] == "id,date,category,amount,description"
+    assert len(r.get_data(as_text=True).splitlines()) == 3
+
+
+def test_users_are_isolated(client):
+    client.post("/users/alice/chat", json={"text": "add 5 fun movie"})
+    assert client.get("/users/bob/transactions").get_json()["count"] == 0
+    assert client.get("/users/alice/transactions").get_json()["count"] == 1
+
+
+def test_bad_requests(client):
+    assert client.post("/users/bad.user/chat", json={"text": "help"}).status_code == 400
+    assert client.post("/users/alice/chat", data="help").status_code == 400
+    assert client.post("/users/alice/transactions", json={"amount": "x", "category": "a"}).status_code == 400
+    assert client.post("/users/alice/transactions", json={"amount": -1, "category": "a"}).status_code == 400
+    for amount in ("NaN", "Infinity", "sNaN", "1e400"):
+        r = client.post("/users/alice/transactions", json={"amount": amount, "category": "a"})
+        assert r.status_code == 400, amount
+    assert client.get("/users/alice/transactions?limit=-1").status_code == 400
+    r = client.get("/users/alice/transactions?start=yesterday")
+    assert r.status_code == 400 and "YYYY-MM-DD" in r.get_json()["error"]
+    assert client.get("/users/alice/budget?month=2025-13").status_code == 400
+    assert client.get("/users/alice/budget?month=2025-8").get_json()["month"] == "2025-08"
+
+
+def test_pool_evicts_least_recently_used_and_closes_stores(tmp_path):
+    closed = []
+
+    def factory(user):
+        orch = ChatOrchestrator(data_path=f"journal:{tmp_path / user}.json", onboarding=False)
+        real_close = orch.store.close
+        orch.store.close = lambda: (closed.append(user), real_close())
+        return orch
+
+    pool = StorePool(str(tmp_path / "{user}.json"), max_open=2, factory=factory)
+    client = create_app(pool).test_client()
+    for user in ("a", "b", "a", "c"):
+        client.post(f"/users/{user}/chat", json={"text": f"add 1 misc {user}"})
+    assert closed == ["b"]
+    assert pool.open_users() == ["a", "c"]
+    assert not (tmp_path / "b.journal").exists()  # journal folded into the snapshot on close
+    # reopening an evicted user reads what it wrote
+    assert client.get("/users/b/transactions").get_json()["count"] == 1
+    assert pool.stats()["evicted"] == 2 and pool.stats()["opened"] == 4
+    pool.close()
+    assert pool.open_users() == []
+
+
+def test_busy_session_is_not_evicted(pool):
+    with pool.session("a") as held:
+        for user in ("b", "c", "d"):
+            with pool.session(user):
+                pass
+        assert "a" in pool.open_users()
+        held.handle("add 1 misc still-open")
+    assert len(held.txn_service.list()) == 1
+
+
+def test_concurrent_requests_for_one_user_are_serialized(client):
+    errors = []
+
+    def worker(n):
+        for i in range(20):
+            r = client.post("/users/alice/transactions", json={"amount": 1, "category": "misc", "description": f"{n}-{i}"})
+            if r.status_code != 201:
+                errors.append(r.status_code)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    body = client.get("/users/alice/transactions").get_json()
+    assert (body["count"], body["total"]) == (80, "80.00")
+    month = date.today().strftime("%Y-%m")
+    assert client.get(f"/users/alice/budget?month={month}").get_json()["categories"][0]["spent"] == "80.00"
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import date
+
+from chat.orchestrator import ChatOrchestrator
+from core import AsyncStore, Budget, JsonFilePersistence, Transaction
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_async_store_group_commits_concurrent_writes(store_factory):
+    store = store_factory()
+    astore = AsyncStore(store)
+
+    async def main():
+        await asyncio.gather(*(
+            astore.save_transaction(Transaction.create(1, "Misc", f"t{i}", txn_date=date(2025, 8, 1)))
+            for i in range(50)
+        ))
+        return await astore.transaction_stats(), await astore.category_totals("2025-08")
+
+    (total, count), totals = run(main())
+    assert (total, count) == (50, 50)
+    assert totals == {"Misc": 50}
+    assert astore.commits == 1
+    assert len(store_factory().list_transactions()) == 50
+
+
+def test_failing_write_does_not_sink_its_group(tmp_path, monkeypatch):
+    store = JsonFilePersistence(tmp_path / "state.json")
+    astore = AsyncStore(store)
+    real_save_budget = store.save_budget
+
+    def save_budget(b):
+        if b.month == "bad":
+            raise ValueError("rejected")
+        real_save_budget(b)
+
+    monkeypatch.setattr(store, "save_budget", save_budget)
+
+    async def main():
+        return await asyncio.gather(
+            astore.save_transaction(Transaction.create(2, "Misc", "kept")),
+            astore.save_budget(Budget.create("bad", {})),
+            astore.save_budget(Budget.create("2025-08", {"Misc": 5})),
+            return_exceptions=True,
+        )
+
+    results = run(main())
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+    assert len(store.list_transactions()) == 1
+    assert store.get_budget("2025-08") is not None
+
+
+def test_failed_group_flush_is_not_applied_twice(tmp_path, monkeypatch):
+    store = JsonFilePersistence(tmp_path / "state.json")
+    astore = AsyncStore(store)
+    real_flush = store._flush
+    flushes = []
+
+    def flush():
+        flushes.append(1)
+        if len(flushes) == 1:
+            raise OSError("disk full")
+        real_flush()
+
+    monkeypatch.setattr(store, "_flush", flush)
+
+    async def main():
+        return await asyncio.gather(
+            *(astore.save_transaction(Transaction.create(1, "Misc", f"t{i}")) for i in range(5)),
+            return_exceptions=True,
+        )
+
+    results = run(main())
+    # the rolled-back group is retried write by write, each landing once
+    assert results == [None] * 5
+    descriptions = sorted(t.description for t in store.list_transactions())
+    assert descriptions == [f"t{i}" for i in range(5)]
+    reopened = JsonFilePersistence(tmp_path / "state.json")
+    assert sorted(t.description for t in reopened.list_transactions()) == descriptions
+
+
+def test_handle_async_matches_handle(tmp_path):
+    sync = ChatOrchestrator(data_path=str(tmp_path / "sync.json"), onboarding=False)
+    orch = ChatOrchestrator(data_path=str(tmp_path / "async.json"), onboarding=False)
+    commands = ["set groceries 100", "add 12.50 groceries milk", "add -1 groceries x", "add 5 fun on 2025-13-01",
+                "receipt:\nBread 1.20\nEggs 3.10", "receipt:   ", "budget groceries", "limits", "nonsense"]
+
+    async def main():
+        return [await orch.handle_async(c) for c in commands]
+
+    assert run(main()) == [sync.handle(c) for c in commands]
+
+
+def _seed(path, n=500):
+    store = JsonFilePersistence(path)
+    with store.batch():
+        store.save_transactions(Transaction.create(1, "Misc", f"old {i}", txn_date=date(2024, 1, 1)) for i in range(n))
+
+
+def test_concurrent_sessions_share_commits(tmp_path):
+    sessions, per_session = 100, 3
+    commands = [[f"add 1.00 groceries s{s} item {i}" for i in range(per_session)] for s in range(sessions)]
+    _seed(tmp_path / "async.json")
+
+    orch = ChatOrchestrator(data_path=str(tmp_path / "async.json"), onboarding=False)
+    orch.handle("set groceries 1000")
+
+    async def session(lines):
+        return [await orch.handle_async(c) for c in lines]
+
+    async def main():
+        return await asyncio.gather(*(session(lines) for lines in commands))
+
+    replies = run(main())
+
+    assert all(r.startswith("Added 1.00 to Groceries") for lines in replies for r in lines)
+    assert orch.async_store.commits <= 4 * per_session  # a few groups per round, not one commit per add
+    month = date.today().strftime("%Y-%m")
+    assert JsonFilePersistence(tmp_path / "async.json").category_totals(month)["Groceries"] == sessions * per_session
@@ -1,3 +1,4 @@
+import pytest
 from core import JsonFilePersistence
 from services.transactions import TransactionService
 from services.budgets import BudgetService
@@ -26,3 +27,98 @@ def test_budget_auto_category_creation(tmp_path):
     summary = buds.summary(month)
     s = next(s for s in summary if s["category"] == "Snacks")
     assert s["spent"] == "10.00"
+
+
+def test_category_totals_follow_transaction_writes(store_factory):
+    store = store_factory()
+    txsvc = TransactionService(store)
+    txsvc.add(10, "Groceries", "Milk", txn_date=date(2025, 8, 1))
+    txsvc.add_many([
+        {"amount": 2.5, "category": "Groceries", "description": "Bread", "txn_date": date(2025, 8, 2)},
+        {"amount": 4, "category": "Dining", "description": "Coffee", "txn_date": date(2025, 8, 3)},
+        {"amount": 99, "category": "Dining", "description": "Dinner", "txn_date": date(2025, 9, 1)},
+    ])
+    expected = {"Groceries": Decimal("12.50"), "Dining": Decimal("4.00")}
+    assert store.category_totals("2025-08") == expected
+    store.rebuild_aggregates()
+    assert store.category_totals("2025-08") == expected
+    assert store_factory().category_totals("2025-08") == expected
+    assert store.category_totals("2024-01") == {}
+
+
+def test_summary_counts_transactions_without_apply(store_factory):
+    store = store_factory()
+    buds = BudgetService(store)
+    month = date.today().strftime("%Y-%m")
+    buds.set_limits(month, {"Groceries": 100})
+    # receipt-style ingest: no apply() call
+    TransactionService(store).add_many([
+        {"amount": 3, "category": "Groceries", "description": "Milk"},
+        {"amount": 7, "category": "Other", "description": "Stuff"},
+    ])
+    rows = {s["category"]: s for s in buds.summary(month)}
+    assert rows["Groceries"]["spent"] == "3.00"
+    assert rows["Groceries"]["limit"] == "100.00"
+    assert rows["Other"]["spent"] == "7.00"
+    assert rows["Other"]["limit"] == "0.00"
+
+
+def _count_calls(monkeypatch, store, *names):
+    calls = {name: 0 for name in names}
+    for name in names:
+        original = getattr(store, name)
+
+        def counted(*args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(store, name, counted)
+    return calls
+
+
+def test_budget_reads_are_cached_until_written(store_factory, monkeypatch):
+    store = store_factory()
+    buds = BudgetService(store)
+    month = date.today().strftime("%Y-%m")
+    buds.set_limits(month, {"Groceries": 100})
+    calls = _count_calls(monkeypatch, store, "get_budget", "save_budget")
+    t = TransactionService(store).add(25, "Groceries", "Veggies")
+    buds.apply(t)  # category already tracked: no budget write
+    assert buds.summary(month)[0]["spent"] == "25.00"
+    assert buds.list_limits(month) == [{"category": "Groceries", "limit": "100.00"}]
+    assert calls == {"get_budget": 0, "save_budget": 0}
+
+    buds.set_limits(month, {"Groceries": 150})
+    assert buds.summary(month)[0]["limit"] == "150.00"
+    assert calls == {"get_budget": 0, "save_budget": 1}
+    # a fresh service over the same store sees what was written
+    assert BudgetService(store).summary(month)[0]["limit"] == "150.00"
+
+
+def test_summary_follows_writes_from_other_services(store_factory):
+    store = store_factory()
+    buds = BudgetService(store)
+    month = date.today().strftime("%Y-%m")
+    assert buds.summary(month) == []
+    with store.batch():
+        TransactionService(store).add_many([{"amount": 4, "category": "Dining", "description": "Coffee"}])
+    assert buds.summary(month)[0]["spent"] == "4.00"
+    rows = buds.summary(month)
+    rows[0]["spent"] = "tampered"
+    assert buds.summary(month)[0]["spent"] == "4.00"
+
+
+def test_failed_budget_write_leaves_cached_budget(tmp_path, monkeypatch):
+    store = JsonFilePersistence(tmp_path / "state.json")
+    buds = BudgetService(store)
+    month = date.today().strftime("%Y-%m")
+    buds.set_limits(month, {"Groceries": 100})
+
+    def fail(budget):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "save_budget", fail)
+    with pytest.raises(OSError):
+        buds.set_limits(month, {"Groceries": 999})
+    monkeypatch.undo()
+    assert buds.list_limits(month) == [{"category": "Groceries", "limit": "100.00"}]
@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from services.categories import DEFAULT_RULES, CategoryResolver, KeywordAutomaton, LINEAR_MAX_RULES
+
+
+def test_default_rules():
+    resolver = CategoryResolver()
+    assert resolver.resolve("STARBUCKS COFFEE #12") == "Dining"
+    assert resolver.resolve("Shell fuel station") == "Transport"
+    assert resolver.resolve("Bookshop") == "Other"
+
+
+def test_earliest_rule_wins():
+    rules = [("coffee", "Dining"), ("supermarket", "Groceries")]
+    assert CategoryResolver(rules).resolve("supermarket coffee") == "Dining"
+    assert CategoryResolver(rules[::-1]).resolve("supermarket coffee") == "Groceries"
+
+
+def test_automaton_matches_linear_scan():
+    rng = random.Random(5)
+    for _ in range(500):
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 10))]
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 15)))
+        expected = next((i for i, kw in enumerate(keywords) if kw in text), -1)
+        assert KeywordAutomaton(keywords).first(text) == expected
+
+
+def test_large_rule_sets_use_automaton():
+    rules = [(f"merchant{i:05d}x", f"Cat{i % 7}") for i in range(LINEAR_MAX_RULES * 3)]
+    rules.append(("merchant", "Generic"))  # prefix of every rule above, lowest priority
+    resolver = CategoryResolver(rules)
+    assert resolver._automaton is not None
+    assert resolver.resolve("POS MERCHANT00100X 4411") == "Cat2"
+    assert resolver.resolve("merchant 1") == "Generic"
+    assert resolver.resolve("unknown") == "Other"
+
+
+def test_from_file_csv_and_json(tmp_path):
+    csv_path = tmp_path / "rules.csv"
+    csv_path.write_text("# keyword,category\nStarbucks,Dining\n\n\"tesco, express\",Groceries\n", encoding="utf-8")
+    resolver = CategoryResolver.from_file(csv_path, default="Misc")
+    assert resolver.rules == [("starbucks", "Dining"), ("tesco, express", "Groceries")]
+    assert resolver.resolve("TESCO, EXPRESS 123") == "Groceries"
+    assert resolver.resolve("other") == "Misc"
+
+    json_path = tmp_path / "rules.json"
+    json_path.write_text('{"uber": "Transport", "rent": "Housing"}', encoding="utf-8")
+    assert CategoryResolver.from_file(json_path).resolve("Uber trip") == "Transport"
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("lonely\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CategoryResolver.from_file(bad)
+
+
+def test_rule_results_are_memoized_across_numbers():
+    rules = [(f"merchant {a}{b}", "Shopping") for a in "abcdefghij" for b in "abcdefg"] + DEFAULT_RULES
+    assert len(rules) > LINEAR_MAX_RULES
+    resolver = CategoryResolver(rules, memo_size=2)
+    assert resolver.resolve("STARBUCKS COFFEE #1234") == "Dining"
+    assert resolver.resolve("starbucks coffee #98") == "Dining"
+    assert resolver.cache_info()["hits"] == 1
+    resolver.resolve("Milk")
+    resolver.resolve("Bread")
+    assert resolver.cache_info()["size"] == 2  # bounded: the coffee entry was evicted
+    resolver.resolve("starbucks coffee #1")
+    assert resolver.cache_info()["misses"] == 4
+
+    small = CategoryResolver()  # plain scan: cheaper than a memo lookup
+    small.resolve("coffee")
+    small.resolve("coffee")
+    assert small.cache_info() == {"hits": 0, "misses": 0, "size": 0, "max_size": 4096}
+
+
+def test_store_listeners_fire_once_per_commit(store_factory):
+    from core import Transaction
+
+    store = store_factory()
+    seen = []
+    store.add_listener(lambda txns: seen.append([t.description for t in txns]))
+    store.save_transaction(Transaction.create(1, "Dining", "a"))
+    with store.batch():
+        store.save_transaction(Transaction.create(1, "Dining", "b"))
+        store.save_transaction(Transaction.create(1, "Dining", "c"))
+        assert seen == [["a"]]  # nothing until the batch commits
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.save_transaction(Transaction.create(1, "Dining", "lost"))
+            raise RuntimeError
+    store.save_transactions([Transaction.create(1, "Dining", "d")])
+    assert seen == [["a"], ["b", "c"], ["d"]]
+
+
+def test_history_votes_when_no_rule_matches(store_factory):
+    from services.transactions import TransactionService
+
+    store = store_factory()
+    svc = TransactionService(store)
+    svc.add(4, "Dining", "Blue Bottle latte")
+    svc.add(3, "Dining", "Blue Bottle cortado")
+    svc.add(30, "Books", "Blue Door bookshop")
+    resolver = CategoryResolver()
+    resolver.learn_from(store)
+    assert resolver.resolve("BLUE BOTTLE #22") == "Dining"
+    assert resolver.resolve("bookshop receipt") == "Books"
+    assert resolver.resolve("Tesco") == "Other"
+    assert resolver.resolve("coffee at blue door") == "Dining"  # rules still come first
+
+    # learned incrementally from new saves, without a rebuild
+    tesco = svc.add(12, "Groceries", "Tesco metro")
+    assert resolver.resolve("Tesco") == "Groceries"
+    assert resolver._index["tesco"] == {"Groceries": 1}
+    store.delete_transactions([tesco.id])  # and unlearned from deletes
+    assert "tesco" not in resolver._index
+    assert resolver.resolve("Tesco") == "Other"
+
+
+def test_saves_during_index_build_are_not_lost(store_factory):
+    from core import Transaction
+
+    store = store_factory()
+    store.save_transaction(Transaction.create(4, "Dining", "Blue Bottle latte"))
+    resolver = CategoryResolver()
+    resolver.learn_from(store)
+    scan = store.list_records
+    late = Transaction.create(12, "Groceries", "Tesco metro")
+
+    def racing_scan(**kwargs):
+        records = scan(**kwargs)
+        store.save_transaction(late)  # commits after the scan read the store
+        return records
+    store.list_records = racing_scan
+    assert resolver.resolve("blue bottle") == "Dining"
+    assert resolver._index["tesco"] == {"Groceries": 1}
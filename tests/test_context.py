@@ -0,0 +1,97 @@
+from datetime import date
+
+from llm.context import ContextBuilder
+from services.budgets import BudgetService
+from services.transactions import TransactionService
+
+TODAY = date(2025, 8, 20)
+
+
+def _history(store):
+    TransactionService(store).add_many(
+        [{"amount": 1, "category": "Misc", "description": f"old {i}", "txn_date": date(2024, 1, 1)} for i in range(200)]
+        + [
+            {"amount": 300, "category": "Rent", "description": "July rent", "txn_date": date(2025, 7, 1)},
+            {"amount": 40, "category": "Groceries", "description": "market", "txn_date": date(2025, 7, 15)},
+            {"amount": 12.5, "category": "Groceries", "description": "milk", "txn_date": date(2025, 8, 7)},
+        ]
+    )
+
+
+def test_sections_cover_budget_history_and_recent(store_factory):
+    store = store_factory()
+    buds = BudgetService(store)
+    buds.set_limits("2025-08", {"Groceries": 250})
+    _history(store)
+    ctx = ContextBuilder(store, buds, recent=3).build(TODAY)
+    assert ctx.splitlines() == [
+        "Budget 2025-08:",
+        "- Groceries: spent 12.50 of 250.00",
+        "Previous months:",
+        "- 2025-07: total 340.00 (Rent 300.00, Groceries 40.00)",
+        "Recent transactions:",
+        "- 2025-08-07 Groceries 12.50 milk",
+        "- 2025-07-15 Groceries 40.00 market",
+        "- 2025-07-01 Rent 300.00 July rent",
+    ]
+
+
+def test_recent_window_follows_commits_without_rereading_history(store_factory, monkeypatch):
+    store = store_factory()
+    _history(store)
+    builder = ContextBuilder(store, recent=2)
+    builder.build(TODAY)
+    calls = []
+    real_list = store.list_transactions
+    monkeypatch.setattr(store, "list_transactions", lambda **kw: (calls.append(kw), real_list(**kw))[1])
+
+    txsvc = TransactionService(store)
+    with store.batch():
+        txsvc.add(3, "Dining", "coffee", txn_date=date(2025, 8, 19))
+        txsvc.add(9, "Dining", "backdated lunch", txn_date=date(2025, 6, 1))  # older than the window
+    txsvc.add(5, "Fun", "cinema", txn_date=date(2025, 8, 20))
+    recent = builder.build(TODAY).split("Recent transactions:\n")[1].splitlines()
+    assert recent == ["- 2025-08-20 Fun 5.00 cinema", "- 2025-08-19 Dining 3.00 coffee"]
+    assert "- Dining: spent 3.00 (no limit)" in builder.build(TODAY)
+    assert calls == []
+
+
+def test_deleted_transactions_leave_budget_and_recent_window(store_factory):
+    store = store_factory()
+    _history(store)
+    buds = BudgetService(store)
+    builder = ContextBuilder(store, buds, recent=2)
+    assert "12.50 milk" in builder.build(TODAY)
+    milk = next(t for t in store.list_transactions() if t.description == "milk")
+    store.delete_transactions([milk.id])
+    text = builder.build(TODAY)
+    assert "milk" not in text and "Budget 2025-08" not in text
+    assert text.splitlines()[-2:] == ["- 2025-07-15 Groceries 40.00 market", "- 2025-07-01 Rent 300.00 July rent"]
+
+
+def test_output_respects_char_and_token_budget(tmp_path):
+    from core import JsonFilePersistence
+
+    store = JsonFilePersistence(tmp_path / "state.json")
+    TransactionService(store).add_many(
+        {"amount": i + 1, "category": f"Cat{i}", "description": "x" * 40, "txn_date": TODAY} for i in range(30)
+    )
+    full = ContextBuilder(store, max_categories=30, recent=30).build(TODAY)
+    for limit in (0, 20, 60, 300, 1000):
+        text = ContextBuilder(store, max_chars=limit, max_categories=30, recent=30).build(TODAY)
+        assert len(text) <= limit
+        assert full.startswith(text)
+    capped = ContextBuilder(store, max_tokens=50).build(TODAY)
+    assert 0 < len(capped) <= 200
+    assert capped.startswith("Budget 2025-08:\n- Cat29: spent 30.00 (no limit)")
+
+
+def test_messages_wrap_context_for_the_adapter(tmp_path):
+    from chat.orchestrator import ChatOrchestrator
+
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"), onboarding=False)
+    orch.handle("add 4 coffee latte")
+    msgs = orch.context.messages("how am I doing?")
+    assert msgs[0]["role"] == "system" and "Coffee" in msgs[0]["content"]
+    assert msgs[1] == {"role": "user", "content": "how am I doing?"}
+    assert orch.llm.complete(msgs) == "(mock echo) how am I doing?"
@@ -0,0 +1,164 @@
+import os
+from datetime import date
+
+from core import JsonFilePersistence
+from services.ingest import ReceiptIngestor
+
+
+class FakeOCR:
+    """Reads the "image" as text; records which paths were OCR'd."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, paths):
+        for p in paths:
+            self.calls.append(os.path.basename(p))
+            text = open(p, encoding="utf-8").read()
+            if text == "garbage":
+                yield p, RuntimeError("unreadable")
+            else:
+                yield p, text.splitlines()
+
+
+def write(folder, name, text, mtime=None):
+    p = folder / name
+    p.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(p, (mtime, mtime))
+    return p
+
+
+def make(tmp_path):
+    folder = tmp_path / "inbox"
+    folder.mkdir(exist_ok=True)
+    store = JsonFilePersistence(tmp_path / "state.json")
+    ocr = FakeOCR()
+    return folder, store, ocr, ReceiptIngestor(store, tmp_path / "manifest.json", ocr=ocr)
+
+
+def test_ingest_only_processes_new_files(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    mtime = 1_717_200_000  # 2024-06-01
+    write(folder, "a.jpg", "Milk 2.50\nBread 3.10", mtime)
+    write(folder, "notes.txt", "Coffee 9.99")  # not an image
+    report = ingestor.ingest(folder)
+    assert report.ingested == {str(folder / "a.jpg"): 2}
+    assert ocr.calls == ["a.jpg"]
+    txns = store.list_transactions()
+    assert [t.description for t in txns] == ["Milk", "Bread"]
+    assert txns[0].txn_date == date.fromtimestamp(mtime)
+
+    write(folder, "b.png", "Coffee 4.00")
+    # a fresh ingestor reads the manifest back from disk
+    again = ReceiptIngestor(store, tmp_path / "manifest.json", ocr=ocr)
+    report = again.ingest(folder)
+    assert ocr.calls == ["a.jpg", "b.png"]
+    assert report.unchanged == 1 and report.transactions == 1
+    assert len(store.list_transactions()) == 3
+
+
+def test_touched_and_copied_files_are_not_reprocessed(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    a = write(folder, "a.jpg", "Milk 2.50", 1_700_000_000)
+    ingestor.ingest(folder)
+    os.utime(a, (1_700_000_100, 1_700_000_100))  # stat changes, content doesn't
+    write(folder, "copy.jpg", "Milk 2.50")
+    report = ingestor.ingest(folder)
+    assert ocr.calls == ["a.jpg"]
+    assert report.duplicates == [str(folder / "copy.jpg")]
+    assert report.unchanged == 1
+    # the new stat was recorded, so the next scan doesn't even hash
+    seen, changed = ingestor.changed_files(folder)
+    assert (seen, changed) == (2, [])
+
+
+def test_identical_new_files_in_one_scan_are_ingested_once(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    write(folder, "a.png", "Milk 2.50", 1_700_000_000)
+    write(folder, "copy_of_a.png", "Milk 2.50", 1_700_000_000)
+    report = ingestor.ingest(folder)
+    assert len(ocr.calls) == 1 and report.transactions == 1
+    assert len(report.duplicates) == 1
+    assert len(store.list_transactions()) == 1
+    assert ingestor.changed_files(folder) == (2, [])
+
+
+def test_failures_are_retried_and_modified_files_reprocessed(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    bad = write(folder, "bad.jpg", "garbage")
+    a = write(folder, "a.jpg", "Milk 2.50", 1_700_000_000)
+    report = ingestor.ingest(folder)
+    assert list(report.failed) == [str(bad)]
+    # an unchanged failure is not OCR'd again on the next poll
+    assert ingestor.ingest(folder).failed == {}
+    assert sorted(ocr.calls) == ["a.jpg", "bad.jpg"]
+    write(folder, "a.jpg", "Milk 2.50\nEggs 3.00", 1_700_000_500)
+    write(folder, "bad.jpg", "Tea 1.00")
+    report = ingestor.ingest(folder)
+    assert report.ingested == {str(a): 2, str(bad): 1}
+    assert sorted(ocr.calls) == ["a.jpg", "a.jpg", "bad.jpg", "bad.jpg"]
+    # the old rows of the modified receipt were replaced, not added to
+    assert sorted(t.description for t in store.list_transactions()) == ["Eggs", "Milk", "Tea"]
+    reopened = JsonFilePersistence(tmp_path / "state.json")
+    assert sorted(str(t.amount) for t in reopened.list_transactions()) == ["1.00", "2.50", "3.00"]
+
+
+def test_changed_file_is_skipped_when_the_store_cannot_delete(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    a = write(folder, "a.jpg", "Milk 2.50", 1_700_000_000)
+    ingestor.ingest(folder)
+
+    def cannot(ids):
+        raise NotImplementedError
+    store.delete_transactions = cannot
+    write(folder, "a.jpg", "Milk 2.50\nEggs 3.00", 1_700_000_500)
+    write(folder, "b.jpg", "Tea 1.00", 1_700_000_500)
+    report = ingestor.ingest(folder)
+    assert list(report.failed) == [str(a)] and report.ingested == {str(folder / "b.jpg"): 1}
+    assert sorted(t.description for t in store.list_transactions()) == ["Milk", "Tea"]
+    assert ingestor.manifest.get(str(a)).txn_ids  # the old rows can still be found later
+
+
+def test_file_removed_before_hashing_is_skipped(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    gone = write(folder, "gone.jpg", "Milk 2.50", 1_700_000_000)
+    write(folder, "kept.jpg", "Tea 1.00", 1_700_000_000)
+    scan = ingestor.changed_files
+
+    def racing(folder, min_age=0.0):
+        result = scan(folder, min_age=min_age)
+        gone.unlink()
+        return result
+    ingestor.changed_files = racing
+    report = ingestor.ingest(folder)
+    assert report.ingested == {str(folder / "kept.jpg"): 1} and not report.failed
+
+
+def test_min_age_defers_files_being_written(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    write(folder, "fresh.jpg", "Milk 2.50")
+    assert ingestor.ingest(folder, min_age=60).ingested == {}
+    assert ocr.calls == []
+
+
+def test_watch_polls_until_stopped(tmp_path):
+    folder, store, ocr, ingestor = make(tmp_path)
+    polls = []
+
+    def stop():
+        if len(polls) == 1:
+            write(folder, "late.jpg", "Milk 2.50", 1_700_000_000)
+        return len(polls) >= 3
+
+    reports = []
+    orig = ingestor.ingest
+
+    def counting(folder, min_age=0.0):
+        report = orig(folder, min_age=min_age)
+        polls.append(report)
+        return report
+    ingestor.ingest = counting
+    ingestor.watch(folder, interval=0, on_report=reports.append, stop=stop)
+    assert ocr.calls == ["late.jpg"]
+    assert [r.transactions for r in reports] == [1]
@@ -67,3 +67,45 @@ def test_negative_amount_captured_for_validation():
     p = IntentParser()
     r = p.parse("add -5 food test")
     assert r and r.args["amount"] == "-5"
+
+
+def test_long_description_keeps_date():
+    p = IntentParser()
+    r = p.parse("add 3.50 food " + "word " * 500 + "on 2025-08-07")
+    assert r and r.args["date"] == "2025-08-07"
+    assert r.args["desc"] == " ".join(["word"] * 500)
+
+
+def _scan_all(text):
+    # the parser before first-word dispatch: try every pattern in order
+    from chat.intent import INTENTS, ParsedIntent
+
+    t = text.strip()
+    for name, pattern in INTENTS.items():
+        m = pattern.match(t)
+        if m:
+            return ParsedIntent(name=name, args={k: v for k, v in m.groupdict().items() if v is not None})
+    return None
+
+
+def test_dispatch_matches_full_scan_fuzz():
+    import random
+
+    rng = random.Random(19)
+    words = [
+        "add", "ADD", "Expense", "set", "Set budget", "budget", "limits", "list", "list limits", "export", "csv",
+        "receipt:", "RECEIPT:", "receipt", "summary", "trend", "help", "commands", "on", "ON", "groceries",
+        "food", "milk", "7d", "30d", "90d", "12", "12.34", "-5", "3.999", "2025-08-07", "2025-8-7", "data/out.csv",
+        "ſet", "lımits", "İ", "café", "٣", "x", "!", ":", "addx", "budget2", "_", " ",
+    ]
+    seps = [" ", "  ", "\t", "\n", "", " \n "]
+    p = IntentParser()
+    for _ in range(20_000):
+        n = rng.randint(1, 7)
+        text = "".join(rng.choice(words) + rng.choice(seps) for _ in range(n))
+        if rng.random() < 0.3:  # mostly well-formed add commands, to exercise desc/date splitting
+            text = rng.choice(["add ", "expense\t"]) + rng.choice(["12.34 food ", "-5 milk", "1 x "]) + text
+            text += rng.choice(["", " on 2025-08-07", "\non 2025-08-07", "on 2025-08-07", " on 2025-08-07x"])
+        if rng.random() < 0.2:
+            text = rng.choice(seps) + text
+        assert p.parse(text) == _scan_all(text), repr(text)
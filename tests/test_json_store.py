@@ -0,0 +1,146 @@
+from core import JsonFilePersistence, Budget
+from services.transactions import TransactionService
+
+
+def test_journal_appends_without_rewriting_snapshot(tmp_path):
+    path = tmp_path / "state.json"
+    store = JsonFilePersistence(path, journal=True)
+    snapshot_before = path.read_text()
+    svc = TransactionService(store)
+    svc.add(5, "Coffee", "Latte")
+    svc.add(7, "Groceries", "Milk")
+    assert path.read_text() == snapshot_before
+    assert len(store.journal_path.read_text().splitlines()) == 2
+
+
+def test_journal_replay_on_reopen(tmp_path):
+    path = tmp_path / "state.json"
+    store = JsonFilePersistence(path, journal=True)
+    TransactionService(store).add(5, "Coffee", "Latte")
+    store.save_budget(Budget.create("2025-08", {"Coffee": 50}))
+    reopened = JsonFilePersistence(path, journal=True)
+    assert [t.description for t in reopened.list_transactions()] == ["Latte"]
+    assert reopened.get_budget("2025-08") is not None
+
+
+def test_journal_compaction_threshold(tmp_path):
+    path = tmp_path / "state.json"
+    store = JsonFilePersistence(path, journal=True, compact_threshold=500)
+    svc = TransactionService(store)
+    for i in range(10):
+        svc.add(i + 1, "Misc", f"item {i}")
+    # compaction ran at least once and the snapshot holds folded entries
+    assert store._data["journal_seq"] > 0
+    reopened = JsonFilePersistence(path, journal=True)
+    assert len(reopened.list_transactions()) == 10
+
+
+def test_journal_skips_entries_already_in_snapshot(tmp_path):
+    path = tmp_path / "state.json"
+    store = JsonFilePersistence(path, journal=True)
+    TransactionService(store).add(5, "Coffee", "Latte")
+    journal = store.journal_path.read_text()
+    store.compact()
+    # simulate a crash between snapshot replace and journal truncation
+    store.journal_path.write_text(journal + '{"seq": 99, "op": "tx')
+    reopened = JsonFilePersistence(path, journal=True)
+    assert len(reopened.list_transactions()) == 1
+
+
+def test_writes_after_torn_journal_tail_survive_reopen(tmp_path):
+    path = tmp_path / "state.json"
+    store = JsonFilePersistence(path, journal=True)
+    TransactionService(store).add(1, "Coffee", "Latte")
+    with store.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "op": "txn", "da')  # interrupted append
+    reopened = JsonFilePersistence(path, journal=True)
+    txsvc = TransactionService(reopened)
+    txsvc.add(2, "Coffee", "Mocha")
+    txsvc.add(3, "Coffee", "Flat white")
+    assert len(reopened.list_transactions()) == 3
+    assert [t.description for t in JsonFilePersistence(path, journal=True).list_transactions()] == [
+        "Latte", "Mocha", "Flat white"
+    ]
+
+
+def test_plain_mode_folds_leftover_journal(tmp_path):
+    path = tmp_path / "state.json"
+    TransactionService(JsonFilePersistence(path, journal=True)).add(5, "Coffee", "Latte")
+    store = JsonFilePersistence(path)
+    assert not store.journal_path.exists()
+    assert len(JsonFilePersistence(path).list_transactions()) == 1
+
+
+def test_decoded_cache_stays_sorted_on_backdated_insert(tmp_path):
+    from datetime import date
+    store = JsonFilePersistence(tmp_path / "state.json")
+    svc = TransactionService(store)
+    svc.add(1, "Misc", "b", txn_date=date(2025, 8, 2))
+    assert len(store.list_transactions()) == 1  # builds the cache
+    svc.add(2, "Misc", "c", txn_date=date(2025, 8, 3))
+    svc.add(3, "Misc", "a", txn_date=date(2025, 8, 1))
+    assert [t.description for t in store.list_transactions()] == ["a", "b", "c"]
+    assert [t.description for t in JsonFilePersistence(tmp_path / "state.json").list_transactions()] == ["a", "b", "c"]
+    assert store.list_transactions() is not store.list_transactions()
+
+
+def test_batch_flushes_once(tmp_path, monkeypatch):
+    store = JsonFilePersistence(tmp_path / "state.json")
+    flushes = []
+    real_flush = store._flush
+    monkeypatch.setattr(store, "_flush", lambda: (flushes.append(1), real_flush()))
+    svc = TransactionService(store)
+    svc.add_many({"amount": i + 1, "category": "Misc", "description": f"item {i}"} for i in range(40))
+    assert len(flushes) == 1
+    assert len(JsonFilePersistence(tmp_path / "state.json").list_transactions()) == 40
+
+
+def test_batch_rolls_back_on_error(tmp_path):
+    import pytest
+    store = JsonFilePersistence(tmp_path / "state.json", journal=True)
+    svc = TransactionService(store)
+    svc.add(1, "Misc", "kept")
+    store.list_transactions()
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            svc.add(2, "Misc", "dropped")
+            store.save_budget(Budget.create("2025-08", {"Misc": 10}))
+            raise RuntimeError("boom")
+    assert [t.description for t in store.list_transactions()] == ["kept"]
+    assert store.get_budget("2025-08") is None
+    reopened = JsonFilePersistence(tmp_path / "state.json", journal=True)
+    assert [t.description for t in reopened.list_transactions()] == ["kept"]
+
+
+def test_stores_do_not_share_a_lock(tmp_path):
+    from core import Persistence
+
+    a = JsonFilePersistence(tmp_path / "a.json")
+    b = JsonFilePersistence(tmp_path / "b.json")
+    assert a._lock is not b._lock
+    assert Persistence()._lock is not Persistence()._lock
+
+
+def test_failed_flush_rolls_back_the_batch(tmp_path, monkeypatch):
+    import pytest
+    for journal in (False, True):
+        path = tmp_path / f"state-{journal}.json"
+        store = JsonFilePersistence(path, journal=journal)
+        svc = TransactionService(store)
+        svc.add(1, "Misc", "kept")
+        store.list_transactions()
+
+        def broken(*args, **kwargs):
+            raise OSError("disk full")
+        if journal:
+            monkeypatch.setattr(type(store.journal_path), "open", broken)
+        else:
+            monkeypatch.setattr(store, "_flush", broken)
+        with pytest.raises(OSError):
+            svc.add(2, "Misc", "dropped")
+        monkeypatch.undo()
+        assert [t.description for t in store.list_transactions()] == ["kept"]
+        assert store.transaction_stats()[1] == 1
+        svc.add(3, "Misc", "after")
+        reopened = JsonFilePersistence(path, journal=journal)
+        assert [t.description for t in reopened.list_transactions()] == ["kept", "after"]
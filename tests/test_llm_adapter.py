@@ -0,0 +1,132 @@
+import threading
+import time
+
+from llm.adapter import LLMAdapter, MockLLMAdapter, cache_key
+
+
+def msgs(text):
+    return [{"role": "system", "content": "You are a budget helper."}, {"role": "user", "content": text}]
+
+
+def test_stream_yields_tokens_that_join_to_complete():
+    llm = MockLLMAdapter(cache_size=0)
+    tokens = list(llm.stream(msgs("how much on groceries")))
+    assert len(tokens) > 1
+    assert "".join(tokens) == llm.complete(msgs("how much on groceries")) == "(mock echo) how much on groceries"
+    assert MockLLMAdapter().complete([]) == "Hello."
+
+
+def test_cache_is_keyed_on_normalized_messages_and_bounded():
+    llm = MockLLMAdapter(cache_size=2)
+    llm.complete(msgs("hi there"))
+    llm.complete([{"role": "system", "content": " You are a  budget\nhelper. "},
+                  {"role": "user", "content": "hi there", "id": 7}])
+    assert llm.cache_info()["hits"] == 1 and llm.cache_info()["generations"] == 1
+    llm.complete(msgs("a"))
+    llm.complete(msgs("b"))  # evicts "hi there"
+    llm.complete(msgs("hi there"))
+    assert llm.cache_info()["generations"] == 4
+    assert llm.cache_info()["size"] == 2
+    assert cache_key(msgs("x")) != cache_key(msgs("y"))
+
+
+def test_identical_concurrent_requests_share_one_generation():
+    llm = MockLLMAdapter(token_latency=0.01)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(llm.complete(msgs("same question")))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["(mock echo) same question"] * 8
+    info = llm.cache_info()
+    assert info["generations"] == 1
+    assert info["deduped"] + info["hits"] == 7
+
+
+def test_concurrency_cap():
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    class Slow(LLMAdapter):
+        def _generate(self, messages):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            yield "ok"
+
+    llm = Slow(max_concurrency=2)
+    threads = [threading.Thread(target=llm.complete, args=(msgs(str(i)),)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+    assert llm.cache_info()["generations"] == 6
+
+
+def test_failed_generation_is_not_cached_and_reaches_followers():
+    started = threading.Event()
+    release = threading.Event()
+
+    class Flaky(LLMAdapter):
+        calls = 0
+
+        def _generate(self, messages):
+            Flaky.calls += 1
+            started.set()
+            release.wait(5)
+            if Flaky.calls == 1:
+                raise ConnectionError("model down")
+            yield "fine"
+
+    llm = Flaky()
+    errors = []
+
+    def leader():
+        try:
+            llm.complete(msgs("q"))
+        except ConnectionError as e:
+            errors.append(e)
+
+    def follower():
+        try:
+            llm.complete(msgs("q"))
+        except RuntimeError as e:
+            errors.append(e)
+
+    t1 = threading.Thread(target=leader)
+    t1.start()
+    started.wait(5)
+    t2 = threading.Thread(target=follower)
+    t2.start()
+    while llm.cache_info()["deduped"] == 0:
+        time.sleep(0.001)
+    release.set()
+    t1.join()
+    t2.join()
+    assert sorted(type(e).__name__ for e in errors) == ["ConnectionError", "RuntimeError"]
+    assert llm.complete(msgs("q")) == "fine"
+
+
+def test_abandoned_stream_is_not_cached():
+    llm = MockLLMAdapter()
+    gen = llm.stream(msgs("one two three four"))
+    assert next(gen) == "(mock "
+    gen.close()
+    assert llm.complete(msgs("one two three four")) == "(mock echo) one two three four"
+    assert llm.cache_info()["generations"] == 2
+
+
+def test_streaming_reaches_first_token_before_completion():
+    llm = MockLLMAdapter(token_latency=0.01, cache_size=0)
+    start = time.perf_counter()
+    gen = llm.stream(msgs("w " * 20))
+    next(gen)
+    first = time.perf_counter() - start
+    list(gen)
+    total = time.perf_counter() - start
+    assert first < total / 4
@@ -0,0 +1,207 @@
+import os
+
+import pytest
+
+from receipt import ocr
+from receipt.ocr_cache import OCRCache
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    # keep tests away from the repo-level data/ocr_cache
+    monkeypatch.setattr(ocr, "_CACHE_CONFIGURED", False)
+    monkeypatch.setattr(ocr, "_CACHE", None)
+    return ocr.configure_cache(tmp_path / "ocr_cache")
+
+
+@pytest.fixture
+def ready(monkeypatch):
+    # no Tesseract binary needed: skip the one-time dependency probe
+    monkeypatch.setattr(ocr, "_ensure_ready", lambda: None)
+
+
+@pytest.fixture
+def images(tmp_path):
+    def make(*names):
+        paths = []
+        for name in names:
+            p = tmp_path / name
+            p.write_bytes(name.encode())
+            paths.append(str(p))
+        return paths
+    return make
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    calls = []
+
+    def run(data, lang, timeout, label, preprocess=False):
+        calls.append(label)
+        if data.startswith(b"bad"):
+            raise ValueError("unreadable")
+        return f"{data.decode()} {lang}\n\n"
+    monkeypatch.setattr(ocr, "_ocr_bytes", run)
+    return calls
+
+
+def test_iter_extract_in_process(ready, fake_ocr, images):
+    a, b = images("a.png", "b.png")
+    results = dict(ocr.iter_extract([a, b], workers=1))
+    assert results == {a: ["a.png eng"], b: ["b.png eng"]}
+
+
+def test_bulk_extract_aggregates_errors(ready, fake_ocr, images):
+    good, bad = images("good.png", "bad.png")
+    with pytest.raises(ocr.OCRError, match="bad.png: unreadable"):
+        ocr.bulk_extract([good, bad])
+
+
+def _extract_in_worker(path, lang, timeout, preprocess=False):
+    # module-level so the pool can pickle it whatever the start method
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith(b"bad"):
+        return path, ocr.OCRError(f"unreadable in pid {os.getpid()}")
+    return path, f"{data.decode()} pid={os.getpid()}"
+
+
+def test_iter_extract_process_pool_yields_per_image_errors(ready, images, monkeypatch, cache):
+    monkeypatch.setattr(ocr, "_extract_text_one", _extract_in_worker)
+    paths = images(*(f"ok{i}.png" for i in range(4)), "bad0.png", "bad1.png")
+    results = dict(ocr.iter_extract(paths, workers=2, timeout=5))
+    assert sorted(results) == sorted(paths)
+    errors = {p: v for p, v in results.items() if isinstance(v, ocr.OCRError)}
+    assert sorted(errors) == sorted(p for p in paths if "bad" in p)
+    lines = [v[0] for p, v in results.items() if p not in errors]
+    assert len(lines) == 4 and all(f"pid={os.getpid()}" not in line for line in lines)
+    assert cache.misses == 6 and len(list(ocr.iter_extract(paths[:4], workers=2))) == 4
+    assert cache.hits == 4  # worker results were cached by the parent
+
+
+def test_dependency_check_runs_once(monkeypatch, fake_ocr, images):
+    calls = []
+    monkeypatch.setattr(ocr, "_READY", False)
+    monkeypatch.setattr(ocr, "_configure_tesseract", lambda: None)
+    monkeypatch.setattr(ocr, "_assert_deps", lambda: calls.append(1))
+    list(ocr.iter_extract(images("a.png", "b.png", "c.png"), workers=1))
+    list(ocr.iter_extract(images("d.png"), workers=1))
+    assert calls == [1]
+
+
+def test_cache_hit_skips_ocr_and_dependency_check(monkeypatch, fake_ocr, images, cache):
+    a, b = images("a.png", "b.png")
+    monkeypatch.setattr(ocr, "_ensure_ready", lambda: None)
+    assert ocr.bulk_extract([a, b]) == {a: ["a.png eng"], b: ["b.png eng"]}
+
+    def missing_deps():
+        raise ocr.OCRError("no tesseract")
+    monkeypatch.setattr(ocr, "_ensure_ready", missing_deps)
+    assert ocr.extract_lines(a) == ["a.png eng"]
+    assert ocr.bulk_extract([a, b]) == {a: ["a.png eng"], b: ["b.png eng"]}
+    assert fake_ocr == [a, b]
+    assert cache.hits == 3 and cache.misses == 2
+
+
+def test_cache_key_covers_content_and_language(ready, fake_ocr, images, tmp_path):
+    a, copy = images("a.png", "copy.png")
+    (tmp_path / "copy.png").write_bytes(b"a.png")  # same bytes, different name
+    ocr.extract_text(a)
+    assert ocr.extract_text(copy) == "a.png eng\n\n"
+    ocr.extract_text(a, lang="deu")
+    assert fake_ocr == [a, a]
+
+
+def test_cache_disabled(ready, fake_ocr, images):
+    a, = images("a.png")
+    ocr.configure_cache(enabled=False)
+    ocr.extract_text(a)
+    ocr.extract_text(a)
+    assert len(fake_ocr) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    import os
+    cache = OCRCache(tmp_path / "c", max_bytes=250)
+    keys = [OCRCache.key(bytes([i])) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, "x" * 100)
+        os.utime(cache._path(key), (i, i))  # deterministic access order
+    cache.get(keys[0])  # touch: keys[1] is now the oldest
+    cache.put(keys[2], "y" * 100)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "x" * 100
+    assert cache.stats()["bytes"] <= 250
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    """A stand-in ``tesseract`` that handles list-file input and logs each run."""
+    import sys
+    import pytesseract
+
+    log = tmp_path / "runs.log"
+    script = tmp_path / "tesseract"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, pathlib\n"
+        f"pathlib.Path({str(log)!r}).open('a').write(' '.join(sys.argv[1:]) + '\\n')\n"
+        "for line in open(sys.argv[1]).read().splitlines():\n"
+        "    data = pathlib.Path(line).read_bytes()\n"
+        "    if data.startswith(b'bad'):\n"
+        "        sys.exit('Error in pixReadStream')\n"
+        "    sys.stdout.write(data.decode() + '\\n\\f')\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(script))
+    return lambda: log.read_text().splitlines() if log.exists() else []
+
+
+def test_batch_backend_uses_one_invocation_per_chunk(ready, fake_tesseract, images, cache):
+    paths = images(*(f"r{i}.png" for i in range(5)))
+    results = ocr.bulk_extract(paths, backend="batch", batch_size=2)
+    assert results == {p: [f"r{i}.png"] for i, p in enumerate(paths)}
+    assert len(fake_tesseract()) == 3
+    # now cached: no further runs
+    assert ocr.bulk_extract(paths, backend="batch", workers=2) == results
+    assert len(fake_tesseract()) == 3
+
+
+def test_batch_backend_parallel_chunks(ready, fake_tesseract, images):
+    paths = images(*(f"r{i}.png" for i in range(7)))
+    results = dict(ocr.iter_extract(paths, workers=3, backend="batch", batch_size=2))
+    assert results == {p: [f"r{i}.png"] for i, p in enumerate(paths)}
+    assert len(fake_tesseract()) == 4
+
+
+def test_batch_failure_falls_back_per_image(ready, fake_tesseract, fake_ocr, images):
+    good, bad = images("good.png", "bad.png")
+    results = dict(ocr.iter_extract([good, bad], workers=1, backend="batch"))
+    assert results[good] == ["good.png eng"]  # recovered through the per-image path
+    assert isinstance(results[bad], ocr.OCRError)
+
+
+def test_any_batch_error_falls_back_per_image(ready, fake_ocr, images, monkeypatch):
+    from receipt import tesseract_batch
+
+    def broken(*args, **kwargs):
+        raise ImportError("No module named 'cv2'")
+    monkeypatch.setattr(tesseract_batch, "run_batch", broken)
+    good, bad = images("good.png", "bad.png")
+    results = dict(ocr.iter_extract([good, bad], workers=1, backend="batch"))
+    assert results[good] == ["good.png eng"]
+    assert isinstance(results[bad], ocr.OCRError) and "unreadable" in str(results[bad])
+
+
+def test_run_batch_rejects_page_count_mismatch(fake_tesseract, tmp_path):
+    from receipt.tesseract_batch import run_batch
+
+    img = tmp_path / "x.png"
+    img.write_bytes(b"one\fpage too many")
+    with pytest.raises(ocr.OCRError, match="3 pages for 1 images"):
+        run_batch([img])
+
+
+def test_unknown_backend(images):
+    with pytest.raises(ValueError):
+        list(ocr.iter_extract(images("a.png"), backend="gpu"))
@@ -58,3 +58,38 @@ def test_invalid_limit_validation(tmp_path):
     orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"))
     resp = orch.handle("set travel -100")
     assert "non-negative" in resp
+
+
+def test_receipt_flow_single_write(tmp_path, monkeypatch):
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"))
+    flushes = []
+    real_flush = orch.store._flush
+    monkeypatch.setattr(orch.store, "_flush", lambda: (flushes.append(1), real_flush()))
+    resp = orch.handle("receipt:\nMilk 2.50\nBread 1.20\nEggs 3.10")
+    assert "Parsed 3 lines" in resp
+    assert len(flushes) == 1
+    assert len(orch.txn_service.list()) == 3
+
+
+def test_summary_window_excludes_old_transactions(tmp_path):
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"))
+    orch.handle("add 2.00 coffee latte")
+    orch.handle("add 9.00 coffee old on 2020-01-01")
+    resp = orch.handle("summary 7d")
+    assert "2.00 across 1 transactions" in resp
+
+
+def test_add_is_one_write_and_no_budget_reads(tmp_path, monkeypatch):
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"))
+    orch.handle("set groceries 250")
+    orch.handle("add 1.00 groceries warm-up")
+    flushes, reads = [], []
+    real_flush, real_get = orch.store._flush, orch.store.get_budget
+    monkeypatch.setattr(orch.store, "_flush", lambda: (flushes.append(1), real_flush()))
+    monkeypatch.setattr(orch.store, "get_budget", lambda month: (reads.append(month), real_get(month))[1])
+    resp = orch.handle("add 50.00 groceries milk")
+    assert resp == "Added 50.00 to Groceries. Remaining: 199.00."
+    assert orch.handle("budget groceries") == "Groceries: spent 51.00 / 250.00 (remaining 199.00)"
+    assert "Groceries: 250.00" in orch.handle("limits")
+    assert len(flushes) == 1
+    assert reads == []
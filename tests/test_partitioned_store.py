@@ -0,0 +1,63 @@
+from datetime import date
+from decimal import Decimal
+
+from core import PartitionedJsonPersistence, JsonFilePersistence, Budget, open_store
+from services.transactions import TransactionService
+
+
+def _seed(svc):
+    for month in range(1, 7):
+        for day in (5, 20):
+            svc.add(month, "Misc", f"{month}-{day}", txn_date=date(2025, month, day))
+
+
+def test_writes_one_file_per_month(tmp_path):
+    store = PartitionedJsonPersistence(tmp_path / "state")
+    _seed(TransactionService(store))
+    files = sorted(p.name for p in (tmp_path / "state" / "transactions").iterdir())
+    assert files == [f"2025-0{m}.json" for m in range(1, 7)]
+    reopened = PartitionedJsonPersistence(tmp_path / "state")
+    assert len(reopened.list_transactions()) == 12
+
+
+def test_range_query_loads_only_needed_partitions(tmp_path):
+    _seed(TransactionService(PartitionedJsonPersistence(tmp_path / "state")))
+    store = PartitionedJsonPersistence(tmp_path / "state", max_loaded=2)
+    txns = store.list_transactions(start=date(2025, 3, 10), end=date(2025, 4, 30))
+    assert [t.description for t in txns] == ["3-20", "4-5", "4-20"]
+    assert store.loaded_partitions == ["2025-03", "2025-04"]
+    assert [t.description for t in store.list_transactions(limit=3, reverse=True)] == ["6-20", "6-5", "5-20"]
+    assert len(store.loaded_partitions) == 2  # older partitions evicted
+    assert store.transaction_stats(start=date(2025, 6, 1)) == (Decimal("12.00"), 2)
+
+
+def test_migrates_single_file_state_once(tmp_path):
+    legacy = JsonFilePersistence(tmp_path / "state.json")
+    _seed(TransactionService(legacy))
+    legacy.save_budget(Budget.create("2025-06", {"Misc": 100}))
+    store = open_store(f"partitioned:{tmp_path / 'state'}")
+    assert isinstance(store, PartitionedJsonPersistence)
+    assert len(store.list_transactions()) == 12
+    assert store.get_budget("2025-06").categories["Misc"].limit == Decimal("100.00")
+    assert not (tmp_path / "state.json").exists()
+    assert (tmp_path / "state.migrated").exists()
+    assert isinstance(open_store(tmp_path / "state"), PartitionedJsonPersistence)
+
+
+def test_batch_rollback(tmp_path):
+    import pytest
+    store = PartitionedJsonPersistence(tmp_path / "state", max_loaded=1)
+    svc = TransactionService(store)
+    svc.add(1, "Misc", "kept", txn_date=date(2025, 1, 1))
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            svc.add(2, "Misc", "dropped", txn_date=date(2025, 1, 2))
+            svc.add(3, "Misc", "new month", txn_date=date(2025, 2, 1))
+            raise RuntimeError("boom")
+    assert [t.description for t in store.list_transactions()] == ["kept"]
+    svc.add_many([
+        {"amount": 4, "category": "Misc", "description": "a", "txn_date": date(2025, 3, 1)},
+        {"amount": 5, "category": "Misc", "description": "b", "txn_date": date(2025, 4, 1)},
+    ])
+    reopened = PartitionedJsonPersistence(tmp_path / "state")
+    assert [t.description for t in reopened.list_transactions()] == ["kept", "a", "b"]
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from receipt import ocr  # noqa: E402
+from receipt.preprocess import (  # noqa: E402
+    PreprocessOptions, _upright, find_receipt, preprocess, preprocess_bytes, skew_angle,
+)
+
+
+def slip(angle=0.0, fill=255):
+    paper = Image.new("L", (400, 900), 255)
+    draw = ImageDraw.Draw(paper)
+    font = ImageFont.load_default(size=20)
+    for i in range(25):
+        draw.text((20, 20 + 34 * i), f"ITEM {i:02d} THING      {i * 1.5:6.2f}", fill=0, font=font)
+    return paper.rotate(angle, expand=True, fillcolor=fill)
+
+
+def photo(angle=0.0, size=(1600, 1200)):
+    paper = slip(angle, fill=70)
+    frame = Image.new("L", size, 70)
+    frame.paste(paper, ((size[0] - paper.width) // 2, (size[1] - paper.height) // 2))
+    return cv2.cvtColor(np.array(frame), cv2.COLOR_GRAY2BGR)
+
+
+@pytest.mark.parametrize("angle", [-6.0, 0.0, 4.0])
+def test_find_receipt_locates_paper_and_tilt(angle):
+    rect = find_receipt(cv2.cvtColor(photo(angle), cv2.COLOR_BGR2GRAY))
+    (_, _), (w, h), _ = rect
+    assert sorted((w, h)) == pytest.approx([400, 900], abs=8)
+    assert _upright(rect)[0] == pytest.approx(angle, abs=0.5)
+
+
+@pytest.mark.parametrize("angle", [-5.0, 3.0])
+def test_skew_angle_of_text(angle):
+    assert skew_angle(np.array(slip(angle))) == pytest.approx(angle, abs=0.5)
+
+
+def test_preprocess_outputs_upright_binary_receipt():
+    image = photo(5.0)
+    opts = PreprocessOptions(target_dpi=150)
+    out = preprocess(image, opts)
+    assert out.ndim == 2 and out.dtype == np.uint8
+    assert out.shape[1] == opts.target_width
+    assert out.size < image.shape[0] * image.shape[1] / 4
+    assert set(np.unique(out)) <= {0, 255}
+    gray = preprocess(image, PreprocessOptions(target_dpi=150, threshold=False))
+    assert abs(skew_angle(gray)) < 0.5
+
+
+def test_preprocess_bytes_rejects_garbage():
+    with pytest.raises(ocr.OCRError):
+        preprocess_bytes(b"not an image")
+
+
+def test_preprocessed_results_cached_separately():
+    assert ocr._cache_key(b"img", "eng") != ocr._cache_key(b"img", "eng", preprocess=True)
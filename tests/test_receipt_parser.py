@@ -15,3 +15,35 @@ def test_simple_receipt_to_transactions():
     result = parser.parse(text)
     txns = parser.to_transactions(result)
     assert txns[0].category in {"Dining", "Other"}
+
+
+def test_quantity_and_total_lines():
+    parser = SimpleReceiptParser(CategoryResolver())
+    text = ("2 x Milk 2.50\n3x Eggs 4,20\nSubtotal 6.70\nCoffee beans 8.00\nCashews 3.00\nTax 0.00\n"
+            "TOTAL DUE: 17.70\nCash 20.00\nChange 2.30\nthank you")
+    result = parser.parse(text)
+    assert [(l.description, str(l.amount), l.quantity) for l in result.lines] == [
+        ("Milk", "2.50", 2), ("Eggs", "4.20", 3), ("Coffee beans", "8.00", 1), ("Cashews", "3.00", 1),
+    ]
+    assert str(result.total_detected) == "17.70"
+    assert result.warnings == ["Unparsed line: thank you"]
+
+
+def test_items_named_like_totals_labels_are_kept():
+    parser = SimpleReceiptParser(CategoryResolver())
+    text = "Cash & Carry Rice 4.99\nTax free gift 3.00\nChange purse 7.50\nVAT 20% 1.10\nSub-total: 16,59"
+    result = parser.parse(text)
+    assert [(line.description, str(line.amount)) for line in result.lines] == [
+        ("Cash & Carry Rice", "4.99"), ("Tax free gift", "3.00"), ("Change purse", "7.50"),
+    ]
+    assert result.warnings == []
+
+
+def test_parse_many_streams_in_order():
+    parser = SimpleReceiptParser(CategoryResolver())
+    texts = [f"Item{i} {i}.00\nTotal {i}.00" for i in range(1, 40)]
+    serial = [r.lines[0].description for r in parser.parse_many(texts)]
+    assert serial == [f"Item{i}" for i in range(1, 40)]
+    pooled = list(parser.parse_many(iter(texts), workers=2, chunksize=5))
+    assert [r.lines[0].description for r in pooled] == serial
+    assert [str(r.total_detected) for r in pooled] == [f"{i}.00" for i in range(1, 40)]
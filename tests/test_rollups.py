@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+import pytest
+
+from core import JsonFilePersistence, SqlitePersistence, PartitionedJsonPersistence
+from core.rollups import DailyRollup
+from services.transactions import TransactionService
+
+
+def test_rollup_range_totals():
+    r = DailyRollup()
+    d = date(2025, 8, 10).toordinal()
+    r.add(d, "Groceries", 500)
+    r.add(d + 2, "Dining", 300)
+    r.add(d - 3, "groceries", 100)  # before the first day: array grows backwards
+    assert r.total() == (900, 3)
+    assert r.total(date(2025, 8, 10), date(2025, 8, 12)) == (800, 2)
+    assert r.total(date(2025, 8, 11)) == (300, 1)
+    assert r.total(category="GROCERIES") == (600, 2)
+    assert r.total(date(2030, 1, 1)) == (0, 0)
+    assert r.total(end=date(2020, 1, 1)) == (0, 0)
+    assert r.total(category="rent") == (0, 0)
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite", "partitioned"])
+def test_store_rollups_track_writes(tmp_path, kind):
+    store = {
+        "json": lambda: JsonFilePersistence(tmp_path / "state.json"),
+        "sqlite": lambda: SqlitePersistence(tmp_path / "state.db"),
+        "partitioned": lambda: PartitionedJsonPersistence(tmp_path / "state"),
+    }[kind]()
+    svc = TransactionService(store)
+    start = date(2025, 1, 1)
+    for i in range(60):
+        svc.add(i + 1, "Groceries" if i % 3 else "Dining", f"t{i}", txn_date=start + timedelta(days=i))
+    assert store.transaction_stats() == (svc.total_for(), 60)  # builds the rollup
+    svc.add(5, "Dining", "backdated", txn_date=date(2024, 12, 1))
+    svc.add_many([{"amount": 2, "category": "Dining", "description": "x", "txn_date": date(2025, 3, 5)}])
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            svc.add(1000, "Dining", "dropped")
+            raise RuntimeError("boom")
+    total, count = store.transaction_stats(start=date(2025, 2, 1), end=date(2025, 2, 28))
+    assert count == 28
+    assert total == sum(t.amount for t in store.list_transactions(start=date(2025, 2, 1), end=date(2025, 2, 28)))
+    assert store.transaction_stats(category="dining")[1] == 22
+    assert store.verify_rollups() == []
+
+
+def test_verify_rollups_reports_drift(tmp_path):
+    store = JsonFilePersistence(tmp_path / "state.json")
+    TransactionService(store).add(5, "Dining", "x", txn_date=date(2025, 1, 1))
+    store.rollup().add(date(2025, 1, 2).toordinal(), "Dining", 100)
+    problems = store.verify_rollups()
+    assert problems and "2025-01-02" in problems[0]
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+
+from chat.orchestrator import ChatOrchestrator
+from chat.script import run_script
+from core import open_store
+import main as cli
+
+COMMANDS = """
+# converted statement
+set groceries 100
+add 10.00 groceries milk
+receipt:Bread 2.50
+budget groceries
+gibberish here
+limits
+"""
+
+
+@pytest.fixture(params=["state.json", "state.db"])
+def data_path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def test_script_commits_once_and_reads_its_own_writes(data_path):
+    orch = ChatOrchestrator(data_path=data_path, onboarding=False)
+    responses = []
+    report = run_script(orch, COMMANDS.splitlines(), on_response=lambda c, r: responses.append(r))
+    assert report.commands == 6
+    assert report.failed == 1
+    assert report.commits == 1
+    assert "Groceries: spent 10.00 / 100.00 (remaining 90.00)" in responses
+    month = date.today().strftime("%Y-%m")
+    assert open_store(data_path).category_totals(month)["Groceries"] == 10
+    assert "6 commands" in report.summary() and "1 failed" in report.summary()
+
+
+def test_script_json_store_flushes_once(tmp_path, monkeypatch):
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.json"), onboarding=False)
+    flushes = []
+    real_flush = orch.store._flush
+    monkeypatch.setattr(orch.store, "_flush", lambda: (flushes.append(1), real_flush()))
+    run_script(orch, [f"add {i}.00 groceries item{i}" for i in range(1, 51)])
+    assert len(flushes) == 1
+    assert len(orch.txn_service.list()) == 50
+
+
+def test_commit_every_and_interrupt_keeps_committed_chunks(data_path):
+    orch = ChatOrchestrator(data_path=data_path, onboarding=False)
+
+    def stop_after_five(command, response):
+        if command.endswith("item5"):
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_script(orch, [f"add 1.00 misc item{i}" for i in range(1, 9)], commit_every=2,
+                   on_response=stop_after_five)
+    assert len(open_store(data_path).list_transactions()) == 4
+    assert "spent 4.00" in orch.handle("budget misc")
+
+    report = run_script(ChatOrchestrator(data_path=data_path, onboarding=False),
+                        ["add 1.00 misc a", "add 1.00 misc b", "add 1.00 misc c", "quit", "add 1.00 misc d"],
+                        commit_every=2)
+    assert (report.commands, report.commits) == (3, 2)
+
+
+def test_cli_script_mode(tmp_path, capsys):
+    script = tmp_path / "commands.txt"
+    script.write_text("add 12.34 groceries milk\nbudget\n", encoding="utf-8")
+    code = cli.main(["--script", str(script), "--data", str(tmp_path / "state.json"), "--quiet"])
+    out, err = capsys.readouterr()
+    assert code == 0
+    assert out == ""
+    assert "2 commands" in err and "1 commit" in err
@@ -0,0 +1,116 @@
+from datetime import date
+from decimal import Decimal
+
+from core import SqlitePersistence, JsonFilePersistence, Budget, open_store
+from services.transactions import TransactionService
+from services.budgets import BudgetService
+from chat.orchestrator import ChatOrchestrator
+
+
+def test_add_and_list_transactions(tmp_path):
+    store = SqlitePersistence(tmp_path / "state.db")
+    svc = TransactionService(store)
+    t1 = svc.add(5.25, "Coffee", "Morning coffee", txn_date=date(2025, 8, 2))
+    t2 = svc.add(12.00, "Groceries", "Milk", txn_date=date(2025, 8, 1))
+    all_txns = svc.list()
+    assert [t.id for t in all_txns] == [t2.id, t1.id]
+    assert all_txns[1].amount == Decimal("5.25")
+    assert svc.total_for() == t1.amount + t2.amount
+    assert svc.total_for(category="coffee") == Decimal("5.25")
+    assert [t.id for t in svc.list(category="GROCERIES")] == [t2.id]
+
+
+def test_budget_roundtrip_and_summary(tmp_path):
+    store = SqlitePersistence(tmp_path / "state.db")
+    buds = BudgetService(store)
+    month = date.today().strftime("%Y-%m")
+    buds.set_limits(month, {"Groceries": 100})
+    t = TransactionService(store).add(25, "Groceries", "Veggies")
+    buds.apply(t)
+    g = next(s for s in buds.summary(month) if s["category"] == "Groceries")
+    assert g["spent"] == "25.00"
+    assert g["limit"] == "100.00"
+
+
+def test_data_survives_reopen(tmp_path):
+    path = tmp_path / "state.db"
+    store = SqlitePersistence(path)
+    TransactionService(store).add(3, "Coffee", "Latte", note="x")
+    store.save_budget(Budget.create("2025-08", {"Coffee": 40}))
+    store.close()
+    reopened = SqlitePersistence(path)
+    txns = reopened.list_transactions()
+    assert txns[0].meta == {"note": "x"}
+    assert reopened.get_budget("2025-08").categories["Coffee"].limit == Decimal("40.00")
+
+
+def test_open_store_selects_backend(tmp_path):
+    assert isinstance(open_store(tmp_path / "a.db"), SqlitePersistence)
+    assert isinstance(open_store(f"sqlite:///{tmp_path / 'b.data'}"), SqlitePersistence)
+    journaled = open_store(f"journal:{tmp_path / 'c.json'}")
+    assert isinstance(journaled, JsonFilePersistence) and journaled.journal
+    assert isinstance(open_store(tmp_path / "d.json"), JsonFilePersistence)
+
+
+def test_orchestrator_on_sqlite(tmp_path):
+    orch = ChatOrchestrator(data_path=str(tmp_path / "state.db"))
+    assert isinstance(orch.store, SqlitePersistence)
+    assert "Added" in orch.handle("add 5.00 groceries milk")
+    assert "Groceries" in orch.handle("budget groceries")
+    assert "1 transactions" in orch.handle("summary 7d")
+
+
+def test_batch_commits_and_rolls_back(tmp_path):
+    import pytest
+    store = SqlitePersistence(tmp_path / "state.db")
+    svc = TransactionService(store)
+    svc.add_many([
+        {"amount": 1, "category": "Misc", "description": "a"},
+        {"amount": 2, "category": "Misc", "description": "b"},
+    ])
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            svc.add(3, "Misc", "dropped")
+            raise RuntimeError("boom")
+    assert [t.description for t in store.list_transactions()] == ["a", "b"]
+
+
+def test_range_queries(tmp_path):
+    store = SqlitePersistence(tmp_path / "state.db")
+    svc = TransactionService(store)
+    for day in range(1, 11):
+        svc.add(day, "Coffee" if day % 2 else "Groceries", f"d{day}", txn_date=date(2025, 8, day))
+    assert [t.description for t in svc.list(start=date(2025, 8, 3), end=date(2025, 8, 5))] == ["d3", "d4", "d5"]
+    assert [t.description for t in svc.list(category="groceries", limit=2, reverse=True)] == ["d10", "d8"]
+    assert [t.description for t in svc.recent(3)] == ["d8", "d9", "d10"]
+    assert svc.stats(start=date(2025, 8, 9)) == (Decimal("19.00"), 2)
+
+
+def test_failed_commit_rolls_back(tmp_path):
+    import sqlite3
+    import pytest
+
+    class FailingCommit:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def execute(self, sql, *args):
+            if sql == "COMMIT":
+                raise sqlite3.OperationalError("database is locked")
+            return self.conn.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(self.conn, name)
+
+    store = SqlitePersistence(tmp_path / "state.db")
+    svc = TransactionService(store)
+    svc.add(1, "Misc", "kept")
+    conn = store._conn
+    store._conn = FailingCommit(conn)
+    with pytest.raises(sqlite3.OperationalError):
+        svc.add(2, "Misc", "dropped")
+    store._conn = conn
+    assert not conn.in_transaction
+    svc.add(3, "Misc", "after")
+    reopened = SqlitePersistence(tmp_path / "state.db")
+    assert [t.description for t in reopened.list_transactions()] == ["kept", "after"]
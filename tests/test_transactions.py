@@ -1,4 +1,5 @@
 from core import JsonFilePersistence
+from decimal import Decimal
 from services.transactions import TransactionService
 from pathlib import Path
 
@@ -11,3 +12,86 @@ def test_add_and_list_transactions(tmp_path):
     assert len(all_txns) == 2
     assert all_txns[0].id == t1.id
     assert svc.total_for() == t1.amount + t2.amount
+
+
+def test_range_queries(tmp_path):
+    from datetime import date
+    store = JsonFilePersistence(tmp_path / "state.json")
+    svc = TransactionService(store)
+    for day in range(1, 11):
+        svc.add(day, "Coffee" if day % 2 else "Groceries", f"d{day}", txn_date=date(2025, 8, day))
+    window = svc.list(start=date(2025, 8, 3), end=date(2025, 8, 5))
+    assert [t.description for t in window] == ["d3", "d4", "d5"]
+    assert [t.description for t in svc.list(category="coffee", start=date(2025, 8, 4))] == ["d5", "d7", "d9"]
+    assert [t.description for t in svc.list(limit=2, reverse=True)] == ["d10", "d9"]
+    assert [t.description for t in svc.list(category="groceries", limit=2, reverse=True)] == ["d10", "d8"]
+    assert [t.description for t in svc.recent(3)] == ["d8", "d9", "d10"]
+    assert svc.stats(start=date(2025, 8, 9)) == (Decimal("19.00"), 2)
+
+
+def test_txn_record_roundtrip():
+    from core import Transaction, TxnRecord
+    txn = Transaction.create("12.345", "Groceries", "Milk", note="x")
+    rec = TxnRecord.from_transaction(txn)
+    assert rec.cents == 1235
+    assert rec.to_transaction() == txn
+    bare = TxnRecord.from_transaction(Transaction.create(1, "Misc", "y"))
+    assert bare._meta is None and not bare.has_meta
+    assert not hasattr(bare, "__dict__")
+
+
+def test_records_and_stats_from_store(tmp_path):
+    from datetime import date
+    store = JsonFilePersistence(tmp_path / "state.json")
+    svc = TransactionService(store)
+    svc.add("1.10", "Misc", "a", txn_date=date(2025, 8, 1))
+    svc.add("2.25", "Misc", "b", txn_date=date(2025, 8, 2))
+    assert [r.cents for r in store.list_records()] == [110, 225]
+    assert store.transaction_stats() == (Decimal("3.35"), 2)
+
+
+def test_limit_edges_agree_across_backends(store_factory):
+    import pytest
+    svc = TransactionService(store_factory())
+    svc.add(1, "Coffee", "a")
+    svc.add(2, "Groceries", "b")
+    for category in (None, "coffee"):
+        assert svc.list(category=category, limit=0) == []
+        assert svc.list(category=category, limit=0, reverse=True) == []
+        with pytest.raises(ValueError):
+            svc.list(category=category, limit=-1)
+
+
+def test_delete_transactions_on_every_backend(store_factory):
+    import pytest
+    from datetime import date
+
+    store = store_factory()
+    svc = TransactionService(store)
+    milk = svc.add(2, "Groceries", "Milk", txn_date=date(2025, 8, 1))
+    eggs = svc.add(3, "Groceries", "Eggs", txn_date=date(2025, 8, 2))
+    tea = svc.add(1, "Dining", "Tea", txn_date=date(2025, 9, 1))
+    assert svc.stats() == (Decimal("6.00"), 3)  # rollup built before the delete
+    removed = []
+    store.add_removal_listener(lambda txns: removed.extend(t.description for t in txns))
+
+    assert store.delete_transactions([milk.id, tea.id, "missing"]) == 2
+    assert sorted(removed) == ["Milk", "Tea"]
+    assert [t.id for t in svc.list()] == [eggs.id]
+    assert svc.stats() == (Decimal("3.00"), 1)
+    assert store.category_totals("2025-08") == {"Groceries": Decimal("3.00")}
+    assert store.category_totals("2025-09") == {}
+    assert store.verify_rollups() == []
+
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.delete_transactions([eggs.id])
+            svc.add(5, "Dining", "Lunch", txn_date=date(2025, 8, 3))
+            raise RuntimeError
+    assert [t.id for t in svc.list()] == [eggs.id]
+    assert store.category_totals("2025-08") == {"Groceries": Decimal("3.00")}
+
+    store.close()
+    reopened = store_factory()
+    assert [t.id for t in reopened.list_transactions()] == [eggs.id]
+    assert reopened.category_totals("2025-08") == {"Groceries": Decimal("3.00")}